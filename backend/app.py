@@ -12,6 +12,7 @@ from flask_jwt_extended import JWTManager
 from config import Config
 from extensions import db
 from services.search_results_storage import SearchResultsStorage
+from services.publication_index import PublicationIndex
 
 app = Flask(__name__, static_folder='../frontend/build', static_url_path='/')
 app.config.from_object(Config)
@@ -53,6 +54,10 @@ app.register_blueprint(profile_bp, url_prefix='/api')  # Register with proper pr
 search_storage = SearchResultsStorage()
 search_storage.setup_storage_table()
 
+# Unified search table must come after external_api_data so its sync trigger is installed
+publication_index = PublicationIndex()
+publication_index.setup_index_table()
+
 # Create uploads directory if it doesn't exist
 os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
 
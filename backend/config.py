@@ -1,5 +1,6 @@
 # Fixed config.py
 import os
+import tempfile
 from datetime import timedelta
 from flask import Flask
 from dotenv import load_dotenv
@@ -33,6 +34,15 @@ class Config:
     # Construct DATABASE_URL from individual components
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?connect_timeout={DB_CONNECT_TIMEOUT}"
     
+    # Connection pool per worker process (see services/database.ConnectionPool)
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))
+    # Seconds to wait for a free connection, before a connection is recycled,
+    # and of idleness after which a connection is pinged before reuse
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', 1800))
+    DB_POOL_HEALTH_CHECK_IDLE = int(os.getenv('DB_POOL_HEALTH_CHECK_IDLE', 30))
+    
     # SQLAlchemy settings
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -76,6 +86,80 @@ class Config:
     DBLP_RATE_LIMIT = int(os.getenv('DBLP_RATE_LIMIT', 30))
     ARXIV_RATE_LIMIT = int(os.getenv('ARXIV_RATE_LIMIT', 20))
     ZOTERO_RATE_LIMIT = int(os.getenv('ZOTERO_RATE_LIMIT', 30))
+    # Token buckets shared by all workers: 'sqlite' (one file per host), 'redis' or 'memory'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite')
+    RATE_LIMIT_SQLITE_PATH = os.getenv('RATE_LIMIT_SQLITE_PATH',
+                                       os.path.join(tempfile.gettempdir(), 'biblioknow_rate_limits.sqlite3'))
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    
+    # External search fan-out: overall latency budget and worker threads
+    EXTERNAL_SEARCH_DEADLINE_MS = int(os.getenv('EXTERNAL_SEARCH_DEADLINE_MS', 800))
+    EXTERNAL_SEARCH_WORKERS = int(os.getenv('EXTERNAL_SEARCH_WORKERS', 16))
+    # 'threads' (worker pool) or 'asyncio' (one event loop, see AsyncExternalAPIService)
+    EXTERNAL_SEARCH_BACKEND = os.getenv('EXTERNAL_SEARCH_BACKEND', 'threads')
+    # Concurrent requests per source when using the asyncio backend
+    EXTERNAL_ASYNC_PER_SOURCE = int(os.getenv('EXTERNAL_ASYNC_PER_SOURCE', 4))
+    # Most stored results one admin refresh request re-fetches (sources without a batch API
+    # take one upstream request per result)
+    STORED_RESULTS_REFRESH_MAX = int(os.getenv('STORED_RESULTS_REFRESH_MAX', 500))
+    
+    # Outgoing HTTP: per-host keep-alive pools and (connect, read) timeouts in seconds
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 16))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+    HTTP_USER_AGENT = os.getenv('HTTP_USER_AGENT', 'BiblioKnow/1.0')
+    # Test mode: serve every external source from tools/replay_server.py, e.g. http://127.0.0.1:8765
+    EXTERNAL_API_REPLAY_URL = os.getenv('EXTERNAL_API_REPLAY_URL', '')
+    
+    # Per-source circuit breakers: open after N consecutive failed or slow calls
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5))
+    BREAKER_SLOW_CALL_MS = int(os.getenv('BREAKER_SLOW_CALL_MS', 5000))
+    BREAKER_OPEN_SECONDS = float(os.getenv('BREAKER_OPEN_SECONDS', 30))
+    BREAKER_MAX_OPEN_SECONDS = float(os.getenv('BREAKER_MAX_OPEN_SECONDS', 600))
+    BREAKER_LATENCY_WINDOW = int(os.getenv('BREAKER_LATENCY_WINDOW', 200))
+    # Adaptive read timeout: p95 latency x multiplier, at least ADAPTIVE_TIMEOUT_MIN seconds
+    ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv('ADAPTIVE_TIMEOUT_MULTIPLIER', 2.0))
+    ADAPTIVE_TIMEOUT_MIN = float(os.getenv('ADAPTIVE_TIMEOUT_MIN', 1.0))
+    
+    # On-disk cache of external API responses, shared by all workers on the host
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR',
+                                   os.path.join(tempfile.gettempdir(), 'biblioknow_http_cache'))
+    RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', 256))
+    # Freshness in seconds for sources without their own TTL in ResponseCache.SOURCE_TTLS
+    RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv('RESPONSE_CACHE_DEFAULT_TTL', 3600))
+    
+    # Open Library author key -> name cache (entries, seconds) and concurrent lookups
+    OPENLIBRARY_AUTHOR_CACHE_SIZE = int(os.getenv('OPENLIBRARY_AUTHOR_CACHE_SIZE', 10000))
+    OPENLIBRARY_AUTHOR_TTL = int(os.getenv('OPENLIBRARY_AUTHOR_TTL', 7 * 24 * 3600))
+    OPENLIBRARY_AUTHOR_WORKERS = int(os.getenv('OPENLIBRARY_AUTHOR_WORKERS', 8))
+    
+    # Identical concurrent searches run once; SHARED extends this across workers via lock files
+    SINGLE_FLIGHT_SHARED = os.getenv('SINGLE_FLIGHT_SHARED', 'false').lower() == 'true'
+    SINGLE_FLIGHT_DIR = os.getenv('SINGLE_FLIGHT_DIR', os.path.join(tempfile.gettempdir(), 'biblioknow_single_flight'))
+    # Seconds a duplicate waits for the leader before running the search itself
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', 30))
+    
+    # Search totals: 'exact', 'estimated' (planner rows) or 'capped' at SEARCH_COUNT_CAP
+    SEARCH_COUNT_MODE = os.getenv('SEARCH_COUNT_MODE', 'exact')
+    SEARCH_COUNT_CAP = int(os.getenv('SEARCH_COUNT_CAP', 10000))
+    # Shorter words are matched exactly, never as tsquery prefixes or ILIKE substrings
+    SEARCH_MIN_PREFIX_LENGTH = int(os.getenv('SEARCH_MIN_PREFIX_LENGTH', 3))
+    # Default result order: 'relevance' (ts_rank_cd) or 'citations'
+    SEARCH_DEFAULT_SORT = os.getenv('SEARCH_DEFAULT_SORT', 'relevance')
+    # 'unified' scans unified_publications; 'parallel' queries every source table concurrently
+    SEARCH_EXECUTION_MODE = os.getenv('SEARCH_EXECUTION_MODE', 'unified')
+    # Parallel mode: table-query threads shared by all searches, each holding at most one
+    # pooled connection (kept below DB_POOL_MAX), and seconds to wait for the slowest table
+    SEARCH_PARALLEL_WORKERS = int(os.getenv('SEARCH_PARALLEL_WORKERS', max(1, DB_POOL_MAX // 2)))
+    SEARCH_PARALLEL_TIMEOUT = float(os.getenv('SEARCH_PARALLEL_TIMEOUT', 10))
+    
+    # /api/<table> data endpoints: keyset page size (default, maximum) and rows per streamed batch
+    DATA_PAGE_SIZE = int(os.getenv('DATA_PAGE_SIZE', 500))
+    DATA_PAGE_SIZE_MAX = int(os.getenv('DATA_PAGE_SIZE_MAX', 5000))
+    DATA_STREAM_BATCH_SIZE = int(os.getenv('DATA_STREAM_BATCH_SIZE', 2000))
+    # Streams hold a pooled connection for the whole download; more at once per worker get a 503
+    DATA_STREAM_MAX_CONCURRENT = int(os.getenv('DATA_STREAM_MAX_CONCURRENT', max(1, DB_POOL_MAX // 3)))
     
     # File upload settings
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads'))
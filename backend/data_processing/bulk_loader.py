@@ -0,0 +1,287 @@
+# data_processing/bulk_loader.py
+# Usage (from backend/):
+#   python -m data_processing.bulk_loader data/scopus.csv scopus_data --key scopus_id
+#   python -m data_processing.bulk_loader data/harvest/openalex_mathematics.csv openalex_data --batch-rows 200000
+#   python -m data_processing.bulk_loader data/scopus.parquet scopus_data --key scopus_id --on-conflict skip
+#
+# Loads a CSV or Parquet file into an existing table. Each batch of rows is
+# sent with COPY FROM STDIN into a session-local text staging table, then
+# merged into the target with one INSERT ... SELECT that casts every column to
+# the target type (values that do not parse become NULL) and, with --key,
+# upserts on that key (when a key repeats in the file, its last row wins).
+# Every batch is committed on its own, so an interrupted load keeps what it
+# merged. Into a search source table, the merge also upserts the merged rows
+# into unified_publications in the same statement, with the per-row sync
+# trigger skipped for that transaction.
+
+import io
+import re
+import csv
+import sys
+import time
+import argparse
+import logging
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import psycopg2
+from psycopg2 import sql
+from services.database import DatabaseService
+from services.publication_index import PublicationIndex, SKIP_SYNC_SETTING
+from services.search_tables import SOURCE_TABLES, UNIFIED_TABLE
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input needs pyarrow
+    pq = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = 'bulk_load_staging'
+# File order of the staged rows, so the last row for a key wins the merge
+STAGING_ROW_NUMBER = '_bulk_load_row_no'
+
+INTEGER_TYPES = ('smallint', 'integer', 'bigint')
+DECIMAL_TYPES = ('numeric', 'real', 'double precision')
+TEXT_TYPES = ('text', 'character varying', 'character')
+
+def normalize_column(name: str) -> str:
+    """'Citation Count' -> 'citation_count', to match file headers to table columns"""
+    return re.sub(r'[^a-z0-9]+', '_', name.strip().lower()).strip('_')
+
+def coerce_expression(column: str, data_type: str) -> sql.Composable:
+    """Cast of a staged text column to its target type; unparseable numbers become NULL"""
+    value = sql.SQL("NULLIF(btrim({}), '')").format(sql.Identifier(column))
+    if data_type in TEXT_TYPES:
+        return sql.Identifier(column)
+    if data_type in INTEGER_TYPES:
+        # '2019', ' 42 ', '1,234' load; 'Unknown Year' does not
+        return sql.SQL("CASE WHEN replace({0}, ',', '') ~ '^[-+]?[0-9]+$' THEN replace({0}, ',', '')::{1} END").format(
+            value, sql.SQL(data_type))
+    if data_type in DECIMAL_TYPES:
+        return sql.SQL("CASE WHEN {0} ~ '^[-+]?([0-9]+[.]?[0-9]*|[.][0-9]+)([eE][-+]?[0-9]+)?$' THEN {0}::{1} END").format(
+            value, sql.SQL(data_type))
+    # Dates, timestamps, booleans, json...: PostgreSQL's own input parsing
+    return sql.SQL("{}::{}").format(value, sql.SQL(data_type))
+
+def read_csv(path: str, batch_rows: int) -> Tuple[List[str], Iterator[List[List[str]]]]:
+    """Header and row batches of a CSV file, read incrementally"""
+    csvfile = open(path, 'r', encoding='utf-8-sig', newline='')
+    reader = csv.reader(csvfile)
+    header = next(reader, None)
+    if header is None:
+        csvfile.close()
+        raise ValueError(f"No header found in CSV file: {path}")
+
+    def batches():
+        with csvfile:
+            batch = []
+            for row in reader:
+                batch.append(row)
+                if len(batch) >= batch_rows:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    return header, batches()
+
+def read_parquet(path: str, batch_rows: int) -> Tuple[List[str], Iterator[List[List[str]]]]:
+    """Header and row batches of a Parquet file, read a record batch at a time"""
+    if pq is None:
+        raise RuntimeError("Loading Parquet files needs pyarrow (pip install pyarrow)")
+    parquet_file = pq.ParquetFile(path)
+    header = parquet_file.schema_arrow.names
+
+    def batches():
+        for record_batch in parquet_file.iter_batches(batch_size=batch_rows):
+            columns = record_batch.to_pydict()
+            yield [['' if value is None else str(value) for value in row]
+                   for row in zip(*(columns[name] for name in header))]
+
+    return header, batches()
+
+class BulkLoader:
+    """
+    COPY-based loader of CSV/Parquet files into one table.
+
+    Args:
+        table: Existing target table
+        key_columns: Unique key to merge on; without one rows are appended
+        on_conflict: 'update' the existing row or 'skip' the new one (with key_columns)
+        batch_rows: Rows per COPY batch and per commit
+        column_map: File header -> table column, for headers that do not
+            normalize to their column name
+    """
+
+    def __init__(self, table: str, key_columns: Optional[List[str]] = None, on_conflict: str = 'update',
+                 batch_rows: int = 50000, column_map: Optional[Dict[str, str]] = None,
+                 db: Optional[DatabaseService] = None):
+        if on_conflict not in ('update', 'skip'):
+            raise ValueError("on_conflict must be 'update' or 'skip'")
+        self.table = table
+        self.key_columns = key_columns or []
+        self.on_conflict = on_conflict
+        self.batch_rows = batch_rows
+        self.column_map = {normalize_column(source): target for source, target in (column_map or {}).items()}
+        self.db = db or DatabaseService()
+        # Search source tables are mirrored into the unified table
+        self.source_spec = next((spec for spec in SOURCE_TABLES if spec['table'] == table), None)
+
+    def load(self, path: str) -> Dict[str, Any]:
+        """
+        Load one file
+
+        Returns:
+            Dictionary with rows read, rows merged, batches and seconds taken
+        """
+        reader = read_parquet if path.lower().endswith(('.parquet', '.pq')) else read_csv
+        header, batches = reader(path, self.batch_rows)
+        started = time.perf_counter()
+        stats = {'file': path, 'table': self.table, 'rows_read': 0, 'rows_merged': 0, 'batches': 0}
+
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                target_types = self._target_types(cursor)
+                positions, columns = self._match_columns(header, target_types)
+                sync = self._syncs_unified_table(cursor)
+                copy_sql, merge_sql = self._prepare(cursor, columns, target_types, sync)
+                conn.commit()
+                try:
+                    for batch in batches:
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        for row in batch:
+                            writer.writerow([row[i] if i < len(row) else '' for i in positions])
+                        buffer.seek(0)
+
+                        cursor.copy_expert(copy_sql, buffer)
+                        if sync:
+                            # merge_sql syncs the batch itself; one trigger call per row would double the work
+                            cursor.execute("SELECT set_config(%s, 'on', true)", (SKIP_SYNC_SETTING,))
+                        cursor.execute(merge_sql)
+                        merged = cursor.rowcount
+                        cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(STAGING_TABLE)))
+                        conn.commit()
+
+                        stats['rows_read'] += len(batch)
+                        stats['rows_merged'] += merged
+                        stats['batches'] += 1
+                        elapsed = time.perf_counter() - started
+                        logger.info(f"{self.table}: {stats['rows_read']} rows read, {stats['rows_merged']} merged "
+                                    f"({stats['rows_read'] / elapsed:,.0f} rows/s)")
+                finally:
+                    # The staging table is session-local and the connection goes back to the pool
+                    try:
+                        conn.rollback()
+                        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(STAGING_TABLE)))
+                        conn.commit()
+                    except psycopg2.Error:
+                        pass
+
+        stats['seconds'] = round(time.perf_counter() - started, 2)
+        logger.info(f"✅ Loaded {stats['rows_merged']} of {stats['rows_read']} rows from {path} into {self.table} "
+                    f"in {stats['seconds']}s")
+        return stats
+
+    def _target_types(self, cursor) -> Dict[str, str]:
+        cursor.execute("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = %s AND table_schema = ANY(current_schemas(false))
+            ORDER BY ordinal_position
+        """, (self.table,))
+        target_types = dict(cursor.fetchall())
+        if not target_types:
+            raise ValueError(f"Table {self.table} does not exist")
+        return target_types
+
+    def _syncs_unified_table(self, cursor) -> bool:
+        """Whether merged rows must also be upserted into the unified search table"""
+        if self.source_spec is None:
+            return False
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (UNIFIED_TABLE,))
+        return cursor.fetchone()[0]
+
+    def _match_columns(self, header, target_types) -> Tuple[List[int], List[str]]:
+        """Positions of the file columns that exist in the table, and their table names"""
+        positions, columns = [], []
+        for position, name in enumerate(header):
+            column = self.column_map.get(normalize_column(name), normalize_column(name))
+            if column in target_types and column not in columns:
+                positions.append(position)
+                columns.append(column)
+            else:
+                logger.warning(f"⚠️ {self.table}: ignoring file column '{name}'")
+        if not columns:
+            raise ValueError(f"No column of the file matches a column of {self.table}")
+        missing_keys = [key for key in self.key_columns if key not in columns]
+        if missing_keys:
+            raise ValueError(f"Key columns missing from the file: {', '.join(missing_keys)}")
+        return positions, columns
+
+    def _prepare(self, cursor, columns, target_types, sync=False) -> Tuple[str, sql.Composable]:
+        """Create the text staging table; return the COPY and merge statements"""
+        staging = sql.Identifier(STAGING_TABLE)
+        row_number = sql.Identifier(STAGING_ROW_NUMBER)
+        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(staging))
+        cursor.execute(sql.SQL("CREATE TEMP TABLE {} ({}, {} bigserial)").format(
+            staging, sql.SQL(', ').join(sql.SQL("{} text").format(sql.Identifier(column)) for column in columns),
+            row_number))
+
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(staging, column_list)
+
+        # Staged text cast to the target types, under the target column names
+        coerced = sql.SQL("SELECT {}, {} FROM {}").format(
+            sql.SQL(', ').join(sql.SQL("{} AS {}").format(coerce_expression(column, target_types[column]),
+                                                          sql.Identifier(column)) for column in columns),
+            row_number, staging)
+        if not self.key_columns:
+            merge_sql = sql.SQL("INSERT INTO {} ({}) SELECT {} FROM ({}) coerced").format(
+                sql.Identifier(self.table), column_list, column_list, coerced)
+        else:
+            keys = sql.SQL(', ').join(map(sql.Identifier, self.key_columns))
+            updates = [column for column in columns if column not in self.key_columns]
+            if self.on_conflict == 'skip' or not updates:
+                action = sql.SQL("DO NOTHING")
+            else:
+                action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(', ').join(
+                    sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column)) for column in updates))
+            # One row per key within a batch, the last one in the file: ON CONFLICT
+            # cannot touch a row twice in one statement. Keys are compared as
+            # coerced, as ON CONFLICT compares them (' 42' and '42' are one key)
+            merge_sql = sql.SQL(
+                "INSERT INTO {table} ({columns}) SELECT DISTINCT ON ({keys}) {columns} FROM ({coerced}) coerced "
+                "ORDER BY {keys}, {row_number} DESC ON CONFLICT ({keys}) {action}"
+            ).format(table=sql.Identifier(self.table), columns=column_list, keys=keys, coerced=coerced,
+                     row_number=row_number, action=action)
+
+        if sync:
+            # The rows actually inserted or updated go on to the unified table
+            merge_sql = sql.SQL("WITH merged AS ({} RETURNING *) {}").format(
+                merge_sql, sql.SQL(PublicationIndex().sync_rows_sql(self.source_spec, 'merged')))
+        return copy_sql.as_string(cursor), merge_sql
+
+def parse_column_map(specs) -> Dict[str, str]:
+    """--map "Title=book_title" -> {'Title': 'book_title'}"""
+    return dict(spec.split('=', 1) for spec in specs or [])
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load a CSV or Parquet file into a table with COPY')
+    parser.add_argument('path', help='.csv, or .parquet (needs pyarrow)')
+    parser.add_argument('table', help='existing target table')
+    parser.add_argument('--key', nargs='+', help='unique key columns to upsert on (default: append)')
+    parser.add_argument('--on-conflict', choices=['update', 'skip'], default='update')
+    parser.add_argument('--batch-rows', type=int, default=50000, help='rows per COPY batch and commit')
+    parser.add_argument('--map', action='append', help='file column=table column (repeatable)')
+    args = parser.parse_args()
+
+    loader = BulkLoader(args.table, key_columns=args.key, on_conflict=args.on_conflict,
+                        batch_rows=args.batch_rows, column_map=parse_column_map(args.map))
+    try:
+        loader.load(args.path)
+    except Exception as e:
+        logger.error(f"❌ Bulk load failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,10 @@
-import csv
-from utils.db_utils import connect_to_db, insert_data  # Import db functions
-
-def load_data_from_csv(file_path, table_name):
-    """Loads data from a CSV file into a PostgreSQL table."""
-    conn = connect_to_db()
-    if conn is None:
-        return False
+from data_processing.bulk_loader import BulkLoader
 
+def load_data_from_csv(file_path, table_name, key_columns=None, batch_rows=50000):
+    """Loads data from a CSV file into a PostgreSQL table (COPY in batches, see bulk_loader)."""
     try:
-        cur = conn.cursor()
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            if reader.fieldnames is None:
-                print(f"Error: No header found in CSV file: {file_path}")
-                return False
-            
-            # Convert column names to lowercase to match database columns (optional)
-            columns = [col.lower() for col in reader.fieldnames]
-            
-            for row in reader:
-                # Create a dictionary with lowercase keys
-                data = {columns[i]: row[reader.fieldnames[i]] for i in range(len(columns))}
-
-                if insert_data(table_name, data):
-                    print(f"Inserted row into {table_name}")
-                else:
-                    print(f"Failed to insert row into {table_name}")
-
-        conn.commit()
-        cur.close()
-        conn.close()
+        stats = BulkLoader(table_name, key_columns=key_columns, batch_rows=batch_rows).load(file_path)
+        print(f"Loaded {stats['rows_merged']} rows into {table_name} in {stats['seconds']}s")
         return True
 
     except FileNotFoundError:
@@ -49,4 +24,4 @@ if __name__ == '__main__':
     if load_data_from_csv(csv_file_path, table_name):
         print("Data loading complete!")
     else:
-        print("Data loading failed.")
\ No newline at end of file
+        print("Data loading failed.")
@@ -0,0 +1,242 @@
+# data_processing/harvester.py
+# Usage (from backend/):
+#   python -m data_processing.harvester --source openalex --output data/harvest
+#   python -m data_processing.harvester --source crossref --subjects "Psychology" "Philosophy" --max-records 50000
+#
+# Bulk-harvests OpenAlex or Crossref works per subject with cursor paging and
+# writes CSVs in the layout of fetch_data_fr_openalex.py, fetch_data_fr_crosref.py
+# or (--source orcid: Crossref works with ORCID authors, one row per author)
+# fetch_data_fr_orcid.py, so they load into the same tables the same way.
+# Rerunning the same command resumes every unfinished subject from its checkpoint.
+
+import os
+import re
+import csv
+import json
+import time
+import argparse
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from services.external_apis import ExternalAPIService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Subjects of the one-shot fetch scripts
+DEFAULT_SUBJECTS = {
+    'openalex': [
+        "Mathematics", "Literature", "Language", "Engineering", "Technology",
+        "Hospitality and Management", "Business", "Law", "Economics", "Environmental Sciences"
+    ],
+    'crossref': [
+        "Computer Science", "Social Science", "Literature", "Library Science",
+        "Psychology", "Philosophy", "Mathematics", "Accounts & Management"
+    ],
+    'orcid': [
+        "Sociology", "Literature", "Language", "Social Sciences", "Medical practices and Nursing",
+        "Education and Teaching Practices", "Civil Engineering", "Economics", "Account Management"
+    ]
+}
+
+# Research method keywords to infer research methods from titles/abstracts
+RESEARCH_METHOD_KEYWORDS = ['qualitative', 'quantitative', 'survey', 'case study', 'experiment',
+                            'simulation', 'theoretical', 'modeling', 'field study']
+
+def infer_research_method(title: str, abstract: str) -> str:
+    text = f"{title or ''} {abstract or ''}".lower()
+    found = [keyword.capitalize() for keyword in RESEARCH_METHOD_KEYWORDS if keyword in text]
+    return ', '.join(found) if found else 'Unknown Method'
+
+class Harvester:
+    """
+    Cursor-paged bulk harvest of one source, several subjects at a time.
+
+    Each subject is one stream of deep-paging cursor requests (OpenAlex
+    cursor=*, Crossref cursor=*) at the largest page size the API allows,
+    with `select` so only the fields written out are transferred. Subject
+    streams run in parallel; requests go through ExternalAPIService.fetch_page,
+    so they share the rate limiter and circuit breakers with the web workers.
+
+    After each page is written and flushed, the next cursor and the output
+    file size are saved to the checkpoint file. On resume the output is
+    truncated back to the checkpointed size, so a page is never written twice.
+    """
+
+    SOURCES = ('openalex', 'crossref', 'orcid')
+    # External API each harvest runs against
+    API_SOURCES = {'openalex': 'openalex', 'crossref': 'crossref', 'orcid': 'crossref'}
+    MAX_PAGE_SIZES = {'openalex': 200, 'crossref': 1000}
+    SELECT_FIELDS = {
+        'openalex': 'id,doi,display_name,publication_year,cited_by_count',
+        'crossref': 'DOI,title,author,issued,is-referenced-by-count,abstract'
+    }
+    CSV_HEADERS = {
+        'openalex': ['Subject', 'Title', 'DOI', 'Year', 'Citations', 'Research Method', 'Timestamp'],
+        'crossref': ['Subject', 'Title', 'Authors', 'DOI', 'Year', 'Citation Count', 'Cited By', 'Research Method'],
+        'orcid': ['Author Name', 'ORCID ID', 'Title', 'DOI', 'Year', 'Citations', 'Research Method']
+    }
+
+    def __init__(self, source: str, output_dir: str, page_size: int = None, workers: int = 4,
+                 max_records: Optional[int] = None, checkpoint_path: str = None,
+                 api: Optional[ExternalAPIService] = None):
+        if source not in self.SOURCES:
+            raise ValueError(f"Harvesting supports {', '.join(self.SOURCES)}, not {source}")
+        self.source = source
+        self.api_source = self.API_SOURCES[source]
+        self.output_dir = output_dir
+        max_page_size = self.MAX_PAGE_SIZES[self.api_source]
+        self.page_size = min(page_size or max_page_size, max_page_size)
+        self.workers = workers
+        self.max_records = max_records
+        self.checkpoint_path = checkpoint_path or os.path.join(output_dir, f"{source}_checkpoint.json")
+        self.api = api or ExternalAPIService()
+        self._lock = threading.Lock()
+        self._checkpoints = self._load_checkpoints()
+
+    def run(self, subjects: List[str]) -> Dict[str, int]:
+        """
+        Harvest all subjects, resuming any with a checkpoint
+
+        Returns:
+            Dictionary of subject to total records harvested so far
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"harvest-{self.source}") as executor:
+            totals = dict(zip(subjects, executor.map(self._harvest_subject_safely, subjects)))
+        logger.info(f"✅ Harvested {sum(totals.values())} {self.source} records over {len(subjects)} subjects")
+        return totals
+
+    def harvest_subject(self, subject: str) -> int:
+        """Page through one subject until its cursor runs out or max_records is reached"""
+        fresh = {'cursor': '*', 'records': 0, 'offset': 0, 'done': False}
+        state = self._checkpoints.get(subject, fresh)
+        if state['done']:
+            logger.info(f"{self.source}/{subject}: already complete ({state['records']} records)")
+            return state['records']
+
+        path = self._output_path(subject)
+        if state['offset'] and (not os.path.exists(path) or os.path.getsize(path) < state['offset']):
+            logger.warning(f"⚠️ {self.source}/{subject}: output is missing or shorter than its checkpoint, starting over")
+            state = fresh
+        with open(path, 'a+', newline='', encoding='utf-8') as output:
+            # Drop anything written after the last checkpoint
+            output.truncate(state['offset'])
+            output.seek(state['offset'])
+            writer = csv.writer(output)
+            if state['offset'] == 0:
+                writer.writerow(self.CSV_HEADERS[self.source])
+
+            if state['cursor'] != '*':
+                logger.info(f"{self.source}/{subject}: resuming after {state['records']} records")
+            while not state['done']:
+                data = self.api.fetch_page(self.api_source, self._url(), self._params(subject, state['cursor']))
+                items, next_cursor = self._page(data)
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                for item in items:
+                    writer.writerows(self._rows(subject, item, timestamp))
+                output.flush()
+                os.fsync(output.fileno())
+
+                state = {
+                    'cursor': next_cursor,
+                    'records': state['records'] + len(items),
+                    'offset': output.tell(),
+                    'done': not items or not next_cursor or (
+                        self.max_records is not None and state['records'] + len(items) >= self.max_records)
+                }
+                self._save_checkpoint(subject, state)
+                logger.info(f"{self.source}/{subject}: {state['records']} records")
+        return state['records']
+
+    def _harvest_subject_safely(self, subject):
+        try:
+            return self.harvest_subject(subject)
+        except Exception as e:
+            # The checkpoint stays at the last written page; rerun to resume
+            logger.error(f"❌ {self.source}/{subject}: harvest stopped: {str(e)}")
+            return self._checkpoints.get(subject, {}).get('records', 0)
+
+    def _url(self):
+        if self.api_source == 'openalex':
+            return f"{self.api.api_base_urls['openalex']}/works"
+        return self.api.api_base_urls['crossref']
+
+    def _params(self, subject, cursor):
+        if self.api_source == 'openalex':
+            return {'search': subject, 'per-page': self.page_size, 'cursor': cursor,
+                    'select': self.SELECT_FIELDS['openalex']}
+        params = {'query': subject, 'rows': self.page_size, 'cursor': cursor,
+                  'select': self.SELECT_FIELDS['crossref']}
+        if self.source == 'orcid':
+            params['filter'] = 'has-orcid:true'
+        return params
+
+    def _page(self, data):
+        """(items, next cursor) of a response"""
+        if self.api_source == 'openalex':
+            return data.get('results', []), data.get('meta', {}).get('next_cursor')
+        message = data.get('message', {})
+        return message.get('items', []), message.get('next-cursor')
+
+    def _rows(self, subject, item, timestamp):
+        """CSV rows of one work: one row, or one per author for the ORCID layout"""
+        if self.source == 'openalex':
+            title = item.get('display_name') or 'No Title'
+            return [[subject, title, item.get('doi') or 'No DOI', item.get('publication_year') or 'Unknown Year',
+                     item.get('cited_by_count', 0), infer_research_method(title, ''), timestamp]]
+
+        title = (item.get('title') or ['No Title'])[0]
+        doi = item.get('DOI', 'No DOI')
+        year = (item.get('issued', {}).get('date-parts') or [[None]])[0][0]
+        citations = item.get('is-referenced-by-count', 0)
+        research_method = infer_research_method(title, item.get('abstract', ''))
+        if self.source == 'orcid':
+            return [[f"{author.get('given', '')} {author.get('family', '')}", author.get('ORCID', 'No ORCID'),
+                     title, doi, year, citations, research_method] for author in item.get('author', [])]
+
+        authors = ', '.join(f"{author.get('given', '')} {author.get('family', '')}" for author in item.get('author', []))
+        return [[subject, title, authors, doi, year, citations, 'Unavailable', research_method]]
+
+    def _output_path(self, subject):
+        slug = re.sub(r'[^a-z0-9]+', '_', subject.lower()).strip('_')
+        return os.path.join(self.output_dir, f"{self.source}_{slug}.csv")
+
+    def _load_checkpoints(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+
+    def _save_checkpoint(self, subject, state):
+        with self._lock:
+            self._checkpoints[subject] = state
+            os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+            temp_path = f"{self.checkpoint_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+                json.dump(self._checkpoints, checkpoint_file, indent=2)
+            os.replace(temp_path, self.checkpoint_path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-harvest OpenAlex or Crossref works by subject')
+    parser.add_argument('--source', choices=Harvester.SOURCES, required=True)
+    parser.add_argument('--subjects', nargs='+', help='defaults to the subjects of the fetch_data_fr_* scripts')
+    parser.add_argument('--output', default='data/harvest', help='directory for CSVs and the checkpoint file')
+    parser.add_argument('--page-size', type=int, help='records per request (default: API maximum)')
+    parser.add_argument('--workers', type=int, default=4, help='subjects harvested in parallel')
+    parser.add_argument('--max-records', type=int, help='stop each subject after about this many records')
+    parser.add_argument('--reset', action='store_true', help='discard the checkpoint and start over')
+    args = parser.parse_args()
+
+    checkpoint_path = os.path.join(args.output, f"{args.source}_checkpoint.json")
+    if args.reset and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    harvester = Harvester(args.source, args.output, page_size=args.page_size, workers=args.workers,
+                          max_records=args.max_records, checkpoint_path=checkpoint_path)
+    harvester.run(args.subjects or DEFAULT_SUBJECTS[args.source])
+
+if __name__ == "__main__":
+    main()
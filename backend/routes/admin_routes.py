@@ -5,6 +5,11 @@ from models.user import User
 from models.system_event import SystemEvent
 from extensions import db
 from sqlalchemy import or_, desc, and_
+from services.database import DatabaseService, connection_pool
+from services.circuit_breaker import CircuitBreakerRegistry
+from services.response_cache import response_cache
+from services.search_results_storage import SearchResultsStorage
+from config import Config
 import logging
 
 admin_bp = Blueprint('admin', __name__)
@@ -307,6 +312,68 @@ def get_system_events():
         logging.error(f"Failed to get system events: {str(e)}")
         return jsonify({'error': str(e), 'message': 'Failed to get system events'}), 500
 
+@admin_bp.route('/db/prepared-statements', methods=['GET'])
+def get_prepared_statement_stats():
+    """Get reuse counts of the search prepared statement cache (this worker only)"""
+    try:
+        return jsonify(DatabaseService.prepared_statement_stats()), 200
+    except Exception as e:
+        logging.error(f"Failed to get prepared statement stats: {str(e)}")
+        return jsonify({'error': str(e), 'message': 'Failed to get prepared statement stats'}), 500
+
+@admin_bp.route('/db/pool', methods=['GET'])
+def get_db_pool_stats():
+    """Get size, checkouts and recycled connections of the database connection pool (this worker only)"""
+    try:
+        return jsonify(connection_pool.stats()), 200
+    except Exception as e:
+        logging.error(f"Failed to get database pool stats: {str(e)}")
+        return jsonify({'error': str(e), 'message': 'Failed to get database pool stats'}), 500
+
+@admin_bp.route('/external/circuit-breakers', methods=['GET'])
+def get_circuit_breakers():
+    """Get state, p95 latency and adaptive timeout of each external source's circuit breaker (this worker only)"""
+    try:
+        return jsonify(CircuitBreakerRegistry.snapshot()), 200
+    except Exception as e:
+        logging.error(f"Failed to get circuit breaker state: {str(e)}")
+        return jsonify({'error': str(e), 'message': 'Failed to get circuit breaker state'}), 500
+
+@admin_bp.route('/external/circuit-breakers/<source>/reset', methods=['POST'])
+def reset_circuit_breaker(source):
+    """Close an external source's circuit breaker"""
+    if not CircuitBreakerRegistry.reset(source):
+        return jsonify({'message': f'No circuit breaker for {source}'}), 404
+    log_system_event('circuit_breaker_reset', f"Circuit breaker for {source} reset", 'info')
+    return jsonify({'message': f'Circuit breaker for {source} reset'}), 200
+
+@admin_bp.route('/external/stored-results/<source>/refresh', methods=['POST'])
+def refresh_stored_results(source):
+    """Re-fetch the least recently updated stored results of an external source (at most STORED_RESULTS_REFRESH_MAX)"""
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, Config.STORED_RESULTS_REFRESH_MAX)
+    try:
+        refreshed = SearchResultsStorage().refresh_results(source, limit=limit)
+        log_system_event('external_results_refresh', f"Refreshed {refreshed} stored {source} results", 'info')
+        return jsonify({'source': source, 'refreshed': refreshed, 'limit': limit}), 200
+    except Exception as e:
+        logging.error(f"Failed to refresh stored {source} results: {str(e)}")
+        return jsonify({'error': str(e), 'message': 'Failed to refresh stored results'}), 500
+
+@admin_bp.route('/external/response-cache', methods=['GET'])
+def get_response_cache_stats():
+    """Get entry count and size of the external API response cache"""
+    try:
+        return jsonify(response_cache.stats()), 200
+    except Exception as e:
+        logging.error(f"Failed to get response cache stats: {str(e)}")
+        return jsonify({'error': str(e), 'message': 'Failed to get response cache stats'}), 500
+
 @admin_bp.route('/user-activity-metrics', methods=['GET'])
 def get_user_activity_metrics():
     """Get user activity metrics for charts"""
@@ -7,6 +7,7 @@ import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 from config import Config
+from services.database import connection_pool
 import logging
 import traceback
 
@@ -16,23 +17,18 @@ logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
-DB_CONFIG = {
-    "dbname": Config.DB_NAME,
-    "user": Config.DB_USER,
-    "password": Config.DB_PASSWORD,
-    "host": Config.DB_HOST,
-    "port": Config.DB_PORT
-}
-
 def get_db_connection():
-    """Create a connection to the PostgreSQL database"""
+    """Borrow a pooled connection to the PostgreSQL database; give it back with release_db_connection"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
+        return connection_pool.getconn()
     except psycopg2.Error as e:
         logger.error(f"Database connection error: {e}")
         return None
 
+def release_db_connection(conn):
+    """Return a connection from get_db_connection to the pool"""
+    connection_pool.putconn(conn)
+
 def init_db():
     """Initialize database with users table if it doesn't exist"""
     conn = get_db_connection()
@@ -92,7 +88,7 @@ def init_db():
             logger.error(f"Database initialization error: {e}")
             logger.error(traceback.format_exc())
         finally:
-            conn.close()
+            release_db_connection(conn)
     else:
         logger.error("Failed to initialize database")
 
@@ -112,10 +108,12 @@ def token_required(f):
         try:
             data = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
             conn = get_db_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT id FROM users WHERE id = %s", (data['user_id'],))
-                current_user = cur.fetchone()
-            conn.close()
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("SELECT id FROM users WHERE id = %s", (data['user_id'],))
+                    current_user = cur.fetchone()
+            finally:
+                release_db_connection(conn)
         except Exception as e:
             logger.error(f"Token verification error: {e}")
             return jsonify({'message': 'Token is invalid!'}), 401
@@ -184,7 +182,7 @@ def register():
             return jsonify({"message": "Registration failed"}), 500
         finally:
             if conn:
-                conn.close()
+                release_db_connection(conn)
     except Exception as e:
         logger.error(f"Unexpected error in registration: {str(e)}")
         logger.error(traceback.format_exc())
@@ -324,7 +322,7 @@ def login():
             logger.error(traceback.format_exc())
             return jsonify({"message": "Login failed due to database error"}), 500
         finally:
-            conn.close()
+            release_db_connection(conn)
             
     except Exception as e:
         logger.error(f"Unexpected error in login: {str(e)}")
@@ -1,99 +1,114 @@
 # routes/data_routes.py
-from flask import Blueprint, jsonify
-from utils.db_utils import fetch_all
+import io
+import csv
+import json
+import logging
+import threading
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from utils.db_utils import fetch_page, iter_batches
+from config import Config
 
 data_bp = Blueprint('data', __name__)
 
-@data_bp.route('/cleaned_bibliometric_data', methods=['GET'])
-def get_cleaned_bibliometric_data():
-    data = fetch_all("cleaned_bibliometric_data")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "author": item[1],
-            "title": item[2],
-            "doi": item[3],
-            "year": item[4]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
+# Tables served under /api/<table> and the columns clients may select, by name
+DATA_TABLES = {
+    'cleaned_bibliometric_data': ['id', 'author', 'title', 'doi', 'year'],
+    'crossref_data_multiple_subjects': ['id', 'subject', 'title', 'authors', 'year', 'citation_count',
+                                        'cited_by', 'research_method', 'doi'],
+    'google_scholar_data': ['id', 'author_name', 'title', 'year', 'cited_by', 'subject_of_study',
+                            'research_method'],
+    'openalex_data': ['id', 'subject', 'title', 'year', 'citations', 'research_method', 'doi'],
+    'scopus_data': ['id', 'book_title', 'p_isbn', 'e_isbn', 'publication_year', 'publisher', 'asjc',
+                    'scopus_id', 'scopus_load_date'],
+    'scopus_data_sept': ['id', 'book_title', 'p_isbn', 'e_isbn', 'publication_year', 'publisher', 'asjc',
+                         'scopus_id', 'scopus_load_date'],
+}
 
-@data_bp.route('/crossref_data_multiple_subjects', methods=['GET'])
-def get_crossref_data_multiple_subjects():
-    data = fetch_all("crossref_data_multiple_subjects")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "subject": item[1],
-            "title": item[2],
-            "authors": item[3],
-            "year": item[4],
-            "citation_count": item[5],
-            "cited_by": item[6],
-            "research_method": item[7],
-            "doi": item[8]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
 
-@data_bp.route('/google_scholar_data', methods=['GET'])
-def get_google_scholar_data():
-    data = fetch_all("google_scholar_data")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "author_name": item[1],
-            "title": item[2],
-            "year": item[3],
-            "cited_by": item[4],
-            "subject_of_study": item[5],
-            "research_method": item[6]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
+# Each stream keeps one pooled connection (and its transaction) until the
+# client has read everything; a few slow downloads must not starve the pool
+_stream_slots = threading.BoundedSemaphore(Config.DATA_STREAM_MAX_CONCURRENT)
 
-@data_bp.route('/openalex_data', methods=['GET'])
-def get_openalex_data():
-    data = fetch_all("openalex_data")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "subject": item[1],
-            "title": item[2],
-            "year": item[3],
-            "citations": item[4],
-            "research_method": item[5],
-            "doi": item[6]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
+def _ndjson_lines(batches):
+    for batch in batches:
+        yield ''.join(json.dumps(row, default=str) + '\n' for row in batch)
 
-@data_bp.route('/scopus_data', methods=['GET'])
-def get_scopus_data():
-    data = fetch_all("scopus_data")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "book_title": item[1],
-            "p_isbn": item[2],
-            "e_isbn": item[3],
-            "publication_year": item[4],
-            "publisher": item[5],
-            "asjc": item[6],
-            "scopus_id": item[7],
-            "scopus_load_date": item[8]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
+def _csv_lines(batches, columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
 
-@data_bp.route('/scopus_data_sept', methods=['GET'])
-def get_scopus_data_sept():
-    data = fetch_all("scopus_data_sept")
-    if data:
-        return jsonify([{
-            "id": item[0],
-            "book_title": item[1],
-            "p_isbn": item[2],
-            "e_isbn": item[3],
-            "publication_year": item[4],
-            "publisher": item[5],
-            "asjc": item[6],
-            "scopus_id": item[7],
-            "scopus_load_date": item[8]
-        } for item in data])
-    return jsonify({"error": "Could not retrieve data"}), 500
\ No newline at end of file
+def _stream(table, columns, after, fmt):
+    """Write rows as they come off a server-side cursor; memory stays at one batch"""
+    if not _stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many downloads in progress, retry later"}), 503, {'Retry-After': '30'}
+    batches = iter_batches(table, batch_size=Config.DATA_STREAM_BATCH_SIZE, columns=columns,
+                           order_by='id', after=after)
+
+    def generate():
+        try:
+            yield from (_ndjson_lines(batches) if fmt == 'ndjson' else _csv_lines(batches, columns))
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logging.error(f"❌ Streaming {table} stopped: {str(e)}")
+
+    headers = {'Content-Disposition': f'attachment; filename="{table}.{fmt}"'} if fmt == 'csv' else {}
+    response = Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[fmt], headers=headers)
+    # Called when the server closes the response, even if the body was never read
+    response.call_on_close(_stream_slots.release)
+    return response
+
+def get_table_data(table):
+    """
+    Rows of a data table, a keyset page at a time or streamed whole.
+
+    Query parameters:
+        columns: Comma-separated columns to return (default: all of DATA_TABLES[table])
+        after: id of the last row already received; rows come in id order
+        limit: Page size for JSON (default DATA_PAGE_SIZE, at most DATA_PAGE_SIZE_MAX)
+        format: 'json' (one page), or 'ndjson' / 'csv' to stream every row after `after`
+            (at most DATA_STREAM_MAX_CONCURRENT streams per worker, else 503)
+    """
+    allowed = DATA_TABLES[table]
+    requested = [column.strip() for column in request.args.get('columns', '').split(',') if column.strip()]
+    unknown = [column for column in requested if column not in allowed]
+    if unknown:
+        return jsonify({"error": f"Unknown columns: {', '.join(unknown)}", "columns": allowed}), 400
+    columns = requested or allowed
+
+    after = request.args.get('after') or None
+    if after is not None:
+        try:
+            after = int(after)
+        except ValueError:
+            return jsonify({"error": "after must be an integer id"}), 400
+    fmt = request.args.get('format', 'json').lower()
+    if fmt in STREAM_FORMATS:
+        return _stream(table, columns, after, fmt)
+    if fmt != 'json':
+        return jsonify({"error": "format must be json, ndjson or csv"}), 400
+
+    limit = min(max(request.args.get('limit', Config.DATA_PAGE_SIZE, type=int), 1), Config.DATA_PAGE_SIZE_MAX)
+    try:
+        rows, next_after = fetch_page(table, 'id', after, limit, columns)
+    except Exception as e:
+        logging.error(f"❌ Failed to read {table}: {str(e)}")
+        return jsonify({"error": "Could not retrieve data"}), 500
+    return jsonify({
+        "rows": [{column: row[column] for column in columns} for row in rows],
+        "columns": columns,
+        "limit": limit,
+        "next_after": next_after
+    })
+
+for _table in DATA_TABLES:
+    data_bp.add_url_rule(f'/{_table}', endpoint=f'get_{_table}', view_func=get_table_data,
+                         methods=['GET'], defaults={'table': _table})
@@ -9,6 +9,7 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 import traceback
 from config import Config
+from services.database import connection_pool
 
 # Configure logging
 logging.basicConfig(
@@ -20,20 +21,17 @@ logger = logging.getLogger(__name__)
 profile_bp = Blueprint('profile', __name__)
 
 def get_db_connection():
-    """Create a connection to the PostgreSQL database"""
+    """Borrow a pooled connection to the PostgreSQL database; give it back with release_db_connection"""
     try:
-        conn = psycopg2.connect(
-            dbname=Config.DB_NAME,
-            user=Config.DB_USER,
-            password=Config.DB_PASSWORD,
-            host=Config.DB_HOST,
-            port=Config.DB_PORT
-        )
-        return conn
-    except Exception as e:
+        return connection_pool.getconn()
+    except psycopg2.Error as e:
         logger.error(f"Database connection error: {e}")
         return None
 
+def release_db_connection(conn):
+    """Return a connection from get_db_connection to the pool"""
+    connection_pool.putconn(conn)
+
 @profile_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
@@ -82,7 +80,7 @@ def get_profile():
             logger.error(traceback.format_exc())
             return jsonify({'error': f'Database error: {str(e)}'}), 500
         finally:
-            conn.close()
+            release_db_connection(conn)
             
     except Exception as e:
         logger.error(f"Error in get_profile: {str(e)}")
@@ -224,7 +222,7 @@ def update_profile():
             logger.error(traceback.format_exc())
             return jsonify({'error': f'Database error: {str(e)}'}), 500
         finally:
-            conn.close()
+            release_db_connection(conn)
     except Exception as e:
         logger.error(f"Error in update_profile: {str(e)}")
         logger.error(traceback.format_exc())
@@ -316,7 +314,7 @@ def update_profile_picture():
             logger.error(traceback.format_exc())
             return jsonify({'error': f'Database operation failed: {str(e)}'}), 500
         finally:
-            conn.close()
+            release_db_connection(conn)
             
     except Exception as e:
         logger.error(f"Error in update_profile_picture: {str(e)}")
@@ -382,7 +380,7 @@ def change_password():
             logger.error(traceback.format_exc())
             return jsonify({'error': f'Database operation failed: {str(e)}'}), 500
         finally:
-            conn.close()
+            release_db_connection(conn)
             
     except Exception as e:
         logger.error(f"Error in change_password: {str(e)}")
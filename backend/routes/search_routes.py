@@ -1,7 +1,10 @@
 # routes/search_routes.py
 from flask import Blueprint, jsonify, request
 from flask_caching import Cache
-from services.search_service import SearchService
+from services.search_service import SearchService, InvalidCursorError, decode_search_cursor
+from services.search_tables import ILIKE_FILTERS
+from services.query_compiler import QueryCompiler, QueryError
+from services.single_flight import SingleFlight
 from config import Config
 import logging
 from functools import wraps
@@ -10,6 +13,7 @@ import json
 
 search_bp = Blueprint('search', __name__)
 cache = Cache()
+search_flight = SingleFlight('search')
 
 def init_search_cache(app):
     """Initialize cache for search routes"""
@@ -60,6 +64,15 @@ def api_search():
             "external_apis_used": False
         }), 400
     
+    try:
+        QueryCompiler().compile(query)
+    except QueryError as e:
+        return jsonify({
+            "error": str(e),
+            "results": [],
+            "total": 0
+        }), 400
+    
     try:
         page = max(1, int(request.args.get('page', 1)))
         per_page = min(50, max(1, int(request.args.get('per_page', 20))))  # Default increased to 20
@@ -71,17 +84,49 @@ def api_search():
             "total": 0
         }), 400
     
+    # Keyset cursor from a previous response; page is still honoured without one
+    cursor = request.args.get('cursor', '').strip() or None
+    if cursor:
+        try:
+            decode_search_cursor(cursor)
+        except InvalidCursorError:
+            return jsonify({
+                "error": "Invalid cursor parameter",
+                "results": [],
+                "total": 0
+            }), 400
+    
+    count_mode = request.args.get('count_mode', Config.SEARCH_COUNT_MODE).lower()
+    if count_mode not in SearchService.COUNT_MODES:
+        return jsonify({
+            "error": f"count_mode must be one of: {', '.join(SearchService.COUNT_MODES)}",
+            "results": [],
+            "total": 0
+        }), 400
+    
+    sort = request.args.get('sort', Config.SEARCH_DEFAULT_SORT).lower()
+    if sort not in SearchService.SORT_ORDERS:
+        return jsonify({
+            "error": f"sort must be one of: {', '.join(SearchService.SORT_ORDERS)}",
+            "results": [],
+            "total": 0
+        }), 400
+    
     # Get timestamp for cache invalidation if provided
     timestamp = request.args.get('t', '')
     
-    # Create a unique cache key based on the query parameters
-    cache_key = f"search:{query}:{page}:{per_page}"
+    # Create a unique cache key based on the query parameters; searches ignore
+    # spacing but not case (OR, AND and NOT are operators only in upper case)
+    normalized_query = ' '.join(query.split())
+    cache_key = f"search:{normalized_query}:{page}:{per_page}:{count_mode}:{sort}"
+    if cursor:
+        cache_key += f":cursor:{cursor}"
     include_external = request.args.get('include_external', 'false').lower() == 'true'
     if include_external:
         cache_key += ":external"
     
     # Add any filters to the cache key
-    for param in ['year_from', 'year_to', 'source', 'min_citations']:
+    for param in ['year_from', 'year_to', 'source', 'min_citations'] + [name for name, _ in ILIKE_FILTERS]:
         if request.args.get(param):
             cache_key += f":{param}:{request.args.get(param)}"
     
@@ -99,8 +144,9 @@ def api_search():
             logging.info(f"Returning cached results for {cache_key}")
             return jsonify(cached_result)
     
-    try:
-        search_service = SearchService()
+    def run_search():
+        """Run the search and cache its response (in the single-flight leader only)"""
+        search_service = SearchService(count_mode=count_mode)
         
         # Priority parameter to ensure more even distribution from all sources
         balance_sources = True
@@ -111,7 +157,9 @@ def api_search():
             per_page=per_page,
             include_external=include_external,
             balance_sources=balance_sources,
-            filters=request.args.to_dict()
+            filters=request.args.to_dict(),
+            cursor=cursor,
+            sort=sort
         )
         
         # Log the number of results and source distribution for debugging
@@ -148,16 +196,32 @@ def api_search():
         response = {
             "results": standardized_results,
             "total": search_results.get('total', 0),
+            "total_is_lower_bound": search_results.get('total_is_lower_bound', False),
+            "total_is_estimate": search_results.get('total_is_estimate', False),
             "page": page,
             "per_page": per_page,
             "external_apis_used": search_results.get('external_apis_used', False),
             "metrics": metrics,
+            "next_cursor": search_results.get('next_cursor'),
+            "timed_out_sources": search_results.get('timed_out_sources', []),
+            "rate_limited_sources": search_results.get('rate_limited_sources', {}),
+            "circuit_open_sources": search_results.get('circuit_open_sources', []),
             "source_distribution": source_distribution  # Include for debugging
         }
         
-        # Cache the results
-        if not debug_sources:
+        # Cache the results, unless some sources were cut off by the deadline or rate limit
+        if not debug_sources and not response["timed_out_sources"] and not response["rate_limited_sources"]:
             cache.set(cache_key, response, timeout=Config.CACHE_TIMEOUT)
+        return response
+    
+    try:
+        if debug_sources:
+            response = run_search()
+        else:
+            # Concurrent identical searches wait for the first one instead of repeating its work
+            response, shared = search_flight.do(cache_key, run_search)
+            if shared:
+                logging.info(f"Shared in-flight search results for {cache_key}")
         return jsonify(response)
         
     except Exception as e:
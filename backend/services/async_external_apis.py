@@ -0,0 +1,315 @@
+# services/async_external_apis.py
+import asyncio
+import threading
+import json
+import time
+import logging
+from typing import Dict, Any, List, Tuple, Optional
+import aiohttp
+from config import Config
+from services.external_apis import ExternalAPIService
+from services.circuit_breaker import CircuitBreakerRegistry
+from services.response_cache import response_cache
+from services.openlibrary_authors import author_resolver
+
+class AsyncExternalAPIService:
+    """
+    asyncio counterpart of ExternalAPIService built on aiohttp.
+
+    Requests and responses are built and parsed by ExternalAPIService, so
+    results are identical; only the transport differs. One event loop can
+    keep dozens of outbound calls in flight without a thread per call.
+    Concurrency per source is bounded by a semaphore so one search cannot
+    flood a single API.
+    """
+
+    def __init__(self, api: Optional[ExternalAPIService] = None):
+        self.api = api or ExternalAPIService()
+        self._session = None
+        self._semaphores = {}
+        self._author_lookups = {}
+
+    async def search_external(self, source: str, query: str, page: int = 1, per_page: int = 10,
+                              check_rate_limit: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Search one external API
+
+        Returns:
+            Tuple of (list of results, total count); ([], 0) on any failure
+        """
+        if source not in self.api.SOURCES:
+            logging.warning(f"Unknown external API source: {source}")
+            return [], 0
+
+        try:
+            url, params = self.api.build_search_request(source, query, page, per_page)
+            body = await self._fetch_body(source, url, params, check_rate_limit)
+            if body is None:
+                return [], 0
+            return self.api.parse_search_response(source, body)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in external API search ({source}): {str(e)}")
+            return [], 0
+
+    async def get_publication_details(self, source: str, pub_id: str) -> Optional[Dict[str, Any]]:
+        """Get detailed information about a publication from one external API"""
+        if source not in self.api.SOURCES:
+            logging.warning(f"Unknown external API source for details: {source}")
+            return None
+
+        try:
+            url, params = self.api.build_details_request(source, pub_id)
+            body = await self._fetch_body(source, url, params)
+            if body is None:
+                return None
+
+            result = self.api.parse_details_response(source, pub_id, body)
+            if result and source == 'openlibrary':
+                await self._resolve_openlibrary_authors(result)
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error getting publication details from {source}: {str(e)}")
+            return None
+
+    async def get_publication_details_batch(self, source: str, pub_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information about many publications of one source, with
+        the batches (or, for sources without batch requests, the single
+        lookups) in flight at once
+
+        Returns:
+            Dictionary of ID to result, without the IDs that were not found
+        """
+        if source not in self.api.SOURCES:
+            logging.warning(f"Unknown external API source for details: {source}")
+            return {}
+
+        pub_ids = list(dict.fromkeys(str(pub_id) for pub_id in pub_ids if pub_id))
+        if source not in self.api.DETAILS_BATCH_SIZES:
+            details = await asyncio.gather(*(self.get_publication_details(source, pub_id) for pub_id in pub_ids))
+            return {pub_id: result for pub_id, result in zip(pub_ids, details) if result}
+
+        async def fetch_batch(batch):
+            url, params = self.api.build_details_batch_request(source, batch)
+            body = await self._fetch_body(source, url, params)
+            return self.api.parse_details_batch_response(source, batch, body) if body is not None else {}
+
+        batch_size = self.api.DETAILS_BATCH_SIZES[source]
+        batches = await asyncio.gather(
+            *(fetch_batch(pub_ids[start:start + batch_size]) for start in range(0, len(pub_ids), batch_size)),
+            return_exceptions=True
+        )
+        results = {}
+        for batch in batches:
+            if isinstance(batch, Exception):
+                logging.error(f"Error getting publication details batch from {source}: {str(batch)}")
+            else:
+                results.update(batch)
+        return results
+
+    async def gather_sources(self, query: str, sources: List[str], deadline: float,
+                             page: int = 1, per_page: int = 10,
+                             check_rate_limit: bool = True) -> Dict[str, Any]:
+        """
+        Search several sources at once and keep what arrives before the deadline
+
+        Args:
+            query: Search text
+            sources: Source names, e.g. ['arxiv', 'openalex', 'crossref']
+            deadline: Overall budget in seconds
+            check_rate_limit: Whether each search takes a rate-limit token
+
+        Returns:
+            Dictionary with 'results' ({source: (results, total)} for the
+            sources that answered) and 'timed_out' (sources that did not)
+        """
+        tasks = {
+            source: asyncio.ensure_future(self.search_external(source, query, page, per_page, check_rate_limit))
+            for source in sources
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+        results, timed_out = {}, []
+        for source, task in tasks.items():
+            if task in done:
+                results[source] = task.result()
+            else:
+                timed_out.append(source)
+                logging.warning(f"External API {source} missed the {deadline:.3f}s deadline")
+        return {'results': results, 'timed_out': timed_out}
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _fetch_body(self, source: str, url: str, params: Optional[Dict[str, Any]] = None,
+                          check_rate_limit: bool = True) -> Optional[bytes]:
+        """
+        Body of a GET on behalf of a source, from the response cache when fresh
+
+        Same flow as ExternalAPIService._fetch_body: stale entries are
+        revalidated, and served as they are when the source is rate limited,
+        its circuit is open or the request fails.
+        """
+        # The response cache reads its SQLite index and body files: keep that off the event loop
+        cached = await self._run_blocking(response_cache.get, source, url, params)
+        if cached and cached['fresh']:
+            return cached['body']
+        stale_body = cached['body'] if cached else None
+
+        # So can the SQLite token bucket, which waits on its file lock
+        if check_rate_limit and not (await self._run_blocking(self.api.check_rate_limit, source))[0]:
+            return stale_body
+        breaker = CircuitBreakerRegistry.get(source)
+        if not breaker.allow_request():
+            logging.info(f"Circuit for {source} is open, skipping")
+            return stale_body
+
+        try:
+            status, body, headers = await self._fetch(source, url, params,
+                                                      response_cache.revalidation_headers(cached))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"{source} API error: {str(e)}")
+            return stale_body
+        except BaseException:
+            # Cancelled by the caller's deadline (even while waiting for the
+            # source semaphore) or failed before any verdict on the source:
+            # give back a half-open probe, or the breaker stays half open
+            breaker.release_probe()
+            raise
+        if status == 304 and cached:
+            await self._run_blocking(response_cache.refresh, cached['key'], source)
+            return stale_body
+        if status != 200:
+            logging.error(f"{source} API error: {status}")
+            return stale_body
+        await self._run_blocking(response_cache.put, source, url, params, body,
+                                 headers.get('ETag'), headers.get('Last-Modified'))
+        return body
+
+    async def _run_blocking(self, fn, *args):
+        """Run a blocking call (SQLite, file I/O) on the default executor, not on the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _fetch(self, source: str, url: str, params: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        GET through the shared session, at most EXTERNAL_ASYNC_PER_SOURCE at a
+        time per source, with the source breaker's adaptive read timeout
+
+        Returns:
+            Tuple of (status, body, response headers)
+        """
+        breaker = CircuitBreakerRegistry.get(source)
+        timeout = aiohttp.ClientTimeout(sock_connect=Config.HTTP_CONNECT_TIMEOUT,
+                                        sock_read=breaker.read_timeout())
+        async with self._semaphore(source):
+            start = time.monotonic()
+            try:
+                async with self._get_session().get(url, params=params, headers=headers,
+                                                   timeout=timeout) as response:
+                    body = await response.read()
+                    response_headers = dict(response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                breaker.record_failure()
+                raise
+
+        if response.status >= 500 or response.status == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - start)
+        return response.status, body, response_headers
+
+    async def _resolve_openlibrary_authors(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Look up the uncached Open Library authors of a work at once, sharing
+        the process-wide name cache and any lookup already in flight
+        """
+        author_keys = result.pop('author_keys', [])
+        lookups = []
+        for key in dict.fromkeys(author_keys):
+            if author_resolver.cached(key) is not None:
+                continue
+            if key not in self._author_lookups:
+                task = asyncio.ensure_future(self._fetch_openlibrary_author(key))
+                task.add_done_callback(lambda _, key=key: self._author_lookups.pop(key, None))
+                self._author_lookups[key] = task
+            # Shielded: a caller hitting its deadline must not cancel another's lookup
+            lookups.append(asyncio.shield(self._author_lookups[key]))
+        await asyncio.gather(*lookups, return_exceptions=True)
+
+        authors = [name for name in map(author_resolver.cached, author_keys) if name is not None]
+        result['author'] = ', '.join(authors) if authors else 'Unknown'
+        return result
+
+    async def _fetch_openlibrary_author(self, author_key: str):
+        author_url = f"{self.api.record_base_urls['openlibrary']}{author_key}.json"
+        body = await self._fetch_body('openlibrary', author_url, check_rate_limit=False)
+        if body is not None:
+            author_resolver.store(author_key, json.loads(body).get('name', 'Unknown'))
+
+    def _semaphore(self, source: str) -> asyncio.Semaphore:
+        if source not in self._semaphores:
+            self._semaphores[source] = asyncio.Semaphore(Config.EXTERNAL_ASYNC_PER_SOURCE)
+        return self._semaphores[source]
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it belongs to the loop that uses it
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=Config.HTTP_POOL_MAXSIZE * len(self.api.SOURCES),
+                                             limit_per_host=Config.HTTP_POOL_MAXSIZE,
+                                             ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(sock_connect=Config.HTTP_CONNECT_TIMEOUT,
+                                            sock_read=Config.HTTP_READ_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                  headers={'User-Agent': Config.HTTP_USER_AGENT})
+        return self._session
+
+
+class AsyncBridge:
+    """
+    Runs coroutines for synchronous code (Flask views, worker threads) on one
+    background event loop shared by the process.
+    """
+
+    _lock = threading.Lock()
+    _loop = None
+    _service = None
+
+    @classmethod
+    def run(cls, coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the background loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, cls._get_loop())
+        return future.result(timeout)
+
+    @classmethod
+    def service(cls) -> AsyncExternalAPIService:
+        """The process-wide AsyncExternalAPIService bound to the background loop"""
+        with cls._lock:
+            if cls._service is None:
+                cls._service = AsyncExternalAPIService()
+            return cls._service
+
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                cls._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=cls._loop.run_forever, name='external-api-loop', daemon=True)
+                thread.start()
+            return cls._loop
+
+
+def gather_sources(query: str, sources: List[str], deadline: float,
+                   page: int = 1, per_page: int = 10, check_rate_limit: bool = True) -> Dict[str, Any]:
+    """Synchronous bridge to AsyncExternalAPIService.gather_sources"""
+    coroutine = AsyncBridge.service().gather_sources(query, sources, deadline, page, per_page,
+                                                     check_rate_limit)
+    # The deadline is enforced inside; the extra second only covers loop scheduling
+    return AsyncBridge.run(coroutine, timeout=deadline + 1)
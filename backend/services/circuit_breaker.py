@@ -0,0 +1,168 @@
+# services/circuit_breaker.py
+import time
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any
+from config import Config
+
+class CircuitBreaker:
+    """
+    Circuit breaker and latency tracker for one external source.
+
+    closed    -> calls go through; BREAKER_FAILURE_THRESHOLD consecutive
+                 failures or slow calls (over BREAKER_SLOW_CALL_MS) open it
+    open      -> calls are refused at no cost until the open period ends
+    half_open -> a single probe call is let through; success closes the
+                 breaker, failure reopens it for twice as long (up to
+                 BREAKER_MAX_OPEN_SECONDS)
+
+    The read timeout adapts to the source: a multiple of the p95 latency of
+    recent successful calls, clamped to [ADAPTIVE_TIMEOUT_MIN, HTTP_READ_TIMEOUT].
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # Latency samples needed before the p95 replaces the static timeout
+    MIN_SAMPLES = 20
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.open_seconds = Config.BREAKER_OPEN_SECONDS
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.latencies = deque(maxlen=Config.BREAKER_LATENCY_WINDOW)
+        self.totals = {'success': 0, 'failure': 0, 'rejected': 0}
+
+    def allow_request(self) -> bool:
+        """Whether a call may go out now; in half-open state only one probe may"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = self.HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.totals['rejected'] += 1
+            return False
+
+    def is_open(self) -> bool:
+        """Whether calls are currently refused, without claiming a probe"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at < self.open_seconds
+            return self.state == self.HALF_OPEN and self.probe_in_flight
+
+    def record_success(self, latency: float):
+        """Record a completed call; one slower than BREAKER_SLOW_CALL_MS counts as a failure"""
+        with self._lock:
+            self.latencies.append(latency)
+        if latency * 1000 > Config.BREAKER_SLOW_CALL_MS:
+            logging.warning(f"⚠️ Slow response from {self.name}: {latency * 1000:.0f} ms")
+            self.record_failure()
+            return
+        with self._lock:
+            self.totals['success'] += 1
+            self.consecutive_failures = 0
+            if self.state != self.CLOSED:
+                logging.info(f"✅ Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.open_seconds = Config.BREAKER_OPEN_SECONDS
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed (error, 5xx/429 or timed out) or slow call"""
+        with self._lock:
+            self.totals['failure'] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN:
+                # Failed probe: back off further before the next one
+                self.open_seconds = min(self.open_seconds * 2, Config.BREAKER_MAX_OPEN_SECONDS)
+                self._open()
+            elif self.state == self.CLOSED and self.consecutive_failures >= Config.BREAKER_FAILURE_THRESHOLD:
+                self._open()
+
+    def read_timeout(self) -> float:
+        """Read timeout in seconds for the next call"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < self.MIN_SAMPLES:
+            return Config.HTTP_READ_TIMEOUT
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        timeout = p95 * Config.ADAPTIVE_TIMEOUT_MULTIPLIER
+        return max(Config.ADAPTIVE_TIMEOUT_MIN, min(timeout, Config.HTTP_READ_TIMEOUT))
+
+    def release_probe(self):
+        """Give back a half-open probe whose call was abandoned without an outcome"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.open_seconds = Config.BREAKER_OPEN_SECONDS
+            self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for the admin endpoint"""
+        read_timeout = self.read_timeout()
+        with self._lock:
+            samples = sorted(self.latencies)
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'open_seconds': self.open_seconds,
+                'half_open_in_seconds': round(retry_in, 1),
+                'p95_latency_ms': round(samples[int(len(samples) * 0.95) - 1] * 1000) if samples else None,
+                'latency_samples': len(samples),
+                'read_timeout_seconds': round(read_timeout, 3),
+                'totals': dict(self.totals)
+            }
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+        logging.warning(f"❌ Circuit for {self.name} opened for {self.open_seconds}s "
+                        f"after {self.consecutive_failures} failures")
+
+
+class CircuitBreakerRegistry:
+    """Process-wide breakers, one per external source"""
+
+    _lock = threading.Lock()
+    _breakers = {}
+
+    @classmethod
+    def get(cls, name: str) -> CircuitBreaker:
+        breaker = cls._breakers.get(name)
+        if breaker is None:
+            with cls._lock:
+                breaker = cls._breakers.setdefault(name, CircuitBreaker(name))
+        return breaker
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
+        with cls._lock:
+            breakers = dict(cls._breakers)
+        return {name: breaker.snapshot() for name, breaker in sorted(breakers.items())}
+
+    @classmethod
+    def reset(cls, name: str) -> bool:
+        breaker = cls._breakers.get(name)
+        if breaker is None:
+            return False
+        breaker.reset()
+        return True
@@ -1,29 +1,383 @@
 # services/database_service.py
+import os
 import logging
+import re
+import time
+import uuid
+import hashlib
+import threading
 from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.extensions
+import psycopg2.pool
+from psycopg2.extras import RealDictCursor, execute_batch
 from config import Config
 
+# %(name)s / %s placeholders as written for psycopg2, and escaped %%
+_PLACEHOLDER_RE = re.compile(r'%\((\w+)\)s|%s|%%')
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements were PREPAREd on it"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class ConnectionPool:
+    """
+    Process-wide pool of PreparingConnections shared by every DatabaseService.
+    
+    Wraps psycopg2's ThreadedConnectionPool with what it lacks: callers wait
+    up to DB_POOL_TIMEOUT for a free connection instead of failing when all
+    DB_POOL_MAX are out, connections idle for DB_POOL_HEALTH_CHECK_IDLE
+    seconds are checked with SELECT 1 before being handed out, and
+    connections older than DB_POOL_MAX_LIFETIME are closed on return. The
+    pool is created on first use in each process, so forked workers never
+    share sockets.
+    """
+    
+    def __init__(self, dsn=None, minconn=None, maxconn=None, max_lifetime=None, health_check_idle=None, timeout=None):
+        self.dsn = dsn or Config.DATABASE_URL
+        self.minconn = Config.DB_POOL_MIN if minconn is None else minconn
+        self.maxconn = maxconn or Config.DB_POOL_MAX
+        self.max_lifetime = max_lifetime or Config.DB_POOL_MAX_LIFETIME
+        self.health_check_idle = Config.DB_POOL_HEALTH_CHECK_IDLE if health_check_idle is None else health_check_idle
+        self.timeout = timeout or Config.DB_POOL_TIMEOUT
+        self._pool = None
+        self._pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._stats = {'checkouts': 0, 'waits': 0, 'timeouts': 0, 'recycled': 0, 'broken': 0}
+    
+    def getconn(self):
+        """
+        Borrow a healthy connection; hand it back with putconn
+        
+        Raises:
+            psycopg2.pool.PoolError: If none is free within the timeout
+        """
+        pool, slots = self._get_pool()
+        if not slots.acquire(blocking=False):
+            self._count('waits')
+            if not slots.acquire(timeout=self.timeout):
+                self._count('timeouts')
+                raise psycopg2.pool.PoolError(f"no database connection free after {self.timeout}s")
+        try:
+            # Every connection in the pool may have gone stale; a new one is made after that
+            for _ in range(self.maxconn + 1):
+                conn = pool.getconn()
+                if self._healthy(conn):
+                    conn.last_used = time.monotonic()
+                    self._count('checkouts')
+                    return conn
+                pool.putconn(conn, close=True)
+            raise psycopg2.OperationalError("could not get a working database connection")
+        except Exception:
+            slots.release()
+            raise
+    
+    def putconn(self, conn):
+        """Return a borrowed connection, rolled back; old or broken ones are closed"""
+        pool, slots = self._pool, self._slots
+        if pool is None or self._pid != os.getpid():
+            # Borrowed before a fork or a close_all: not ours to return
+            conn.close()
+            return
+        try:
+            close = conn.closed or time.monotonic() - conn.created_at > self.max_lifetime
+            if not close:
+                try:
+                    if conn.autocommit:
+                        conn.autocommit = False
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+            if close and not conn.closed:
+                self._count('recycled')
+            conn.last_used = time.monotonic()
+            pool.putconn(conn, close=close)
+        finally:
+            slots.release()
+    
+    def close_all(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.closeall()
+            self._pool = None
+    
+    def stats(self):
+        """Pool size, connections in use and counters (this worker only)"""
+        with self._lock:
+            pool = self._pool
+            stats = dict(self._stats)
+        stats.update({
+            'min': self.minconn,
+            'max': self.maxconn,
+            'open': len(pool._pool) + len(pool._used) if pool else 0,
+            'in_use': len(pool._used) if pool else 0
+        })
+        return stats
+    
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = psycopg2.pool.ThreadedConnectionPool(
+                    self.minconn, self.maxconn, self.dsn, connection_factory=PreparingConnection)
+                self._slots = threading.BoundedSemaphore(self.maxconn)
+                self._pid = os.getpid()
+                logging.info(f"✅ Database pool ready ({self.minconn}-{self.maxconn} connections)")
+            return self._pool, self._slots
+    
+    def _healthy(self, conn):
+        if conn.closed:
+            self._count('broken')
+            return False
+        if time.monotonic() - conn.created_at > self.max_lifetime:
+            self._count('recycled')
+            return False
+        if time.monotonic() - conn.last_used < self.health_check_idle:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logging.warning(f"⚠️ Dropping broken pooled connection: {str(e)}")
+            self._count('broken')
+            return False
+    
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+# Shared by every DatabaseService in the process
+connection_pool = ConnectionPool()
+
 class DatabaseService:
-    def __init__(self):
-        self.connection_string = Config.DATABASE_URL
+    # Prepared statements live on the pooled connection that PREPAREd them;
+    # reuse is counted per query shape across all connections
+    _prepared_stats_lock = threading.Lock()
+    _prepared_stats = {'hits': 0, 'misses': 0, 'shapes': {}}
+    
+    def __init__(self, pool=None):
+        self.pool = pool or connection_pool
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
+        """Context manager borrowing a pooled connection; uncommitted work is rolled back on return"""
         conn = None
         try:
-            conn = psycopg2.connect(self.connection_string)
+            conn = self.pool.getconn()
             yield conn
         except Exception as e:
             logging.error(f"Database connection error: {str(e)}")
-            if conn:
-                conn.rollback()
+            if conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
             raise
         finally:
             if conn:
-                conn.close()
+                self.pool.putconn(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements in one transaction
+        
+        Yields:
+            RealDictCursor on a pooled connection; committed if the block
+            succeeds, rolled back if it raises
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                yield cursor
+            conn.commit()
+    
+    def execute_query(self, query, params=None, fetch=True):
+        """
+        Execute one statement on a pooled connection and commit it
+        
+        Args:
+            query: SQL using %(name)s or %s placeholders
+            params: Dict or sequence of parameter values
+            fetch: Whether to return the result rows
+            
+        Returns:
+            List of row dicts if fetch is True and the statement returns rows,
+            otherwise None
+        """
+        with self.transaction() as cursor:
+            cursor.execute(query, params)
+            if fetch and cursor.description:
+                return [dict(row) for row in cursor.fetchall()]
+            return None
+    
+    def execute_autocommit(self, query, params=None):
+        """
+        Execute a statement outside any transaction block
+        
+        For statements PostgreSQL refuses inside one, e.g. CREATE INDEX
+        CONCURRENTLY or VACUUM. The connection is back in transaction mode
+        when it returns to the pool.
+        """
+        with self.get_connection() as conn:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+    
+    def iter_query(self, query, params=None, batch_size=1000):
+        """
+        Stream the rows of a query in batches through a server-side cursor
+        
+        Only one batch is held in memory at a time; the pooled connection is
+        kept until the generator is exhausted or closed.
+        
+        Args:
+            query: SELECT statement, SQL text or psycopg2.sql Composable
+            params: Dict or sequence of parameter values
+            batch_size: Rows fetched per round trip and yielded per batch
+            
+        Yields:
+            Lists of up to batch_size row dicts
+        """
+        with self.get_connection() as conn:
+            # Named cursors only exist inside a transaction, which putconn rolls back
+            with conn.cursor(name=f"iter_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [dict(row) for row in rows]
+    
+    def executemany(self, query, params_seq, page_size=100):
+        """
+        Execute one statement for each parameter set, in one transaction
+        
+        Statements are sent page_size at a time (psycopg2 execute_batch)
+        rather than one round trip each.
+        
+        Returns:
+            Number of parameter sets executed
+        """
+        params_seq = list(params_seq)
+        if not params_seq:
+            return 0
+        with self.transaction() as cursor:
+            execute_batch(cursor, query, params_seq, page_size=page_size)
+        return len(params_seq)
+    
+    def execute_prepared(self, query, params=None, fetch=True):
+        """
+        Execute a query as a server-side prepared statement.
+        
+        The statement is keyed by its SQL text, so every query with the same
+        shape (same filters present, different values) is parsed and planned
+        once per connection and then only EXECUTEd.
+        
+        Args:
+            query: SQL using %(name)s or %s placeholders
+            params: Dict or sequence of parameter values
+            fetch: Whether to return the result rows
+            
+        Returns:
+            List of row dicts if fetch is True, otherwise None
+        """
+        statement_sql, names = self._to_positional(query)
+        name = "biblio_" + hashlib.sha1(statement_sql.encode('utf-8')).hexdigest()[:16]
+        if isinstance(params, dict):
+            values = [params[n] for n in names]
+        else:
+            values = list(params or [])
+        
+        with self.get_connection() as conn:
+            return self._execute_prepared(conn, name, statement_sql, values, fetch)
+    
+    def _execute_prepared(self, conn, name, statement_sql, values, fetch):
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                hit = name in conn.prepared_statements
+                if not hit:
+                    cursor.execute(f"PREPARE {name} AS {statement_sql}")
+                    conn.prepared_statements.add(name)
+                self._record_prepared(name, statement_sql, hit)
+                
+                if values:
+                    placeholders = ", ".join(["%s"] * len(values))
+                    cursor.execute(f"EXECUTE {name} ({placeholders})", values)
+                else:
+                    cursor.execute(f"EXECUTE {name}")
+                
+                rows = [dict(row) for row in cursor.fetchall()] if fetch and cursor.description else None
+            conn.commit()
+            return rows
+        except psycopg2.Error as e:
+            # A failed PREPARE/EXECUTE (e.g. after a schema change) is re-prepared next time
+            conn.prepared_statements.discard(name)
+            try:
+                conn.rollback()
+                conn.cursor().execute(f"DEALLOCATE {name}")
+                conn.commit()
+            except psycopg2.Error:
+                pass
+            logging.error(f"Prepared statement {name} failed: {str(e)}")
+            raise
+    
+    @classmethod
+    def prepared_statement_stats(cls):
+        """Hit/miss counts of the prepared statement registry, overall and per shape"""
+        with cls._prepared_stats_lock:
+            hits = cls._prepared_stats['hits']
+            misses = cls._prepared_stats['misses']
+            total = hits + misses
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0,
+                'shapes': {name: dict(shape) for name, shape in cls._prepared_stats['shapes'].items()}
+            }
+    
+    @classmethod
+    def _record_prepared(cls, name, statement_sql, hit):
+        with cls._prepared_stats_lock:
+            cls._prepared_stats['hits' if hit else 'misses'] += 1
+            shape = cls._prepared_stats['shapes'].setdefault(name, {
+                'hits': 0,
+                'misses': 0,
+                'sql': ' '.join(statement_sql.split())[:200]
+            })
+            shape['hits' if hit else 'misses'] += 1
+    
+    @staticmethod
+    def _to_positional(query):
+        """
+        Rewrite psycopg2 placeholders as $1..$n for PREPARE
+        
+        Returns:
+            Tuple of (rewritten SQL, parameter names in $n order; empty for %s style)
+        """
+        names = []
+        counter = [0]
+        
+        def replace(match):
+            token = match.group(0)
+            if token == '%%':
+                return '%'
+            if token == '%s':
+                counter[0] += 1
+                return f"${counter[0]}"
+            name = match.group(1)
+            if name not in names:
+                names.append(name)
+            return f"${names.index(name) + 1}"
+        
+        return _PLACEHOLDER_RE.sub(replace, query), names
     
     def search_publications(self, query, page=1, per_page=20, filters=None):
         """
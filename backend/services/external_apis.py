@@ -1,14 +1,35 @@
 # services/external_apis.py
 import requests
-import xml.etree.ElementTree as ET
 import time
 import json
 import logging
 import urllib.parse
 from typing import Dict, Any, List, Tuple, Optional
+from services.http_session import HTTPSessionManager
+from services.rate_limiter import rate_limiter
+from services.circuit_breaker import CircuitBreakerRegistry
+from services.response_cache import response_cache
+from services.openlibrary_authors import author_resolver
+from services.xml_parsers import parse_arxiv_feed, parse_arxiv_entry, parse_dblp_record
+from config import Config
 
 class ExternalAPIService:
-    """Service for interacting with external APIs to fetch publication data"""
+    """
+    Service for interacting with external APIs to fetch publication data
+    
+    Each source is described by a request builder (URL and query parameters)
+    and a response parser (raw body to normalized results). The synchronous
+    methods here and AsyncExternalAPIService share both, so only the
+    transport differs.
+    """
+    
+    SOURCES = ('arxiv', 'openalex', 'crossref', 'openlibrary', 'dblp', 'gutendex', 'gbif')
+    
+    # Attempts per search request; Crossref is prone to transient 5xx errors
+    SEARCH_ATTEMPTS = {'crossref': 3}
+    
+    # Most IDs one details request can carry, for the sources that accept several
+    DETAILS_BATCH_SIZES = {'arxiv': 100, 'openalex': 50, 'crossref': 20}
     
     def __init__(self):
         self.api_base_urls = {
@@ -20,17 +41,30 @@ class ExternalAPIService:
             'gutendex': 'https://gutendex.com/books',
             'gbif': 'https://api.gbif.org/v1/literature/search'
         }
+        # Record pages that live outside the search endpoints above
+        self.record_base_urls = {
+            'dblp': 'https://dblp.org/rec',
+            'openlibrary': 'https://openlibrary.org'
+        }
+        # Token buckets: `limit` requests per `window` seconds, shared by all workers
         self.rate_limits = {
-            'openalex': {'requests': 0, 'last_request': 0, 'limit': 100, 'window': 3600},  # 100 per hour
-            'arxiv': {'requests': 0, 'last_request': 0, 'limit': 30, 'window': 60},       # 30 per minute
-            'crossref': {'requests': 0, 'last_request': 0, 'limit': 50, 'window': 60},    # 50 per minute
-            'openlibrary': {'requests': 0, 'last_request': 0, 'limit': 100, 'window': 60}, # 100 per minute
-            'dblp': {'requests': 0, 'last_request': 0, 'limit': 10, 'window': 60},        # 10 per minute
-            'gutendex': {'requests': 0, 'last_request': 0, 'limit': 100, 'window': 60},   # 100 per minute
-            'gbif': {'requests': 0, 'last_request': 0, 'limit': 60, 'window': 60}         # 60 per minute
+            'openalex': {'limit': 100, 'window': 3600},  # 100 per hour
+            'arxiv': {'limit': 30, 'window': 60},        # 30 per minute
+            'crossref': {'limit': 50, 'window': 60},     # 50 per minute
+            'openlibrary': {'limit': 100, 'window': 60}, # 100 per minute
+            'dblp': {'limit': 10, 'window': 60},         # 10 per minute
+            'gutendex': {'limit': 100, 'window': 60},    # 100 per minute
+            'gbif': {'limit': 60, 'window': 60}          # 60 per minute
         }
+        
+        # Test mode: every source replayed by tools/replay_server.py under /<source>
+        if Config.EXTERNAL_API_REPLAY_URL:
+            replay_url = Config.EXTERNAL_API_REPLAY_URL.rstrip('/')
+            self.api_base_urls = {source: f"{replay_url}/{source}" for source in self.api_base_urls}
+            self.record_base_urls = {source: f"{replay_url}/{source}-records" for source in self.record_base_urls}
     
-    def search_external(self, source: str, query: str, page: int = 1, per_page: int = 10) -> Tuple[List[Dict[str, Any]], int]:
+    def search_external(self, source: str, query: str, page: int = 1, per_page: int = 10,
+                        check_rate_limit: bool = True) -> Tuple[List[Dict[str, Any]], int]:
         """
         Search external APIs for publications
         
@@ -39,205 +73,408 @@ class ExternalAPIService:
             query: Search text
             page: Page number (starting from 1)
             per_page: Number of results per page
-            
+            check_rate_limit: Take a rate-limit token first; pass False if the
+                              caller already did (see check_rate_limit())
+        
         Returns:
             Tuple of (list of results, total count)
         """
         logging.info(f"Searching external API: {source} for query: {query}, page: {page}, per_page: {per_page}")
         
+        if source not in self.SOURCES:
+            logging.warning(f"Unknown external API source: {source}")
+            return [], 0
+        
         try:
-            if source == 'arxiv':
-                return self._search_arxiv(query, page, per_page)
-            elif source == 'openalex':
-                return self._search_openalex(query, page, per_page)
-            elif source == 'crossref':
-                return self._search_crossref(query, page, per_page)
-            elif source == 'openlibrary':
-                return self._search_openlibrary(query, page, per_page)
-            elif source == 'dblp':
-                return self._search_dblp(query, page, per_page)
-            elif source == 'gutendex':
-                return self._search_gutendex(query, page, per_page)
-            elif source == 'gbif':
-                return self._search_gbif(query, page, per_page)
-            else:
-                logging.warning(f"Unknown external API source: {source}")
+            url, params = self.build_search_request(source, query, page, per_page)
+            body = self._fetch_body(source, url, params, check_rate_limit,
+                                    attempts=self.SEARCH_ATTEMPTS.get(source, 1))
+            if body is None:
                 return [], 0
+            return self.parse_search_response(source, body)
         except Exception as e:
             logging.error(f"Error in external API search ({source}): {str(e)}")
             return [], 0
     
+    def search_is_cached(self, source: str, query: str, page: int = 1, per_page: int = 10) -> bool:
+        """Whether search_external would be answered from the response cache without a request"""
+        if source not in self.SOURCES:
+            return False
+        url, params = self.build_search_request(source, query, page, per_page)
+        return response_cache.is_fresh(source, url, params)
+    
     def get_publication_details(self, source: str, pub_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a publication from external API"""
+        if source not in self.SOURCES:
+            logging.warning(f"Unknown external API source for details: {source}")
+            return None
+        
         try:
-            if source == 'arxiv':
-                return self._get_arxiv_details(pub_id)
-            elif source == 'openalex':
-                return self._get_openalex_details(pub_id)
-            elif source == 'crossref':
-                return self._get_crossref_details(pub_id)
-            elif source == 'openlibrary':
-                return self._get_openlibrary_details(pub_id)
-            elif source == 'dblp':
-                return self._get_dblp_details(pub_id)
-            elif source == 'gutendex':
-                return self._get_gutendex_details(pub_id)
-            elif source == 'gbif':
-                return self._get_gbif_details(pub_id)
-            else:
-                logging.warning(f"Unknown external API source for details: {source}")
+            url, params = self.build_details_request(source, pub_id)
+            body = self._fetch_body(source, url, params)
+            if body is None:
                 return None
+            
+            result = self.parse_details_response(source, pub_id, body)
+            if result and source == 'openlibrary':
+                self._resolve_openlibrary_authors(result)
+            return result
         except Exception as e:
             logging.error(f"Error getting publication details from {source}: {str(e)}")
             return None
     
-    def _check_rate_limit(self, source: str) -> bool:
-        """Check if rate limit allows a request, and update counters"""
-        now = time.time()
-        rate_info = self.rate_limits.get(source)
+    def get_publication_details_batch(self, source: str, pub_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information about many publications of one source
         
-        if not rate_info:
-            return True
-        
-        # Reset counter if window has passed
-        if now - rate_info['last_request'] > rate_info['window']:
-            rate_info['requests'] = 0
-            rate_info['last_request'] = now
-        
-        # Check if limit reached
-        if rate_info['requests'] >= rate_info['limit']:
-            logging.warning(f"Rate limit reached for {source}, waiting...")
-            time.sleep(rate_info['window'] - (now - rate_info['last_request']) + 1)
-            rate_info['requests'] = 0
-            rate_info['last_request'] = time.time()
-        
-        # Update counters
-        rate_info['requests'] += 1
-        rate_info['last_request'] = now
-        
-        return True
-    
-    def _search_arxiv(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search arXiv API"""
-        self._check_rate_limit('arxiv')
-        
-        # arXiv uses start and max_results parameters
-        start = (page - 1) * per_page
-        
-        # Prepare URL and parameters
-        search_query = f"all:{query.replace(' ', '+')}"
-        params = {
-            'search_query': search_query,
-            'start': start,
-            'max_results': per_page,
-            'sortBy': 'relevance',
-            'sortOrder': 'descending'
-        }
+        arXiv, OpenAlex and Crossref records are fetched DETAILS_BATCH_SIZES
+        at a time; other sources fall back to one request per ID.
         
-        # Make request
-        response = requests.get(self.api_base_urls['arxiv'], params=params)
+        Args:
+            source: API source
+            pub_ids: Publication IDs as accepted by get_publication_details
         
-        if response.status_code != 200:
-            logging.error(f"arXiv API error: {response.status_code}")
-            return [], 0
+        Returns:
+            Dictionary of ID to result, without the IDs that were not found
+        """
+        if source not in self.SOURCES:
+            logging.warning(f"Unknown external API source for details: {source}")
+            return {}
+        
+        pub_ids = list(dict.fromkeys(str(pub_id) for pub_id in pub_ids if pub_id))
+        results = {}
+        if source not in self.DETAILS_BATCH_SIZES:
+            for pub_id in pub_ids:
+                result = self.get_publication_details(source, pub_id)
+                if result:
+                    results[pub_id] = result
+            return results
+        
+        batch_size = self.DETAILS_BATCH_SIZES[source]
+        for start in range(0, len(pub_ids), batch_size):
+            batch = pub_ids[start:start + batch_size]
+            try:
+                url, params = self.build_details_batch_request(source, batch)
+                body = self._fetch_body(source, url, params)
+                if body is not None:
+                    results.update(self.parse_details_batch_response(source, batch, body))
+            except Exception as e:
+                logging.error(f"Error getting publication details batch from {source}: {str(e)}")
+        return results
+    
+    def fetch_page(self, source: str, url: str, params: Dict[str, Any], attempts: int = 3) -> Any:
+        """
+        One page of a bulk harvest (see data_processing/harvester.py)
         
-        # Parse XML response
-        try:
-            root = ET.fromstring(response.content)
-            
-            # Get namespace from the root element
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            # Parse entries
-            entries = root.findall('.//atom:entry', ns)
-            
-            results = []
-            for entry in entries:
-                # Get ID (arXiv ID)
-                id_elem = entry.find('./atom:id', ns)
-                if id_elem is not None:
-                    arxiv_id = id_elem.text.split('/')[-1]
-                else:
-                    continue  # Skip entries without ID
-                
-                # Get title
-                title_elem = entry.find('./atom:title', ns)
-                title = title_elem.text if title_elem is not None else "No title"
-                
-                # Get authors
-                authors = []
-                for author_elem in entry.findall('./atom:author/atom:name', ns):
-                    if author_elem.text:
-                        authors.append(author_elem.text)
-                
-                # Get publication date
-                published_elem = entry.find('./atom:published', ns)
-                published = published_elem.text if published_elem is not None else ""
-                year = published.split('-')[0] if published and '-' in published else ""
-                
-                # Get abstract
-                summary_elem = entry.find('./atom:summary', ns)
-                abstract = summary_elem.text if summary_elem is not None else ""
-                
-                # Get DOI if available
-                doi = None
-                
-                # Get categories/subjects
-                categories = []
-                for category_elem in entry.findall('./atom:category', ns):
-                    term = category_elem.get('term')
-                    if term:
-                        categories.append(term)
-                
-                # Create result object
-                result = {
-                    'id': arxiv_id,
-                    'title': title,
-                    'author': ', '.join(authors),
-                    'year': year,
-                    'abstract': abstract,
-                    'doi': doi,
-                    'subject': ', '.join(categories) if categories else None,
-                    'citations': 0,  # arXiv doesn't provide citation counts
-                    'source': 'arxiv',
-                    'url': f"https://arxiv.org/abs/{arxiv_id}"
-                }
-                
-                results.append(result)
-            
-            # Try to get total count if available
-            total_results_elem = root.find('.//opensearch:totalResults', 
-                                         {'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'})
-            total = int(total_results_elem.text) if total_results_elem is not None else len(results)
-            
-            return results, total
+        Unlike the interactive lookups this waits for a rate-limit token and
+        for an open circuit instead of giving up, and bypasses the response
+        cache, since harvested pages are not requested twice.
+        
+        Returns:
+            Decoded JSON response
+        
+        Raises:
+            requests.exceptions.RequestException on a 4XX response, or once
+            attempts are exhausted
+        """
+        breaker = CircuitBreakerRegistry.get(source)
+        for attempt in range(attempts):
+            while True:
+                allowed, retry_after_ms = self.check_rate_limit(source)
+                if allowed:
+                    break
+                time.sleep(retry_after_ms / 1000)
+            while not breaker.allow_request():
+                time.sleep(1)
             
+            try:
+                response = self._request(source, url, params)
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if attempt == attempts - 1 or (status and status < 500 and status != 429):
+                    raise
+                logging.warning(f"⚠️ {source} page request failed ({str(e)}), retrying")
+                time.sleep(2 ** attempt)
+    
+    def build_search_request(self, source: str, query: str, page: int, per_page: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        URL and query parameters of a search request
+        
+        Returns:
+            Tuple of (url, params)
+        """
+        base_url = self.api_base_urls[source]
+        offset = (page - 1) * per_page
+        
+        if source == 'arxiv':
+            # arXiv uses start and max_results parameters
+            return base_url, {
+                'search_query': f"all:{query.replace(' ', '+')}",
+                'start': offset,
+                'max_results': per_page,
+                'sortBy': 'relevance',
+                'sortOrder': 'descending'
+            }
+        if source == 'openalex':
+            # OpenAlex uses page and per-page parameters
+            return f"{base_url}/works", {
+                'search': query,
+                'page': page,
+                'per-page': per_page,
+                'sort': 'relevance_score:desc'
+            }
+        if source == 'crossref':
+            # Crossref uses rows and offset parameters
+            return base_url, {
+                'query': query,
+                'rows': per_page,
+                'offset': offset,
+                'sort': 'relevance',
+                'order': 'desc'
+            }
+        if source == 'dblp':
+            # DBLP uses h (max hits) and f (first) parameters
+            return base_url, {'q': query, 'format': 'json', 'h': per_page, 'f': offset}
+        if source == 'openlibrary':
+            # Open Library uses page and limit parameters
+            return base_url, {'q': query, 'page': page, 'limit': per_page}
+        if source == 'gutendex':
+            # Gutendex pages are fixed-size; get books with text content
+            return base_url, {'search': query, 'page': page, 'mime_type': 'text'}
+        # GBIF uses offset and limit parameters
+        return base_url, {'q': query, 'offset': offset, 'limit': per_page}
+    
+    def build_details_request(self, source: str, pub_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        URL and query parameters of a publication details request
+        
+        Returns:
+            Tuple of (url, params or None)
+        """
+        if source == 'arxiv':
+            return self.api_base_urls['arxiv'], {'id_list': pub_id}
+        if source == 'openalex':
+            return f"{self.api_base_urls['openalex']}/works/W{pub_id}", None
+        if source == 'dblp':
+            # For DBLP, we need to convert the ID to a record URL
+            return f"{self.record_base_urls['dblp']}/{pub_id}.xml", None
+        if source == 'openlibrary':
+            return f"{self.record_base_urls['openlibrary']}/works/{pub_id}.json", None
+        # Crossref, Gutendex and GBIF address records under the search endpoint
+        return f"{self.api_base_urls[source]}/{pub_id}", None
+    
+    def build_details_batch_request(self, source: str, pub_ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        """
+        URL and query parameters of one request for several publications
+        (arXiv, OpenAlex and Crossref only)
+        """
+        if source == 'arxiv':
+            return self.api_base_urls['arxiv'], {'id_list': ','.join(pub_ids), 'max_results': len(pub_ids)}
+        if source == 'openalex':
+            return f"{self.api_base_urls['openalex']}/works", {
+                'filter': 'ids.openalex:' + '|'.join(f"W{pub_id}" for pub_id in pub_ids),
+                'per-page': len(pub_ids)
+            }
+        if source == 'crossref':
+            return self.api_base_urls['crossref'], {
+                'filter': ','.join(f"doi:{pub_id}" for pub_id in pub_ids),
+                'rows': len(pub_ids)
+            }
+        raise ValueError(f"{source} does not support batched details requests")
+    
+    def parse_search_response(self, source: str, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Normalize a raw search response body
+        
+        Returns:
+            Tuple of (list of results, total count); ([], 0) if unparseable
+        """
+        parsers = {
+            'arxiv': self._parse_arxiv_search,
+            'openalex': self._parse_openalex_search,
+            'crossref': self._parse_crossref_search,
+            'dblp': self._parse_dblp_search,
+            'openlibrary': self._parse_openlibrary_search,
+            'gutendex': self._parse_gutendex_search,
+            'gbif': self._parse_gbif_search
+        }
+        try:
+            return parsers[source](body)
         except Exception as e:
-            logging.error(f"Error parsing arXiv response: {str(e)}")
+            logging.error(f"Error parsing {source} response: {str(e)}")
             return [], 0
     
-    def _search_openalex(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search OpenAlex API"""
-        self._check_rate_limit('openalex')
+    def parse_details_response(self, source: str, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Normalize a raw publication details response body
         
-        # OpenAlex uses page and per-page parameters
-        params = {
-            'search': query,
-            'page': page,
-            'per-page': per_page,
-            'sort': 'relevance_score:desc'
+        Open Library results carry 'author_keys' still to be resolved to
+        names (see _resolve_openlibrary_authors).
+        """
+        parsers = {
+            'arxiv': self._parse_arxiv_details,
+            'openalex': self._parse_openalex_details,
+            'crossref': self._parse_crossref_details,
+            'dblp': self._parse_dblp_details,
+            'openlibrary': self._parse_openlibrary_details,
+            'gutendex': self._parse_gutendex_details,
+            'gbif': self._parse_gbif_details
         }
+        try:
+            return parsers[source](pub_id, body)
+        except Exception as e:
+            logging.error(f"Error parsing {source} details: {str(e)}")
+            return None
+    
+    def parse_details_batch_response(self, source: str, pub_ids: List[str], body: bytes) -> Dict[str, Dict[str, Any]]:
+        """
+        Normalize a batched details response into {requested ID: result}
         
-        # Make request
-        url = f"{self.api_base_urls['openalex']}/works"
-        response = requests.get(url, params=params)
+        The listing is parsed like a search response, then each record is
+        matched back to the ID it was requested by: arXiv IDs with or without
+        a version, Crossref DOIs case-insensitively.
+        """
+        try:
+            records, _ = self.parse_search_response(source, body)
+        except Exception as e:
+            logging.error(f"Error parsing {source} details batch: {str(e)}")
+            return {}
+        
+        requested = {self._batch_match_key(source, pub_id): pub_id for pub_id in pub_ids}
+        results = {}
+        for record in records:
+            key = self._batch_match_key(source, str(record.get('doi') if source == 'crossref' else record.get('id')))
+            pub_id = requested.get(key)
+            if pub_id is None and source == 'arxiv':
+                pub_id = requested.get(key.rsplit('v', 1)[0])
+            if pub_id is None:
+                continue
+            record['id'] = pub_id
+            if source == 'arxiv':
+                record['url'] = f"https://arxiv.org/abs/{pub_id}"
+            elif source == 'crossref':
+                record.update({'doi': pub_id, 'url': f"https://doi.org/{pub_id}"})
+            results[pub_id] = record
+        return results
+    
+    def _batch_match_key(self, source: str, pub_id: str) -> str:
+        if source == 'arxiv':
+            # Old-style IDs (hep-th/9901001) come back without their archive prefix
+            return pub_id.split('/')[-1]
+        return pub_id.lower() if source == 'crossref' else pub_id
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET over the shared keep-alive session for the URL's host"""
+        return HTTPSessionManager.get(url, **kwargs)
+    
+    def _fetch_body(self, source: str, url: str, params: Optional[Dict[str, Any]] = None,
+                    check_rate_limit: bool = True, attempts: int = 1) -> Optional[bytes]:
+        """
+        Body of a GET on behalf of a source, from the response cache when fresh
         
-        if response.status_code != 200:
-            logging.error(f"OpenAlex API error: {response.status_code}")
-            return [], 0
+        Only cache misses and stale entries take a rate-limit token and go
+        through the circuit breaker. Stale entries are revalidated with their
+        ETag / Last-Modified, and are served as they are when the source is
+        rate limited, its circuit is open or the request fails.
+        
+        Returns:
+            Response body, or None if nothing could be fetched
+        """
+        cached = response_cache.get(source, url, params)
+        if cached and cached['fresh']:
+            return cached['body']
+        stale_body = cached['body'] if cached else None
+        
+        if check_rate_limit and not self.check_rate_limit(source)[0]:
+            return stale_body
+        if not CircuitBreakerRegistry.get(source).allow_request():
+            logging.info(f"Circuit for {source} is open, skipping")
+            return stale_body
+        
+        headers = response_cache.revalidation_headers(cached)
+        for attempt in range(attempts):
+            try:
+                response = self._request(source, url, params, headers)
+                if response.status_code == 304 and cached:
+                    response_cache.refresh(cached['key'], source)
+                    return stale_body
+                response.raise_for_status()  # Raise exception for 4XX/5XX responses
+                break
+            except requests.exceptions.RequestException as e:
+                if attempt == attempts - 1:  # Last attempt
+                    logging.error(f"{source} API error: {str(e)}")
+                    return stale_body
+                time.sleep(2)  # Wait before retrying
+        
+        if response.status_code == 200:
+            response_cache.put(source, url, params, response.content,
+                               response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.content
+    
+    def _request(self, source: str, url: str, params: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        GET on behalf of a source, feeding its circuit breaker
+        
+        The read timeout comes from the breaker's observed p95 latency.
+        Connection errors, timeouts, 5xx and 429 responses count as failures.
+        """
+        breaker = CircuitBreakerRegistry.get(source)
+        start = time.monotonic()
+        try:
+            response = self._get(url, params=params, headers=headers,
+                                 timeout=(Config.HTTP_CONNECT_TIMEOUT, breaker.read_timeout()))
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - start)
+        return response
+    
+    def check_rate_limit(self, source: str) -> Tuple[bool, int]:
+        """
+        Take a token from the source's bucket without waiting
+        
+        Returns:
+            Tuple of (allowed, retry_after_ms); a refused source should be
+            skipped or deferred rather than waited for
+        """
+        rate_info = self.rate_limits.get(source)
+        if not rate_info:
+            return True, 0
         
-        # Parse JSON response
-        data = response.json()
+        allowed, retry_after_ms = rate_limiter.acquire(source, rate_info['limit'], rate_info['window'])
+        if not allowed:
+            logging.warning(f"Rate limit reached for {source}, retry after {retry_after_ms} ms")
+        return allowed, retry_after_ms
+    
+    def _resolve_openlibrary_authors(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace an Open Library result's author_keys with author names"""
+        authors = author_resolver.resolve(result.pop('author_keys', []), self._fetch_openlibrary_author)
+        result['author'] = ', '.join(authors) if authors else 'Unknown'
+        return result
+    
+    def _fetch_openlibrary_author(self, author_key: str) -> Optional[str]:
+        """Name of one Open Library author record, or None if it could not be fetched"""
+        author_url = f"{self.record_base_urls['openlibrary']}{author_key}.json"
+        author_body = self._fetch_body('openlibrary', author_url, check_rate_limit=False)
+        if author_body is None:
+            return None
+        return json.loads(author_body).get('name', 'Unknown')
+    
+    # Search response parsers
+    def _parse_arxiv_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse an arXiv Atom feed"""
+        return parse_arxiv_feed(body)
+    
+    def _parse_openalex_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse an OpenAlex works listing"""
+        data = json.loads(body)
         
         results = []
         for work in data.get('results', []):
@@ -276,423 +513,135 @@ class ExternalAPIService:
         
         return results, total
     
-    def _search_crossref(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search Crossref API"""
-        self._check_rate_limit('crossref')
+    def _parse_crossref_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse a Crossref works listing"""
+        data = json.loads(body)
         
-        # Crossref uses rows and offset parameters
-        offset = (page - 1) * per_page
+        results = []
+        for item in data.get('message', {}).get('items', []):
+            result = self._crossref_item(item)
+            result['id'] = item.get('DOI', '')
+            results.append(result)
         
-        # Prepare URL and parameters
-        params = {
-            'query': query,
-            'rows': per_page,
-            'offset': offset,
-            'sort': 'relevance',
-            'order': 'desc'
-        }
+        # Get total count
+        total = data.get('message', {}).get('total-results', len(results))
         
-        # Make request with proper error handling
-        for attempt in range(3):  # Retry 3 times if needed
-            try:
-                response = requests.get(self.api_base_urls['crossref'], params=params)
-                response.raise_for_status()  # Raise exception for 4XX/5XX responses
-                data = response.json()
-                break
-            except requests.exceptions.RequestException as e:
-                if attempt == 2:  # Last attempt
-                    logging.error(f"Crossref API error after 3 retries: {str(e)}")
-                    return [], 0
-                time.sleep(2)  # Wait before retrying
+        return results, total
+    
+    def _parse_dblp_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse a DBLP JSON search response"""
+        data = json.loads(body)
+        
+        # Check if data has the expected structure
+        if 'result' not in data or 'hits' not in data['result']:
+            logging.error("Unexpected DBLP API response structure")
+            return [], 0
+        
+        # Parse hits
+        hits = data['result']['hits']
+        hit_list = hits.get('hit', []) if hits else []
         
-        # Parse JSON response
         results = []
-        for item in data.get('message', {}).get('items', []):
-            # Extract author names
-            authors = []
-            for author in item.get('author', []):
-                author_name = []
-                if 'given' in author:
-                    author_name.append(author['given'])
-                if 'family' in author:
-                    author_name.append(author['family'])
-                if author_name:
-                    authors.append(' '.join(author_name))
-            
-            # Extract published date
-            published_date = None
-            if 'published-print' in item and item['published-print'].get('date-parts'):
-                published_date = item['published-print']['date-parts'][0]
-            elif 'published-online' in item and item['published-online'].get('date-parts'):
-                published_date = item['published-online']['date-parts'][0]
-            
-            year = published_date[0] if published_date and len(published_date) > 0 else None
+        for hit in hit_list:
+            info = hit.get('info', {})
             
-            # Extract subjects
-            subjects = item.get('subject', [])
-            
-            # Extract citation count
-            citation_count = item.get('is-referenced-by-count', 0)
+            # Extract authors
+            authors = []
+            if 'authors' in info and 'author' in info['authors']:
+                author_list = info['authors']['author']
+                if isinstance(author_list, list):
+                    for author in author_list:
+                        if isinstance(author, dict) and 'text' in author:
+                            authors.append(author['text'])
+                        elif isinstance(author, str):
+                            authors.append(author)
+                elif isinstance(author_list, dict) and 'text' in author_list:
+                    authors.append(author_list['text'])
             
             # Create result object
             result = {
-                'id': item.get('DOI', ''),
-                'title': item.get('title', ['No title'])[0] if item.get('title') else 'No title',
+                'id': hit.get('@id', ''),
+                'title': info.get('title', 'No title'),
                 'author': ', '.join(authors),
-                'year': year,
-                'abstract': item.get('abstract', ''),
-                'doi': item.get('DOI'),
-                'subject': ', '.join(subjects) if subjects else None,
-                'citations': citation_count,
-                'source': 'crossref',
-                'url': f"https://doi.org/{item.get('DOI')}" if item.get('DOI') else None
+                'year': info.get('year'),
+                'abstract': '',  # DBLP doesn't provide abstracts
+                'doi': info.get('doi'),
+                'subject': info.get('type'),
+                'citations': 0,  # DBLP doesn't provide citation counts
+                'source': 'dblp',
+                'url': info.get('url')
             }
             
             results.append(result)
         
         # Get total count
-        total = data.get('message', {}).get('total-results', len(results))
+        total = int(hits.get('@total', 0)) if hits else 0
         
         return results, total
     
-    def _search_dblp(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search DBLP API"""
-        self._check_rate_limit('dblp')
-        
-        # DBLP uses h (max hits) and f (first) parameters
-        first = (page - 1) * per_page
-        
-        # Prepare URL and parameters
-        params = {
-            'q': query,
-            'format': 'json',
-            'h': per_page,
-            'f': first
-        }
-        
-        # Make request
-        response = requests.get(self.api_base_urls['dblp'], params=params)
-        
-        if response.status_code != 200:
-            logging.error(f"DBLP API error: {response.status_code}")
-            return [], 0
+    def _parse_openlibrary_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse an Open Library search response"""
+        data = json.loads(body)
         
-        # Parse JSON response
-        try:
-            data = response.json()
-            
-            # Check if data has the expected structure
-            if 'result' not in data or 'hits' not in data['result']:
-                logging.error("Unexpected DBLP API response structure")
-                return [], 0
-            
-            # Parse hits
-            hits = data['result']['hits']
-            hit_list = hits.get('hit', []) if hits else []
-            
-            results = []
-            for hit in hit_list:
-                info = hit.get('info', {})
-                
-                # Extract authors
-                authors = []
-                if 'authors' in info and 'author' in info['authors']:
-                    author_list = info['authors']['author']
-                    if isinstance(author_list, list):
-                        for author in author_list:
-                            if isinstance(author, dict) and 'text' in author:
-                                authors.append(author['text'])
-                            elif isinstance(author, str):
-                                authors.append(author)
-                    elif isinstance(author_list, dict) and 'text' in author_list:
-                        authors.append(author_list['text'])
-                
-                # Create result object
-                result = {
-                    'id': hit.get('@id', ''),
-                    'title': info.get('title', 'No title'),
-                    'author': ', '.join(authors),
-                    'year': info.get('year'),
-                    'abstract': '',  # DBLP doesn't provide abstracts
-                    'doi': info.get('doi'),
-                    'subject': info.get('type'),
-                    'citations': 0,  # DBLP doesn't provide citation counts
-                    'source': 'dblp',
-                    'url': info.get('url')
-                }
-                
-                results.append(result)
+        results = []
+        for doc in data.get('docs', []):
+            # Extract authors
+            authors = doc.get('author_name', [])
             
-            # Get total count
-            total = int(hits.get('@total', 0)) if hits else 0
+            # Extract subject
+            subjects = doc.get('subject', [])
             
-            return results, total
+            # Create result object
+            result = {
+                'id': doc.get('key', '').replace('/works/', ''),
+                'title': doc.get('title', 'No title'),
+                'author': ', '.join(authors) if authors else 'Unknown',
+                'year': doc.get('first_publish_year'),
+                'abstract': '',  # Open Library doesn't provide abstracts
+                'doi': None,  # Open Library doesn't provide DOIs
+                'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
+                'citations': 0,  # Open Library doesn't provide citation counts
+                'source': 'openlibrary',
+                'url': f"https://openlibrary.org{doc.get('key')}" if doc.get('key') else None
+            }
             
-        except Exception as e:
-            logging.error(f"Error parsing DBLP response: {str(e)}")
-            return [], 0
-    
-    def _search_openlibrary(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search Open Library API"""
-        self._check_rate_limit('openlibrary')
-        
-        # Open Library uses page and limit parameters
-        offset = (page - 1) * per_page
-        
-        # Prepare URL and parameters
-        params = {
-            'q': query,
-            'page': page,
-            'limit': per_page
-        }
-        
-        # Make request
-        response = requests.get(self.api_base_urls['openlibrary'], params=params)
+            results.append(result)
         
-        if response.status_code != 200:
-            logging.error(f"Open Library API error: {response.status_code}")
-            return [], 0
+        # Get total count
+        total = data.get('numFound', len(results))
         
-        # Parse JSON response
-        try:
-            data = response.json()
-            
-            results = []
-            for doc in data.get('docs', []):
-                # Extract authors
-                authors = doc.get('author_name', [])
-                
-                # Extract subject
-                subjects = doc.get('subject', [])
-                
-                # Create result object
-                result = {
-                    'id': doc.get('key', '').replace('/works/', ''),
-                    'title': doc.get('title', 'No title'),
-                    'author': ', '.join(authors) if authors else 'Unknown',
-                    'year': doc.get('first_publish_year'),
-                    'abstract': '',  # Open Library doesn't provide abstracts
-                    'doi': None,  # Open Library doesn't provide DOIs
-                    'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
-                    'citations': 0,  # Open Library doesn't provide citation counts
-                    'source': 'openlibrary',
-                    'url': f"https://openlibrary.org{doc.get('key')}" if doc.get('key') else None
-                }
-                
-                results.append(result)
-            
-            # Get total count
-            total = data.get('numFound', len(results))
-            
-            return results, total
-            
-        except Exception as e:
-            logging.error(f"Error parsing Open Library response: {str(e)}")
-            return [], 0
+        return results, total
     
-    def _search_gutendex(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search Gutendex API (Project Gutenberg)"""
-        self._check_rate_limit('gutendex')
+    def _parse_gutendex_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse a Gutendex (Project Gutenberg) books listing"""
+        data = json.loads(body)
         
-        # Gutendex uses page and per_page parameters
-        params = {
-            'search': query,
-            'page': page,
-            'mime_type': 'text'  # Get books with text content
-        }
+        results = [self._gutendex_book(book) for book in data.get('results', [])]
         
-        # Make request
-        response = requests.get(self.api_base_urls['gutendex'], params=params)
-        
-        if response.status_code != 200:
-            logging.error(f"Gutendex API error: {response.status_code}")
-            return [], 0
+        # Get total count
+        total = data.get('count', len(results))
         
-        # Parse JSON response
-        try:
-            data = response.json()
-            
-            results = []
-            for book in data.get('results', []):
-                # Extract authors
-                authors = []
-                for author in book.get('authors', []):
-                    name = author.get('name')
-                    if name:
-                        authors.append(name)
-                
-                # Extract subjects
-                subjects = book.get('subjects', [])
-                
-                # Create result object
-                result = {
-                    'id': str(book.get('id', '')),
-                    'title': book.get('title', 'No title'),
-                    'author': ', '.join(authors) if authors else 'Unknown',
-                    'year': None,  # Gutendex doesn't reliably provide publication years
-                    'abstract': '',  # Gutendex doesn't provide abstracts
-                    'doi': None,  # Gutendex doesn't provide DOIs
-                    'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
-                    'citations': 0,  # Gutendex doesn't provide citation counts
-                    'source': 'gutendex',
-                    'url': book.get('formats', {}).get('text/html')
-                }
-                
-                results.append(result)
-            
-            # Get total count
-            total = data.get('count', len(results))
-            
-            return results, total
-            
-        except Exception as e:
-            logging.error(f"Error parsing Gutendex response: {str(e)}")
-            return [], 0
+        return results, total
     
-    def _search_gbif(self, query: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int]:
-        """Search Global Biodiversity Information Facility (GBIF) API"""
-        self._check_rate_limit('gbif')
-        
-        # GBIF uses offset and limit parameters
-        offset = (page - 1) * per_page
-        
-        # Prepare URL and parameters
-        params = {
-            'q': query,
-            'offset': offset,
-            'limit': per_page
-        }
+    def _parse_gbif_search(self, body: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse a GBIF literature search response"""
+        data = json.loads(body)
         
-        # Make request
-        response = requests.get(self.api_base_urls['gbif'], params=params)
+        results = [self._gbif_item(item) for item in data.get('results', [])]
         
-        if response.status_code != 200:
-            logging.error(f"GBIF API error: {response.status_code}")
-            return [], 0
+        # Get total count
+        total = data.get('count', len(results))
         
-        # Parse JSON response
-        try:
-            data = response.json()
-            
-            results = []
-            for item in data.get('results', []):
-                # Extract authors if available
-                authors = []
-                for author in item.get('authors', []):
-                    if isinstance(author, str):
-                        authors.append(author)
-                    elif isinstance(author, dict) and 'name' in author:
-                        authors.append(author['name'])
-                
-                # Create result object
-                result = {
-                    'id': str(item.get('id', '')),
-                    'title': item.get('title', 'No title'),
-                    'author': ', '.join(authors) if authors else 'Unknown',
-                    'year': item.get('year'),
-                    'abstract': item.get('abstract', ''),
-                    'doi': item.get('identifiers', {}).get('doi'),
-                    'subject': item.get('topics'),
-                    'citations': 0,  # GBIF doesn't provide citation counts
-                    'source': 'gbif',
-                    'url': item.get('websites', [None])[0] if item.get('websites') else None
-                }
-                
-                results.append(result)
-            
-            # Get total count
-            total = data.get('count', len(results))
-            
-            return results, total
-            
-        except Exception as e:
-            logging.error(f"Error parsing GBIF response: {str(e)}")
-            return [], 0
+        return results, total
     
-    # Individual methods for fetching publication details
-    def _get_arxiv_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from arXiv"""
-        self._check_rate_limit('arxiv')
-        
-        # Prepare URL and parameters
-        params = {
-            'id_list': pub_id
-        }
-        
-        # Make request
-        response = requests.get(self.api_base_urls['arxiv'], params=params)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse XML response
-        try:
-            root = ET.fromstring(response.content)
-            
-            # Get namespace from the root element
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            # Find the entry
-            entry = root.find('.//atom:entry', ns)
-            
-            if entry is None:
-                return None
-            
-            # Extract data
-            title_elem = entry.find('./atom:title', ns)
-            title = title_elem.text if title_elem is not None else "No title"
-            
-            authors = []
-            for author_elem in entry.findall('./atom:author/atom:name', ns):
-                if author_elem.text:
-                    authors.append(author_elem.text)
-            
-            published_elem = entry.find('./atom:published', ns)
-            published = published_elem.text if published_elem is not None else ""
-            year = published.split('-')[0] if published and '-' in published else ""
-            
-            summary_elem = entry.find('./atom:summary', ns)
-            abstract = summary_elem.text if summary_elem is not None else ""
-            
-            categories = []
-            for category_elem in entry.findall('./atom:category', ns):
-                term = category_elem.get('term')
-                if term:
-                    categories.append(term)
-            
-            # Create result object
-            result = {
-                'id': pub_id,
-                'title': title,
-                'author': ', '.join(authors),
-                'year': year,
-                'abstract': abstract,
-                'doi': None,
-                'subject': ', '.join(categories) if categories else None,
-                'citations': 0,
-                'source': 'arxiv',
-                'url': f"https://arxiv.org/abs/{pub_id}"
-            }
-            
-            return result
-            
-        except Exception as e:
-            logging.error(f"Error parsing arXiv details: {str(e)}")
-            return None
+    # Details response parsers
+    def _parse_arxiv_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse the arXiv Atom entry of one publication"""
+        return parse_arxiv_entry(body, pub_id)
     
-    def _get_openalex_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from OpenAlex"""
-        self._check_rate_limit('openalex')
-        
-        # Make request
-        url = f"{self.api_base_urls['openalex']}/works/W{pub_id}"
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse JSON response
-        work = response.json()
+    def _parse_openalex_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse an OpenAlex work"""
+        work = json.loads(body)
         
         # Extract author names
         authors = []
@@ -709,7 +658,7 @@ class ExternalAPIService:
                 subjects.append(subject_name)
         
         # Create result object
-        result = {
+        return {
             'id': pub_id,
             'title': work.get('title'),
             'author': ', '.join(authors),
@@ -721,29 +670,76 @@ class ExternalAPIService:
             'source': 'openalex',
             'url': work.get('doi') or work.get('id')
         }
+    
+    def _parse_crossref_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a Crossref work"""
+        data = json.loads(body)
+        
+        # Check if data has the expected structure
+        if 'message' not in data:
+            return None
         
+        result = self._crossref_item(data['message'])
+        result.update({
+            'id': pub_id,
+            'doi': pub_id,
+            'url': f"https://doi.org/{pub_id}" if pub_id else None
+        })
         return result
     
-    def _get_crossref_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from Crossref"""
-        self._check_rate_limit('crossref')
-        
-        # Make request
-        url = f"{self.api_base_urls['crossref']}/{pub_id}"
-        response = requests.get(url)
+    def _parse_dblp_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a DBLP record XML"""
+        return parse_dblp_record(body, pub_id)
+    
+    def _parse_openlibrary_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse an Open Library work; author names need separate lookups"""
+        data = json.loads(body)
         
-        if response.status_code != 200:
-            return None
+        # Extract title
+        title = data.get('title', 'No title')
         
-        # Parse JSON response
-        data = response.json()
+        # Author records are only referenced by key
+        author_keys = []
+        for author_key in data.get('authors', []):
+            if isinstance(author_key, dict) and 'author' in author_key:
+                author_keys.append(author_key['author']['key'])
         
-        # Check if data has the expected structure
-        if 'message' not in data:
-            return None
+        # Extract subjects
+        subjects = data.get('subjects', [])
         
-        item = data['message']
+        # Extract first publication date
+        first_publish_date = data.get('first_publish_date')
+        year = first_publish_date.split(',')[-1].strip() if first_publish_date else None
         
+        # Create result object
+        return {
+            'id': pub_id,
+            'title': title,
+            'author': 'Unknown',
+            'author_keys': author_keys,
+            'year': year,
+            'abstract': data.get('description', {}).get('value', '') if isinstance(data.get('description'), dict) else str(data.get('description', '')),
+            'doi': None,  # Open Library doesn't provide DOIs
+            'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
+            'citations': 0,  # Open Library doesn't provide citation counts
+            'source': 'openlibrary',
+            'url': f"https://openlibrary.org/works/{pub_id}"
+        }
+    
+    def _parse_gutendex_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a Gutendex (Project Gutenberg) book"""
+        result = self._gutendex_book(json.loads(body))
+        result['id'] = pub_id
+        return result
+    
+    def _parse_gbif_details(self, pub_id: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a GBIF literature record"""
+        result = self._gbif_item(json.loads(body))
+        result['id'] = pub_id
+        return result
+    
+    # Record normalizers shared by search and details parsing
+    def _crossref_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         # Extract author names
         authors = []
         for author in item.get('author', []):
@@ -767,234 +763,61 @@ class ExternalAPIService:
         # Extract subjects
         subjects = item.get('subject', [])
         
-        # Extract citation count
-        citation_count = item.get('is-referenced-by-count', 0)
-        
-        # Create result object
-        result = {
-            'id': pub_id,
+        return {
+            'id': item.get('DOI', ''),
             'title': item.get('title', ['No title'])[0] if item.get('title') else 'No title',
             'author': ', '.join(authors),
             'year': year,
             'abstract': item.get('abstract', ''),
-            'doi': pub_id,
+            'doi': item.get('DOI'),
             'subject': ', '.join(subjects) if subjects else None,
-            'citations': citation_count,
+            'citations': item.get('is-referenced-by-count', 0),
             'source': 'crossref',
-            'url': f"https://doi.org/{pub_id}" if pub_id else None
+            'url': f"https://doi.org/{item.get('DOI')}" if item.get('DOI') else None
         }
-        
-        return result
     
-    def _get_dblp_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from DBLP"""
-        # For DBLP, we need to convert the ID to a URL
-        url = f"https://dblp.org/rec/{pub_id}.xml"
-        
-        self._check_rate_limit('dblp')
-        
-        # Make request
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse XML response
-        try:
-            root = ET.fromstring(response.content)
-            
-            # Find publication type
-            for pub_type in ['article', 'inproceedings', 'book', 'incollection', 'proceedings', 'phdthesis', 'mastersthesis']:
-                pub_elem = root.find(f'.//{pub_type}')
-                if pub_elem is not None:
-                    break
-            
-            if pub_elem is None:
-                return None
-            
-            # Extract title
-            title_elem = pub_elem.find('.//title')
-            title = title_elem.text if title_elem is not None else "No title"
-            
-            # Extract authors
-            authors = []
-            for author_elem in pub_elem.findall('.//author'):
-                if author_elem.text:
-                    authors.append(author_elem.text)
-            
-            # Extract year
-            year_elem = pub_elem.find('.//year')
-            year = year_elem.text if year_elem is not None else None
-            
-            # Extract DOI
-            doi_elem = pub_elem.find('.//ee[@type="doi"]')
-            doi = doi_elem.text.replace('https://doi.org/', '') if doi_elem is not None else None
-            
-            # Create result object
-            result = {
-                'id': pub_id,
-                'title': title,
-                'author': ', '.join(authors),
-                'year': year,
-                'abstract': '',  # DBLP doesn't provide abstracts
-                'doi': doi,
-                'subject': pub_type,  # Use publication type as subject
-                'citations': 0,  # DBLP doesn't provide citation counts
-                'source': 'dblp',
-                'url': f"https://dblp.org/rec/{pub_id}.html"
-            }
-            
-            return result
-            
-        except Exception as e:
-            logging.error(f"Error parsing DBLP details: {str(e)}")
-            return None
-    
-    def _get_openlibrary_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from Open Library"""
-        # Construct URL for Open Library work
-        url = f"https://openlibrary.org/works/{pub_id}.json"
-        
-        self._check_rate_limit('openlibrary')
-        
-        # Make request
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse JSON response
-        try:
-            data = response.json()
-            
-            # Extract title
-            title = data.get('title', 'No title')
-            
-            # Extract authors (requires additional API calls)
-            authors = []
-            for author_key in data.get('authors', []):
-                if isinstance(author_key, dict) and 'author' in author_key:
-                    author_url = f"https://openlibrary.org{author_key['author']['key']}.json"
-                    author_response = requests.get(author_url)
-                    if author_response.status_code == 200:
-                        author_data = author_response.json()
-                        authors.append(author_data.get('name', 'Unknown'))
-            
-            # Extract subjects
-            subjects = data.get('subjects', [])
-            
-            # Extract first publication date
-            first_publish_date = data.get('first_publish_date')
-            year = first_publish_date.split(',')[-1].strip() if first_publish_date else None
-            
-            # Create result object
-            result = {
-                'id': pub_id,
-                'title': title,
-                'author': ', '.join(authors) if authors else 'Unknown',
-                'year': year,
-                'abstract': data.get('description', {}).get('value', '') if isinstance(data.get('description'), dict) else str(data.get('description', '')),
-                'doi': None,  # Open Library doesn't provide DOIs
-                'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
-                'citations': 0,  # Open Library doesn't provide citation counts
-                'source': 'openlibrary',
-                'url': f"https://openlibrary.org/works/{pub_id}"
-            }
-            
-            return result
-            
-        except Exception as e:
-            logging.error(f"Error parsing Open Library details: {str(e)}")
-            return None
-    
-    def _get_gutendex_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from Gutendex (Project Gutenberg)"""
-        # Construct URL for Gutendex book
-        url = f"{self.api_base_urls['gutendex']}/{pub_id}"
-        
-        self._check_rate_limit('gutendex')
-        
-        # Make request
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
+    def _gutendex_book(self, book: Dict[str, Any]) -> Dict[str, Any]:
+        # Extract authors
+        authors = []
+        for author in book.get('authors', []):
+            name = author.get('name')
+            if name:
+                authors.append(name)
         
-        # Parse JSON response
-        try:
-            book = response.json()
-            
-            # Extract authors
-            authors = []
-            for author in book.get('authors', []):
-                name = author.get('name')
-                if name:
-                    authors.append(name)
-            
-            # Extract subjects
-            subjects = book.get('subjects', [])
-            
-            # Create result object
-            result = {
-                'id': pub_id,
-                'title': book.get('title', 'No title'),
-                'author': ', '.join(authors) if authors else 'Unknown',
-                'year': None,  # Gutendex doesn't reliably provide publication years
-                'abstract': '',  # Gutendex doesn't provide abstracts
-                'doi': None,  # Gutendex doesn't provide DOIs
-                'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
-                'citations': 0,  # Gutendex doesn't provide citation counts
-                'source': 'gutendex',
-                'url': book.get('formats', {}).get('text/html')
-            }
-            
-            return result
-            
-        except Exception as e:
-            logging.error(f"Error parsing Gutendex details: {str(e)}")
-            return None
+        # Extract subjects
+        subjects = book.get('subjects', [])
+        
+        return {
+            'id': str(book.get('id', '')),
+            'title': book.get('title', 'No title'),
+            'author': ', '.join(authors) if authors else 'Unknown',
+            'year': None,  # Gutendex doesn't reliably provide publication years
+            'abstract': '',  # Gutendex doesn't provide abstracts
+            'doi': None,  # Gutendex doesn't provide DOIs
+            'subject': ', '.join(subjects[:5]) if subjects else None,  # Limit to 5 subjects
+            'citations': 0,  # Gutendex doesn't provide citation counts
+            'source': 'gutendex',
+            'url': book.get('formats', {}).get('text/html')
+        }
     
-    def _get_gbif_details(self, pub_id: str) -> Optional[Dict[str, Any]]:
-        """Get publication details from GBIF"""
-        # Construct URL for GBIF literature record
-        url = f"{self.api_base_urls['gbif']}/{pub_id}"
-        
-        self._check_rate_limit('gbif')
-        
-        # Make request
-        response = requests.get(url)
-        
-        if response.status_code != 200:
-            return None
-        
-        # Parse JSON response
-        try:
-            item = response.json()
-            
-            # Extract authors if available
-            authors = []
-            for author in item.get('authors', []):
-                if isinstance(author, str):
-                    authors.append(author)
-                elif isinstance(author, dict) and 'name' in author:
-                    authors.append(author['name'])
-            
-            # Create result object
-            result = {
-                'id': pub_id,
-                'title': item.get('title', 'No title'),
-                'author': ', '.join(authors) if authors else 'Unknown',
-                'year': item.get('year'),
-                'abstract': item.get('abstract', ''),
-                'doi': item.get('identifiers', {}).get('doi'),
-                'subject': item.get('topics'),
-                'citations': 0,  # GBIF doesn't provide citation counts
-                'source': 'gbif',
-                'url': item.get('websites', [None])[0] if item.get('websites') else None
-            }
-            
-            return result
-            
-        except Exception as e:
-            logging.error(f"Error parsing GBIF details: {str(e)}")
-            return None
\ No newline at end of file
+    def _gbif_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        # Extract authors if available
+        authors = []
+        for author in item.get('authors', []):
+            if isinstance(author, str):
+                authors.append(author)
+            elif isinstance(author, dict) and 'name' in author:
+                authors.append(author['name'])
+        
+        return {
+            'id': str(item.get('id', '')),
+            'title': item.get('title', 'No title'),
+            'author': ', '.join(authors) if authors else 'Unknown',
+            'year': item.get('year'),
+            'abstract': item.get('abstract', ''),
+            'doi': item.get('identifiers', {}).get('doi'),
+            'subject': item.get('topics'),
+            'citations': 0,  # GBIF doesn't provide citation counts
+            'source': 'gbif',
+            'url': item.get('websites', [None])[0] if item.get('websites') else None
+        }
@@ -0,0 +1,61 @@
+# services/http_session.py
+import threading
+import logging
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+class HTTPSessionManager:
+    """
+    Process-wide keep-alive HTTP sessions, one per host.
+
+    Every caller talking to the same host shares one requests.Session whose
+    connection pool keeps connections open between requests, so repeated
+    calls to api.openalex.org, api.crossref.org, ... skip the TCP and TLS
+    handshakes. All requests get explicit connect/read timeouts.
+    """
+
+    _lock = threading.Lock()
+    _sessions = {}
+
+    @classmethod
+    def session_for(cls, url: str) -> requests.Session:
+        """Shared session for the scheme and host of a URL"""
+        parts = urllib.parse.urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        session = cls._sessions.get(key)
+        if session is None:
+            with cls._lock:
+                session = cls._sessions.get(key)
+                if session is None:
+                    session = cls._create_session()
+                    cls._sessions[key] = session
+                    logging.info(f"Created HTTP session pool for {key}")
+        return session
+
+    @classmethod
+    def get(cls, url: str, **kwargs) -> requests.Response:
+        """requests.get through the host's pooled session, with default timeouts"""
+        kwargs.setdefault('timeout', (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT))
+        return cls.session_for(url).get(url, **kwargs)
+
+    @classmethod
+    def close_all(cls):
+        """Close every pooled connection (e.g. at shutdown or after a fork)"""
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        session = requests.Session()
+        # One pool per session since sessions are per host; maxsize bounds the
+        # concurrent keep-alive connections the search fan-out can hold open
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                              pool_block=False)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': Config.HTTP_USER_AGENT})
+        return session
@@ -0,0 +1,242 @@
+# services/index_manager.py
+import re
+import logging
+from typing import Dict, Any, List, Optional
+from services.database import DatabaseService
+from services.search_tables import (
+    SOURCE_TABLES, UNIFIED_SPEC, SEARCH_TEXT_FIELDS, ILIKE_FILTERS, INTEGER_TYPES,
+    search_vector_expression, ilike_columns, column_expression
+)
+
+class IndexManager:
+    """
+    Derives the indexes the search predicates need from the table specs in
+    services/search_tables.py and checks them against pg_indexes.
+
+    For every table the search can scan it expects:
+        - a GIN index on the exact search vector expression the @@ match uses
+        - a pg_trgm GIN index on each column an ILIKE predicate runs over
+        - a btree (or the spec's year_index, e.g. BRIN) on year and citations;
+          on a column that is not an integer yet, the filters coerce it with
+          column_expression(), so only an index on that expression serves them
+
+    Indexes are built CONCURRENTLY, so writes to a live table carry on during
+    the build. A build that fails leaves an invalid index behind, which does
+    not count as backing a predicate and is dropped before the next attempt.
+    """
+
+    _INDEXDEF_RE = re.compile(r'USING (\w+) \((.*)\)$')
+
+    def __init__(self, specs: Optional[List[Dict[str, Any]]] = None):
+        self.db = DatabaseService()
+        self.specs = specs if specs is not None else SOURCE_TABLES + [UNIFIED_SPEC]
+
+    def required_indexes(self, spec: Dict[str, Any],
+                         column_types: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Indexes backing each search predicate on one table
+
+        Args:
+            spec: Table spec
+            column_types: Column name -> information_schema data_type; without
+                it the spec's typed_fields (see mark_typed_columns) decide
+                which year/citation columns are integers
+
+        Returns:
+            List of dicts with 'table', 'name', 'kind' (fulltext, trigram or
+            range), 'column', 'expression' (the coerced range expression, or
+            None), 'predicate' and the 'create_sql' to build it
+        """
+        table = spec['table']
+        required = []
+
+        vector = search_vector_expression(spec)
+        required.append({
+            'table': table,
+            'name': f"idx_{table}_search_vector",
+            'kind': 'fulltext',
+            'column': None,
+            'expression': None,
+            'predicate': f"{vector} @@ to_tsquery(...)",
+            'create_sql': f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_search_vector ON {table} USING gin({vector})"
+        })
+
+        ilike_fields = list(SEARCH_TEXT_FIELDS)
+        for _, fields in ILIKE_FILTERS:
+            ilike_fields.extend(fields)
+        for column in ilike_columns(spec, ilike_fields):
+            required.append({
+                'table': table,
+                'name': f"idx_{table}_{column}_trgm",
+                'kind': 'trigram',
+                'column': column,
+                'expression': None,
+                'predicate': f"{column} ILIKE %...%",
+                'create_sql': (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_{column}_trgm "
+                               f"ON {table} USING gin({column} gin_trgm_ops)")
+            })
+
+        for field in ('year', 'citations'):
+            column = spec['columns'].get(field)
+            if not column:
+                continue
+            method = spec.get('year_index', 'btree') if field == 'year' else 'btree'
+            if column_types is None:
+                typed = field in spec.get('typed_fields', ())
+            else:
+                typed = column_types.get(column) in INTEGER_TYPES
+            if typed:
+                required.append({
+                    'table': table,
+                    'name': f"idx_{table}_{column}_{method}",
+                    'kind': 'range',
+                    'column': column,
+                    'expression': None,
+                    'predicate': f"{column} >= / <= %s",
+                    'create_sql': f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_{column}_{method} ON {table} USING {method}({column})"
+                })
+                continue
+            expression = column_expression(spec, field)
+            required.append({
+                'table': table,
+                'name': f"idx_{table}_{column}_{method}_expr",
+                'kind': 'range',
+                'column': column,
+                'expression': expression,
+                'predicate': f"{expression} >= / <= %s",
+                'create_sql': (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_{column}_{method}_expr "
+                               f"ON {table} USING {method}(({expression}))")
+            })
+
+        return required
+
+    def verify(self) -> List[Dict[str, Any]]:
+        """
+        Check every required index of every existing table against pg_indexes
+
+        Returns:
+            One entry per search predicate: the required index plus 'backed'
+            (bool), 'existing' (name of the index serving it, if any) and
+            'missing_column' when the table lacks the column altogether
+        """
+        report = []
+        for spec in self._existing_tables():
+            indexes = self._existing_indexes(spec['table'])
+            columns = self._column_types(spec['table'])
+            for required in self.required_indexes(spec, columns):
+                entry = dict(required, backed=False, existing=None, missing_column=False)
+                if required['column'] and required['column'] not in columns:
+                    entry['missing_column'] = True
+                else:
+                    match = self._find_index(spec, required, indexes)
+                    if match:
+                        entry['backed'] = True
+                        entry['existing'] = match
+                report.append(entry)
+        return report
+
+    def unbacked_predicates(self) -> List[Dict[str, Any]]:
+        """Search predicates that no existing index can serve"""
+        return [entry for entry in self.verify() if not entry['backed']]
+
+    def ensure_indexes(self, dry_run=False) -> List[str]:
+        """
+        Create every missing index
+
+        Args:
+            dry_run: Only return the SQL that would run
+
+        Returns:
+            The CREATE INDEX statements for the missing indexes
+        """
+        missing = [entry for entry in self.unbacked_predicates() if not entry['missing_column']]
+        statements = [entry['create_sql'] for entry in missing]
+        if dry_run or not statements:
+            return statements
+
+        if any(entry['kind'] == 'trigram' for entry in missing):
+            try:
+                self.db.execute_query("CREATE EXTENSION IF NOT EXISTS pg_trgm", fetch=False)
+            except Exception as e:
+                logging.warning(f"⚠️ Could not create pg_trgm extension: {e}")
+
+        for entry in missing:
+            try:
+                # Leftover of an interrupted concurrent build, which IF NOT EXISTS would keep
+                self.db.execute_autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {entry['name']}")
+                logging.info(f"Running: {entry['create_sql']}")
+                # CONCURRENTLY cannot run inside a transaction block
+                self.db.execute_autocommit(entry['create_sql'])
+            except Exception as e:
+                logging.error(f"❌ Could not create index: {e}")
+        return statements
+
+    def _find_index(self, spec, required, indexes) -> Optional[str]:
+        """Name of an existing index able to serve the required one, if any"""
+        for name, method, keys in indexes:
+            if name == required['name']:
+                return name
+            if required['kind'] == 'fulltext':
+                if method != 'gin':
+                    continue
+                if spec.get('search_vector'):
+                    if keys == spec['search_vector']:
+                        return name
+                    continue
+                # pg_indexes shows a normalized expression; require the same columns
+                vector_columns = {spec['columns'][f] for f in SEARCH_TEXT_FIELDS if spec['columns'].get(f)}
+                if 'to_tsvector' in keys and all(re.search(rf'\b{c}\b', keys) for c in vector_columns):
+                    return name
+            elif required['kind'] == 'trigram':
+                if method == 'gin' and re.match(rf'"?{required["column"]}"? gin_trgm_ops', keys):
+                    return name
+            elif required['expression']:
+                # A plain index on a text column cannot serve the coerced
+                # predicate; pg_indexes shows the expression normalized, so
+                # match it by its regex literal and column
+                if method in ('btree', 'brin') and self._same_coercion(required, keys):
+                    return name
+            else:
+                # A btree/BRIN whose leading column is the filtered one serves range predicates
+                leading = keys.split(',')[0].strip().split(' ')[0].strip('"')
+                if method in ('btree', 'brin') and leading == required['column']:
+                    return name
+        return None
+
+    def _same_coercion(self, required, keys) -> bool:
+        """Whether index keys are the column_expression() coercion of the required column"""
+        pattern = re.search(r"from '([^']*)'", required['expression']).group(1)
+        if f"'{pattern}'" not in keys or not re.search(rf'\b{required["column"]}\b', keys):
+            return False
+        return required['expression'].startswith('COALESCE') == keys.lstrip('(').upper().startswith('COALESCE')
+
+    def _existing_indexes(self, table):
+        # Invalid indexes (failed concurrent builds) serve no queries
+        result = self.db.execute_query("""
+            SELECT i.indexname, i.indexdef
+            FROM pg_indexes i
+            JOIN pg_index x ON x.indexrelid = format('%%I.%%I', i.schemaname, i.indexname)::regclass
+            WHERE i.tablename = %s AND x.indisvalid
+        """, (table,))
+        indexes = []
+        for row in result or []:
+            match = self._INDEXDEF_RE.search(row['indexdef'])
+            if match:
+                indexes.append((row['indexname'], match.group(1), match.group(2)))
+        return indexes
+
+    def _column_types(self, table):
+        result = self.db.execute_query(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s", (table,)
+        )
+        return {row['column_name']: row['data_type'] for row in result or []}
+
+    def _existing_tables(self):
+        existing = []
+        for spec in self.specs:
+            result = self.db.execute_query("SELECT to_regclass(%s) IS NOT NULL AS present", (spec['table'],))
+            if result and result[0]['present']:
+                existing.append(spec)
+            else:
+                logging.info(f"Table {spec['table']} does not exist, skipping")
+        return existing
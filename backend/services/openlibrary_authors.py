@@ -0,0 +1,103 @@
+# services/openlibrary_authors.py
+import time
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+from config import Config
+
+class OpenLibraryAuthorResolver:
+    """
+    Process-wide Open Library author key -> name lookup.
+
+    Open Library works only carry author keys (/authors/OL123A), each needing
+    its own request. Names are kept in a bounded LRU with a long TTL, keys
+    that are not cached are fetched concurrently, and a key already being
+    fetched by another request is waited on rather than fetched again, so a
+    multi-author work costs about one round trip, and none once its authors
+    have been seen.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float = None, workers: int = None):
+        self.max_size = max_size or Config.OPENLIBRARY_AUTHOR_CACHE_SIZE
+        self.ttl = ttl or Config.OPENLIBRARY_AUTHOR_TTL
+        self._names = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers or Config.OPENLIBRARY_AUTHOR_WORKERS,
+                                            thread_name_prefix='openlibrary-authors')
+
+    def resolve(self, author_keys: List[str], fetch_name: Callable[[str], Optional[str]]) -> List[str]:
+        """
+        Names of the given authors, in order
+
+        Args:
+            author_keys: Open Library author keys, e.g. ['/authors/OL23919A']
+            fetch_name: Looks up one key upstream; returns None if it could not
+
+        Returns:
+            Names of the authors that could be resolved
+        """
+        futures = {}
+        with self._lock:
+            for key in dict.fromkeys(author_keys):
+                if self._get(key) is not None:
+                    continue
+                if key not in self._inflight:
+                    self._inflight[key] = self._executor.submit(self._lookup, key, fetch_name)
+                futures[key] = self._inflight[key]
+        wait(futures.values())
+
+        names = []
+        for key in author_keys:
+            if key in futures:
+                try:
+                    name = futures[key].result()
+                except Exception as e:
+                    logging.error(f"Error resolving Open Library author {key}: {str(e)}")
+                    name = None
+            else:
+                name = self.cached(key)
+            if name is not None:
+                names.append(name)
+        return names
+
+    def cached(self, key: str) -> Optional[str]:
+        """Cached name of an author, or None"""
+        with self._lock:
+            return self._get(key)
+
+    def store(self, key: str, name: str):
+        """Cache an author's name, evicting the least recently used beyond max_size"""
+        with self._lock:
+            self._names[key] = (name, time.monotonic() + self.ttl)
+            self._names.move_to_end(key)
+            while len(self._names) > self.max_size:
+                self._names.popitem(last=False)
+
+    def _get(self, key):
+        # Caller holds the lock
+        entry = self._names.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._names[key]
+            return None
+        self._names.move_to_end(key)
+        return entry[0]
+
+    def _lookup(self, key, fetch_name):
+        try:
+            name = fetch_name(key)
+            # Failed lookups are not cached, so the next request retries them
+            if name is not None:
+                self.store(key, name)
+            return name
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+# One resolver per process, shared by all requests
+author_resolver = OpenLibraryAuthorResolver()
@@ -0,0 +1,211 @@
+# services/publication_index.py
+import logging
+from services.database import DatabaseService
+from services.search_tables import (
+    SOURCE_TABLES, UNIFIED_TABLE, UNIFIED_SPEC, PUBLICATION_FIELDS,
+    column_expression, table_source_expression, id_expression, tsvector_expression
+)
+
+# Set (transaction-locally) by writers that sync the unified table themselves,
+# in one statement, instead of through the per-row triggers (see BulkLoader)
+SKIP_SYNC_SETTING = 'biblioknow.skip_unified_sync'
+
+class PublicationIndex:
+    """
+    Maintains the unified_publications table searched by SearchService.
+
+    Rows from every source table are normalized into one table with typed
+    year/citation columns and a stored, weighted tsvector, so a search is a
+    single GIN index scan instead of one sequential scan per source table.
+    Row-level triggers on the source tables keep it in sync, except in
+    transactions that set SKIP_SYNC_SETTING and run sync_rows_sql() instead.
+    """
+
+    def __init__(self):
+        self.db = DatabaseService()
+
+    def setup_index_table(self, backfill=True):
+        """Create the unified table, its indexes and the sync triggers"""
+        try:
+            create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS {UNIFIED_TABLE} (
+                id BIGSERIAL PRIMARY KEY,
+                table_source VARCHAR(64) NOT NULL,
+                source_id TEXT NOT NULL,
+                title TEXT,
+                author TEXT,
+                doi TEXT,
+                year INTEGER,
+                citations INTEGER NOT NULL DEFAULT 0,
+                subject TEXT,
+                journal TEXT,
+                publisher TEXT,
+                search_vector tsvector GENERATED ALWAYS AS (
+                    {tsvector_expression(UNIFIED_SPEC)}
+                ) STORED,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (table_source, source_id)
+            );
+            """
+
+            create_indices_sql = f"""
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_search_vector ON {UNIFIED_TABLE} USING gin(search_vector);
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_keyset ON {UNIFIED_TABLE}(citations DESC, source_id DESC, table_source DESC);
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_year ON {UNIFIED_TABLE}(year);
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_table_source ON {UNIFIED_TABLE}(table_source);
+            """
+
+            # Trigram indexes back the ILIKE fallbacks; pg_trgm may not be installable
+            create_trgm_indices_sql = f"""
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_title_trgm ON {UNIFIED_TABLE} USING gin(title gin_trgm_ops);
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_author_trgm ON {UNIFIED_TABLE} USING gin(author gin_trgm_ops);
+            CREATE INDEX IF NOT EXISTS idx_{UNIFIED_TABLE}_subject_trgm ON {UNIFIED_TABLE} USING gin(subject gin_trgm_ops);
+            """
+
+            self.db.execute_query(create_table_sql, fetch=False)
+            self.db.execute_query(create_indices_sql, fetch=False)
+            try:
+                self.db.execute_query(create_trgm_indices_sql, fetch=False)
+            except Exception as e:
+                logging.warning(f"⚠️ Could not create trigram indexes on {UNIFIED_TABLE}: {e}")
+
+            self.install_sync_triggers()
+
+            if backfill and self._is_empty():
+                self.rebuild()
+
+            logging.info(f"✅ {UNIFIED_TABLE} search table set up successfully")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error setting up {UNIFIED_TABLE}: {e}")
+            return False
+
+    def rebuild(self):
+        """
+        Re-sync the unified table from every existing source table
+
+        Per source table, rows whose source row no longer exists are deleted
+        and every source row is upserted, in one transaction. Rows of source
+        tables that no longer exist are dropped too.
+        """
+        synced = 0
+        existing = self._existing_tables()
+        for spec in existing:
+            try:
+                with self.db.transaction() as cursor:
+                    cursor.execute(self._delete_orphans_sql(spec))
+                    removed = cursor.rowcount
+                    cursor.execute(self._sync_table_sql(spec))
+                synced += 1
+                logging.info(f"Synced {spec['table']} into {UNIFIED_TABLE} ({removed} stale rows removed)")
+            except Exception as e:
+                logging.error(f"Error syncing {spec['table']} into {UNIFIED_TABLE}: {e}")
+
+        for spec in SOURCE_TABLES:
+            if spec not in existing and not spec.get('table_source_column'):
+                try:
+                    self.db.execute_query(f"DELETE FROM {UNIFIED_TABLE} WHERE table_source = %s",
+                                          (spec['table'],), fetch=False)
+                except Exception as e:
+                    logging.error(f"Error removing {spec['table']} rows from {UNIFIED_TABLE}: {e}")
+        return synced
+
+    def install_sync_triggers(self):
+        """Install row-level triggers that mirror source table writes"""
+        for spec in self._existing_tables():
+            try:
+                self.db.execute_query(self._trigger_sql(spec), fetch=False)
+            except Exception as e:
+                logging.error(f"Error installing sync trigger on {spec['table']}: {e}")
+
+    def _existing_tables(self):
+        """Source table specs whose tables exist in the connected database"""
+        existing = []
+        for spec in SOURCE_TABLES:
+            result = self.db.execute_query("SELECT to_regclass(%s) IS NOT NULL AS present", (spec['table'],))
+            if result and result[0]['present']:
+                existing.append(spec)
+            else:
+                logging.info(f"Source table {spec['table']} does not exist, skipping")
+        return existing
+
+    def _is_empty(self):
+        result = self.db.execute_query(f"SELECT NOT EXISTS (SELECT 1 FROM {UNIFIED_TABLE}) AS empty")
+        return bool(result and result[0]['empty'])
+
+    def sync_rows_sql(self, spec, relation):
+        """
+        Set-based upsert into the unified table of the rows of `relation`
+
+        Args:
+            spec: Source table spec
+            relation: Table or CTE name with the source table's columns, e.g.
+                the RETURNING * of a bulk INSERT ... ON CONFLICT
+
+        Returns:
+            INSERT ... SELECT statement
+        """
+        return self._sync_table_sql(spec, source=relation)
+
+    def _upsert_clause(self):
+        updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in PUBLICATION_FIELDS)
+        return f"ON CONFLICT (table_source, source_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP"
+
+    def _sync_table_sql(self, spec, row='', source=None):
+        columns = ", ".join(['table_source', 'source_id'] + PUBLICATION_FIELDS)
+        values = ", ".join(
+            [table_source_expression(spec, row), id_expression(spec, row)] +
+            [column_expression(spec, field, row) for field in PUBLICATION_FIELDS]
+        )
+        if row:
+            return f"INSERT INTO {UNIFIED_TABLE} ({columns}) VALUES ({values}) {self._upsert_clause()}"
+        return f"INSERT INTO {UNIFIED_TABLE} ({columns}) SELECT {values} FROM {source or spec['table']} {self._upsert_clause()}"
+
+    def _delete_orphans_sql(self, spec):
+        """DELETE of the unified rows of one source table that have no source row any more"""
+        if spec.get('table_source_prefix'):
+            # Labels come from a column, e.g. 'external_' || source
+            owned = f"u.table_source LIKE '{spec['table_source_prefix']}%'"
+        elif spec.get('table_source_column'):
+            owned = f"u.table_source IN (SELECT DISTINCT {spec['table_source_column']} FROM {spec['table']})"
+        else:
+            owned = f"u.table_source = '{spec['table']}'"
+        return (
+            f"DELETE FROM {UNIFIED_TABLE} u WHERE {owned} AND NOT EXISTS ("
+            f"SELECT 1 FROM {spec['table']} s "
+            f"WHERE {table_source_expression(spec, 's.')} = u.table_source "
+            f"AND {id_expression(spec, 's.')} = u.source_id)"
+        )
+
+    def _trigger_sql(self, spec):
+        table = spec['table']
+        function = f"{UNIFIED_TABLE}_sync_{table}"
+        delete_old = (
+            f"DELETE FROM {UNIFIED_TABLE} "
+            f"WHERE table_source = {table_source_expression(spec, 'OLD.')} "
+            f"AND source_id = {id_expression(spec, 'OLD.')};"
+        )
+        return f"""
+            CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                IF current_setting('{SKIP_SYNC_SETTING}', true) = 'on' THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP = 'DELETE' THEN
+                    {delete_old}
+                    RETURN OLD;
+                END IF;
+                IF TG_OP = 'UPDATE' THEN
+                    {delete_old}
+                END IF;
+                {self._sync_table_sql(spec, 'NEW.')};
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_{UNIFIED_TABLE}_sync ON {table};
+            CREATE TRIGGER trg_{UNIFIED_TABLE}_sync
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE PROCEDURE {function}();
+        """
@@ -0,0 +1,243 @@
+# services/query_compiler.py
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from config import Config
+from services.search_tables import TSVECTOR_WEIGHTS
+
+class QueryError(ValueError):
+    """A query that cannot be searched, e.g. one made only of negated terms"""
+
+class QueryCompiler:
+    """
+    Compiles the search box language into a tsquery string and filters.
+
+    Supported syntax:
+        deep learning            both words (AND is the default operator)
+        "neural network"         phrase, words must be adjacent
+        title:graph author:smith restrict a term to a field (tsvector weight)
+        year:2010..2020          year range, also year:2015, year:2010.., year:..2020
+        a OR b, a AND b, NOT a   boolean operators (upper case), -a is NOT a
+        (a OR b) c               grouping
+
+    Lower-case and/or/not are ordinary words. A field prefix with nothing
+    after it (title:, year:) is ignored. Negation only narrows a match, so a
+    query whose terms, or one of whose OR alternatives, are all negated
+    (NOT a, x OR NOT y) raises QueryError rather than matching nothing.
+
+    The tsquery is returned as a value to bind with to_tsquery('english', %s),
+    so the SQL text never changes with the query. Words shorter than
+    Config.SEARCH_MIN_PREFIX_LENGTH are matched exactly rather than as
+    prefixes, so 'a:*' style whole-index scans cannot be produced.
+    """
+
+    # Field prefixes map onto the weights of unified_publications.search_vector
+    FIELD_WEIGHTS = TSVECTOR_WEIGHTS
+    OPERATORS = ('AND', 'OR', 'NOT')
+
+    def __init__(self, min_prefix_length: Optional[int] = None):
+        self.min_prefix_length = min_prefix_length or Config.SEARCH_MIN_PREFIX_LENGTH
+
+    def compile(self, text: str) -> Dict[str, Any]:
+        """
+        Compile a user query
+
+        Returns:
+            Dictionary with 'tsquery' (string, or None when there are no
+            terms, e.g. only a year filter), 'text' (plain words for ILIKE
+            and external APIs), 'fielded' (whether any term was
+            field-restricted) and 'filters' (e.g. year_from/year_to)
+
+        Raises:
+            QueryError: If the terms cannot match anything positively
+        """
+        self._tokens = self._tokenize(text or '')
+        self._pos = 0
+        self._filters: Dict[str, Any] = {}
+        self._words: List[str] = []
+        self._fielded = False
+
+        node = self._parse_or()
+        # Unbalanced input: keep parsing whatever is left as further AND terms
+        while self._pos < len(self._tokens):
+            self._pos += 1
+            rest = self._parse_or()
+            node = self._combine('&', node, rest)
+
+        tsquery = None
+        if node is not None:
+            if not self._has_positive(node):
+                raise QueryError("The query needs at least one term that is not negated"
+                                 " (in every OR alternative)")
+            tsquery = self._render(node)
+
+        return {
+            'tsquery': tsquery,
+            'text': ' '.join(self._words),
+            'fielded': self._fielded,
+            'filters': self._filters
+        }
+
+    # Tokenizer
+
+    def _tokenize(self, text: str) -> List[Tuple[str, Any]]:
+        tokens = []
+        i, length = 0, len(text)
+        while i < length:
+            char = text[i]
+            if char.isspace():
+                i += 1
+            elif char in '()':
+                tokens.append(('lparen' if char == '(' else 'rparen', char))
+                i += 1
+            elif char == '-' and i + 1 < length and not text[i + 1].isspace():
+                tokens.append(('op', 'NOT'))
+                i += 1
+            elif char == '"':
+                phrase, i = self._read_phrase(text, i + 1)
+                tokens.append(('term', (None, phrase, True)))
+            else:
+                start = i
+                while i < length and not text[i].isspace() and text[i] not in '()"':
+                    i += 1
+                word = text[start:i]
+                field, _, value = word.partition(':')
+                field = field.lower()
+                if word in self.OPERATORS:
+                    tokens.append(('op', word))
+                elif (field in self.FIELD_WEIGHTS or field == 'year') and word.endswith(':') and not value \
+                        and not (i < length and text[i] == '"'):
+                    # Bare field prefix with nothing to restrict
+                    continue
+                elif value or (field in self.FIELD_WEIGHTS or field == 'year') and i < length and text[i] == '"':
+                    if field == 'year':
+                        tokens.append(('year', value))
+                    elif field in self.FIELD_WEIGHTS:
+                        if not value and i < length and text[i] == '"':
+                            phrase, i = self._read_phrase(text, i + 1)
+                            tokens.append(('term', (field, phrase, True)))
+                        else:
+                            tokens.append(('term', (field, value, False)))
+                    else:
+                        tokens.append(('term', (None, word, False)))
+                else:
+                    tokens.append(('term', (None, word, False)))
+        return tokens
+
+    def _read_phrase(self, text: str, start: int) -> Tuple[str, int]:
+        end = text.find('"', start)
+        if end == -1:
+            return text[start:], len(text)
+        return text[start:end], end + 1
+
+    # Recursive descent parser producing ('op', left, right) / ('not', node) / ('term', ...) nodes
+
+    def _peek(self):
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else (None, None)
+
+    def _parse_or(self):
+        node = self._parse_and()
+        while self._peek() == ('op', 'OR'):
+            self._pos += 1
+            node = self._combine('|', node, self._parse_and())
+        return node
+
+    def _parse_and(self):
+        node = self._parse_unary()
+        while True:
+            kind, value = self._peek()
+            if kind is None or kind == 'rparen' or (kind, value) == ('op', 'OR'):
+                return node
+            if (kind, value) == ('op', 'AND'):
+                self._pos += 1
+            node = self._combine('&', node, self._parse_unary())
+
+    def _parse_unary(self):
+        kind, value = self._peek()
+        if (kind, value) == ('op', 'NOT'):
+            self._pos += 1
+            operand = self._parse_unary()
+            return ('not', operand) if operand is not None else None
+        return self._parse_atom()
+
+    def _parse_atom(self):
+        kind, value = self._peek()
+        if kind is None:
+            return None
+        self._pos += 1
+        if kind == 'lparen':
+            node = self._parse_or()
+            if self._peek()[0] == 'rparen':
+                self._pos += 1
+            return node
+        if kind == 'year':
+            self._parse_year(value)
+            return None
+        if kind == 'term':
+            return self._term_node(*value)
+        # Stray ')' or dangling operator
+        return None
+
+    def _parse_year(self, value: str):
+        match = re.fullmatch(r'(\d{4})?(\.\.)?(\d{4})?', value.strip())
+        if not match or not (match.group(1) or match.group(3)):
+            return
+        low, is_range, high = match.groups()
+        if not is_range:
+            high = low
+        if low:
+            self._filters['year_from'] = int(low)
+        if high:
+            self._filters['year_to'] = int(high)
+
+    def _term_node(self, field: Optional[str], text: str, is_phrase: bool):
+        words = [w.lower() for w in re.findall(r'\w+', text)]
+        if not words:
+            return None
+        weight = self.FIELD_WEIGHTS.get(field, '')
+        return ('term', words, weight, is_phrase)
+
+    def _combine(self, op, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return ('op', op, left, right)
+
+    # Rendering
+
+    def _has_positive(self, node) -> bool:
+        if node[0] == 'term':
+            return True
+        if node[0] == 'not':
+            return False
+        _, op, left, right = node
+        if op == '&':
+            return self._has_positive(left) or self._has_positive(right)
+        return self._has_positive(left) and self._has_positive(right)
+
+    def _render(self, node, parent_op: Optional[str] = None, negated: bool = False) -> str:
+        if node[0] == 'term':
+            return self._render_term(node, negated)
+        if node[0] == 'not':
+            return f"!{self._render(node[1], '!', not negated)}"
+        _, op, left, right = node
+        rendered = f"{self._render(left, op, negated)} {op} {self._render(right, op, negated)}"
+        if parent_op and parent_op != op:
+            return f"({rendered})"
+        return rendered
+
+    def _render_term(self, node, negated: bool) -> str:
+        _, words, weight, is_phrase = node
+        if not negated:
+            self._words.extend(words)
+        if weight:
+            self._fielded = True
+        lexemes = []
+        for index, word in enumerate(words):
+            # Only the last word of a bare term is a prefix; phrases match whole words
+            prefix = not is_phrase and index == len(words) - 1 and len(word) >= self.min_prefix_length
+            suffix = (':*' if prefix else ':' if weight else '') + weight
+            lexemes.append(f"{word}{suffix}")
+        if len(lexemes) == 1:
+            return lexemes[0]
+        return "(" + " <-> ".join(lexemes) + ")"
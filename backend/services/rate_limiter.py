@@ -0,0 +1,189 @@
+# services/rate_limiter.py
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Tuple
+from config import Config
+
+class TokenBucketLimiter:
+    """
+    Token-bucket rate limiter shared by all threads and worker processes.
+
+    Each key (an external source) has a bucket of `limit` tokens refilled
+    continuously at limit/window tokens per second. acquire() never waits:
+    it takes a token, or reports how long until one is available so the
+    caller can skip or defer the request.
+
+    Buckets live in a local SQLite file by default, which every gunicorn
+    worker on the host shares, or in Redis (RATE_LIMIT_BACKEND=redis) when
+    workers span hosts. 'memory' keeps them per process. While Redis is
+    unreachable, at startup or later, the SQLite store stands in for it.
+    If the store itself fails, requests are allowed (fail open) and logged.
+    """
+
+    def __init__(self, backend: str = None):
+        self.backend = backend or Config.RATE_LIMIT_BACKEND
+        self._store = None
+        self._fallback_store = None
+        self._redis_failing = False
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: int, window: float) -> Tuple[bool, int]:
+        """
+        Try to take one token from a bucket
+
+        Args:
+            key: Bucket name, e.g. 'openalex'
+            limit: Bucket capacity (requests allowed per window)
+            window: Window length in seconds
+
+        Returns:
+            Tuple of (allowed, retry_after_ms); retry_after_ms is 0 when allowed
+        """
+        rate = limit / float(window)
+        try:
+            store = self._get_store()
+            if not isinstance(store, _RedisBucketStore):
+                return store.take(key, limit, rate, time.time())
+            try:
+                result = store.take(key, limit, rate, time.time())
+            except Exception as e:
+                if not self._redis_failing:
+                    logging.warning(f"⚠️ Redis rate limiter error ({e}), using SQLite until it recovers")
+                    self._redis_failing = True
+                return self._get_fallback_store().take(key, limit, rate, time.time())
+            if self._redis_failing:
+                logging.info("✅ Redis rate limiter recovered")
+                self._redis_failing = False
+            return result
+        except Exception as e:
+            # A broken limiter store must not take the external sources down: fail open
+            logging.error(f"❌ Rate limiter error for {key}, allowing the request: {e}")
+            return True, 0
+
+    def _get_store(self):
+        # Opened on first use so importing this module touches no files or sockets
+        with self._lock:
+            if self._store is None:
+                if self.backend == 'redis':
+                    try:
+                        self._store = _RedisBucketStore(Config.REDIS_URL)
+                    except Exception as e:
+                        logging.warning(f"⚠️ Redis rate limiter unavailable ({e}), using SQLite")
+                        self._store = self._fallback_store = _SQLiteBucketStore(Config.RATE_LIMIT_SQLITE_PATH)
+                elif self.backend == 'memory':
+                    self._store = _MemoryBucketStore()
+                else:
+                    self._store = _SQLiteBucketStore(Config.RATE_LIMIT_SQLITE_PATH)
+            return self._store
+
+    def _get_fallback_store(self):
+        with self._lock:
+            if self._fallback_store is None:
+                self._fallback_store = _SQLiteBucketStore(Config.RATE_LIMIT_SQLITE_PATH)
+            return self._fallback_store
+
+
+def _refill(tokens, updated, capacity, rate, now):
+    """Token count after refilling since `updated`, and the acquire outcome"""
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, True, 0
+    return tokens, False, int((1 - tokens) / rate * 1000) + 1
+
+
+class _MemoryBucketStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, allowed, retry_after_ms = _refill(tokens, updated, capacity, rate, now)
+            self._buckets[key] = (tokens, now)
+            return allowed, retry_after_ms
+
+
+class _SQLiteBucketStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+
+    def take(self, key, capacity, rate, now):
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front, serializing all processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, allowed, retry_after_ms = _refill(tokens, updated, capacity, rate, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+            return allowed, retry_after_ms
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+
+class _RedisBucketStore:
+    # Refill and take atomically on the server
+    _SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    local retry_after_ms = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_after_ms = math.floor((1 - tokens) / rate * 1000) + 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    return {allowed, retry_after_ms}
+    """
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self.script = self.client.register_script(self._SCRIPT)
+
+    def take(self, key, capacity, rate, now):
+        allowed, retry_after_ms = self.script(keys=[f"rate_limit:{key}"], args=[capacity, rate, now])
+        return bool(allowed), int(retry_after_ms)
+
+
+# One limiter per process; the store is what is shared between processes
+rate_limiter = TokenBucketLimiter()
@@ -0,0 +1,218 @@
+# services/response_cache.py
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Dict, Any, Optional
+from config import Config
+
+class ResponseCache:
+    """
+    On-disk cache of external API response bodies.
+
+    Entries are keyed on a hash of the source, URL and normalized query
+    parameters, and point at body files named by the hash of their content,
+    so identical bodies are stored once. An SQLite index next to the bodies
+    holds expiry, validators (ETag / Last-Modified) and last access, and is
+    shared by all worker processes on the host.
+
+    Fresh entries are served without touching the network or the rate
+    limiter. Expired entries are revalidated with If-None-Match /
+    If-Modified-Since when the upstream sent validators, and can be served
+    stale when the source is rate limited or its circuit is open. The least
+    recently used entries are evicted once RESPONSE_CACHE_MAX_MB is exceeded.
+    """
+
+    # Seconds a response stays fresh, per source
+    SOURCE_TTLS = {
+        'arxiv': 6 * 3600,
+        'openalex': 3600,
+        'crossref': 3600,
+        'dblp': 24 * 3600,
+        'openlibrary': 24 * 3600,
+        'gutendex': 7 * 24 * 3600,
+        'gbif': 24 * 3600
+    }
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = directory or Config.RESPONSE_CACHE_DIR
+        self.max_bytes = max_bytes or Config.RESPONSE_CACHE_MAX_MB * 1024 * 1024
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def key_for(self, source: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key: parameters sorted and whitespace-collapsed, so equivalent requests share it"""
+        normalized = {
+            str(name): ' '.join(str(value).split())
+            for name, value in (params or {}).items() if value is not None
+        }
+        raw = json.dumps([source, url, sorted(normalized.items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, source: str, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Returns:
+            Dictionary with 'key', 'body', 'fresh', 'etag' and 'last_modified',
+            or None on a miss
+        """
+        if not Config.RESPONSE_CACHE_ENABLED:
+            return None
+        key = self.key_for(source, url, params)
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT body_hash, etag, last_modified, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            body_hash, etag, last_modified, expires_at = row
+            with open(self._body_path(body_hash), 'rb') as body_file:
+                body = body_file.read()
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return {
+                'key': key,
+                'body': body,
+                'fresh': expires_at > time.time(),
+                'etag': etag,
+                'last_modified': last_modified
+            }
+        except FileNotFoundError:
+            # Body evicted by another process between index read and file open
+            return None
+        except Exception as e:
+            logging.warning(f"⚠️ Response cache read failed: {e}")
+            return None
+
+    def is_fresh(self, source: str, url: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether a fresh entry exists, without reading its body"""
+        if not Config.RESPONSE_CACHE_ENABLED:
+            return False
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at FROM entries WHERE key = ?", (self.key_for(source, url, params),)
+            ).fetchone()
+            return bool(row) and row[0] > time.time()
+        except Exception as e:
+            logging.warning(f"⚠️ Response cache read failed: {e}")
+            return False
+
+    def put(self, source: str, url: str, params: Optional[Dict[str, Any]], body: bytes,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a 200 response body with the source's TTL"""
+        if not Config.RESPONSE_CACHE_ENABLED:
+            return
+        key = self.key_for(source, url, params)
+        body_hash = hashlib.sha256(body).hexdigest()
+        try:
+            path = self._body_path(body_hash)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'wb') as body_file:
+                    body_file.write(body)
+                os.replace(temp_path, path)
+
+            now = time.time()
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, source, body_hash, size, etag, last_modified, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, body_hash, len(body), etag, last_modified, now + self._ttl(source), now)
+            )
+            self._evict(conn)
+        except Exception as e:
+            logging.warning(f"⚠️ Response cache write failed: {e}")
+
+    def refresh(self, key: str, source: str):
+        """Extend an entry's freshness after the upstream answered 304 Not Modified"""
+        try:
+            self._connection().execute(
+                "UPDATE entries SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (time.time() + self._ttl(source), time.time(), key)
+            )
+        except Exception as e:
+            logging.warning(f"⚠️ Response cache refresh failed: {e}")
+
+    def revalidation_headers(self, cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers for a stale entry, if it has validators"""
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connection()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def _ttl(self, source: str) -> int:
+        return self.SOURCE_TTLS.get(source, Config.RESPONSE_CACHE_DEFAULT_TTL)
+
+    def _evict(self, conn):
+        """Drop least recently used entries, then unreferenced bodies, until under the size bound"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so the next few writes do not evict again
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for key, body_hash, size in conn.execute(
+            "SELECT key, body_hash, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+            still_used = conn.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self._body_path(body_hash))
+                except FileNotFoundError:
+                    pass
+        logging.info(f"Response cache evicted {evicted} entries")
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.directory, 'bodies', body_hash[:2], body_hash)
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._init_lock:
+                os.makedirs(self.directory, exist_ok=True)
+                conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite3'), timeout=5,
+                                       isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                if not self._initialized:
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS entries (
+                            key TEXT PRIMARY KEY,
+                            source TEXT NOT NULL,
+                            body_hash TEXT NOT NULL,
+                            size INTEGER NOT NULL,
+                            etag TEXT,
+                            last_modified TEXT,
+                            expires_at REAL NOT NULL,
+                            accessed_at REAL NOT NULL
+                        )
+                    """)
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries(accessed_at)")
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_body_hash ON entries(body_hash)")
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+
+# One cache per process; the directory is what is shared between processes
+response_cache = ResponseCache()
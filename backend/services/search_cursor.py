@@ -0,0 +1,34 @@
+# services/search_cursor.py
+import json
+import base64
+from typing import Dict, Any
+
+# Orders a cursor can continue (SearchService.SORT_ORDERS)
+SORT_ORDERS = ('relevance', 'citations')
+
+class InvalidCursorError(ValueError):
+    """A search cursor that was not issued by encode_search_cursor"""
+
+def encode_search_cursor(row: Dict[str, Any], sort: str = 'citations') -> str:
+    """Encode the keyset position (sort key, id, table_source) of a result row"""
+    if sort == 'relevance':
+        key = float(row.get('relevance') or 0)
+    else:
+        key = int(row.get('citations') or 0)
+    position = [sort, key, str(row.get('id', '')), str(row.get('table_source', ''))]
+    return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+def decode_search_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode an opaque search cursor, raising InvalidCursorError if it is malformed"""
+    try:
+        sort, key, row_id, table_source = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if sort not in SORT_ORDERS:
+            raise ValueError(sort)
+        return {
+            'cursor_sort': sort,
+            'cursor_key': float(key) if sort == 'relevance' else int(key),
+            'cursor_id': str(row_id),
+            'cursor_table_source': str(table_source)
+        }
+    except Exception:
+        raise InvalidCursorError("Invalid search cursor")
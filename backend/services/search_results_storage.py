@@ -2,6 +2,7 @@
 import logging
 import json
 from services.database import DatabaseService
+from services.external_apis import ExternalAPIService
 
 class SearchResultsStorage:
     """Service for storing and retrieving search results from external APIs"""
@@ -132,6 +133,43 @@ class SearchResultsStorage:
             logging.error(f"Error saving {source} results to database: {e}")
             return False
     
+    def refresh_results(self, source, external_ids=None, limit=100):
+        """
+        Re-fetch stored results from their external API and save the updates
+        
+        Args:
+            source: External API source, e.g. 'openalex'
+            external_ids: IDs to refresh; defaults to the `limit` least recently updated
+            limit: Number of records to refresh when no IDs are given
+        
+        Returns:
+            Number of records refreshed
+        
+        Raises:
+            Exception: Database or external API errors, logged and re-raised
+        """
+        try:
+            if external_ids is None:
+                rows = self.db.execute_query("""
+                    SELECT external_id FROM external_api_data
+                    WHERE source = %s
+                    ORDER BY updated_at
+                    LIMIT %s
+                """, (source, limit))
+                external_ids = [row['external_id'] for row in rows or []]
+            if not external_ids:
+                return 0
+            
+            # Batched where the API allows it, so a refresh costs a handful of requests
+            details = ExternalAPIService().get_publication_details_batch(source, external_ids)
+            if details:
+                self.save_results(list(details.values()), source)
+            logging.info(f"Refreshed {len(details)}/{len(external_ids)} stored results from {source}")
+            return len(details)
+        except Exception as e:
+            logging.error(f"Error refreshing {source} results: {e}")
+            raise
+    
     def get_result_by_id(self, external_id, source):
         """Retrieve a specific result from the database"""
         try:
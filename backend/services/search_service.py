@@ -1,25 +1,93 @@
 # services/search_service.py
 from services.database import DatabaseService
 from services.external_apis import ExternalAPIService
+from services.async_external_apis import gather_sources
+from services.circuit_breaker import CircuitBreakerRegistry
+from services.search_tables import (
+    SOURCE_TABLES, UNIFIED_TABLE, UNIFIED_SPEC, build_filter_conditions, build_text_conditions,
+    relevance_expression, column_expression, id_expression, table_source_expression, mark_typed_columns
+)
+from services.query_compiler import QueryCompiler, QueryError
+from services.search_cursor import SORT_ORDERS, InvalidCursorError, encode_search_cursor, decode_search_cursor
+from config import Config
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import islice
+import heapq
+import threading
 import uuid
 import logging
 import json
 import os
 from typing import Dict, Any, Optional, List
 
+# Shared across requests so a source that misses the deadline never blocks the caller
+_external_executor = ThreadPoolExecutor(max_workers=Config.EXTERNAL_SEARCH_WORKERS,
+                                        thread_name_prefix='external-search')
+
+# Stateless apart from its rate-limit counters, which should outlive a request
+_external_api = ExternalAPIService()
+
+# Shared by every parallel search. A table query borrows one pooled connection,
+# so the workers are capped below the pool size to leave connections for the
+# other routes; concurrent searches queue for workers instead of for the pool
+_table_executor = ThreadPoolExecutor(max_workers=min(Config.SEARCH_PARALLEL_WORKERS, max(1, Config.DB_POOL_MAX - 1)),
+                                     thread_name_prefix='table-search')
+
+# Source table column types are read once per process, on the first parallel search
+_column_types_lock = threading.Lock()
+_column_types_loaded = False
+
+def load_source_column_types(db: DatabaseService) -> None:
+    """Mark which source tables have integer year/citation columns (see mark_typed_columns)"""
+    global _column_types_loaded
+    with _column_types_lock:
+        if _column_types_loaded:
+            return
+        rows = db.execute_query("""
+            SELECT table_name, column_name, data_type FROM information_schema.columns
+            WHERE table_name = ANY(%s)
+        """, ([spec['table'] for spec in SOURCE_TABLES],)) or []
+        column_types = defaultdict(dict)
+        for row in rows:
+            column_types[row['table_name']][row['column_name']] = row['data_type']
+        mark_typed_columns(column_types)
+        _column_types_loaded = True
+        untyped = [spec['table'] for spec in SOURCE_TABLES if spec['table'] in column_types and any(
+            spec['columns'].get(field) and field not in spec['typed_fields'] for field in ('year', 'citations'))]
+        if untyped:
+            logging.warning(f"⚠️ Text year/citation columns in {', '.join(untyped)}: filters on them cannot use "
+                            f"an index until tools/migrate_typed_columns.py has run")
+
 class SearchService:
     """Service for handling search-related operations across database and external APIs"""
     
-    def __init__(self):
+    # How _search_database produces 'total': a full COUNT, the planner's row
+    # estimate, or a COUNT that stops at Config.SEARCH_COUNT_CAP
+    COUNT_MODES = ('exact', 'estimated', 'capped')
+    # Result order: ts_rank_cd relevance or citation count, both with keyset cursors
+    SORT_ORDERS = SORT_ORDERS
+    # 'unified': one query on unified_publications; 'parallel': one query per source table
+    EXECUTION_MODES = ('unified', 'parallel')
+    
+    def __init__(self, count_mode: Optional[str] = None, execution_mode: Optional[str] = None):
         self.db = DatabaseService()
-        self.external_api = ExternalAPIService()
+        self.external_api = _external_api
+        self.count_mode = count_mode if count_mode in self.COUNT_MODES else Config.SEARCH_COUNT_MODE
+        if execution_mode not in self.EXECUTION_MODES:
+            execution_mode = Config.SEARCH_EXECUTION_MODE
+        self.execution_mode = execution_mode
+        self.query_compiler = QueryCompiler()
     
     def search_publications(self, query: str, page: int = 1, per_page: int = 10, 
                            filters: Optional[Dict[str, Any]] = None, 
                            include_external: bool = True,
-                           balance_sources: bool = True) -> Dict[str, Any]:
+                           balance_sources: bool = True,
+                           cursor: Optional[str] = None,
+                           external_deadline_ms: Optional[int] = None,
+                           count_mode: Optional[str] = None,
+                           sort: Optional[str] = None) -> Dict[str, Any]:
         """
         Search for publications across all sources with pagination and filtering
         
@@ -30,11 +98,23 @@ class SearchService:
             filters: Optional dictionary of filters
             include_external: Whether to include external API results
             balance_sources: Whether to balance results from different sources
+            cursor: Opaque keyset cursor from a previous page's next_cursor;
+                    takes precedence over page for the database results
+            external_deadline_ms: Overall budget for the external API fan-out;
+                    defaults to Config.EXTERNAL_SEARCH_DEADLINE_MS
+            count_mode: 'exact', 'estimated' or 'capped'; defaults to the
+                    service's count_mode
+            sort: 'relevance' or 'citations'; defaults to Config.SEARCH_DEFAULT_SORT
             
         Returns:
             Dictionary with combined results and pagination info
+            
+        Raises:
+            InvalidCursorError: If cursor is malformed
+            QueryError: If the query only has negated terms (see QueryCompiler)
         """
         filters = filters or {}
+        sort = sort if sort in self.SORT_ORDERS else Config.SEARCH_DEFAULT_SORT
         if not isinstance(include_external, bool):
             include_external = filters.get('include_external', 'false').lower() == 'true'
         
@@ -53,9 +133,13 @@ class SearchService:
         
         try:
             # Get database results first with proper per_page value
-            db_results = self._search_database(query, page, per_page, filters)
+            db_results = self._search_database(query, page, per_page, filters, cursor,
+                                               count_mode or self.count_mode, sort)
             results = db_results.get('results', [])
             total = db_results.get('total', 0)
+            total_is_lower_bound = db_results.get('total_is_lower_bound', False)
+            total_is_estimate = db_results.get('total_is_estimate', False)
+            next_cursor = db_results.get('next_cursor')
             
             # Log the database results for debugging
             logging.info(f"Database search yielded {len(results) if results else 0} results for query: {query}")
@@ -66,6 +150,9 @@ class SearchService:
             # If external search is requested
             external_apis_used = False
             external_results = []
+            timed_out_sources = []
+            rate_limited_sources = {}
+            circuit_open_sources = []
             
             if include_external:
                 # Calculate how many external results needed to reach per_page total
@@ -76,25 +163,28 @@ class SearchService:
                     # Fetch from external APIs
                     sources = ['arxiv', 'openalex', 'crossref']  # Reduced to the most important ones
                     per_source = max(min(external_needed // len(sources), 3), 1)  # Get 1-3 results per source
+                    # Sources whose circuit is open cost nothing: skip them outright
+                    circuit_open_sources = [s for s in sources if CircuitBreakerRegistry.get(s).is_open()]
+                    sources = [s for s in sources if s not in circuit_open_sources]
+                    # External APIs get the plain words, not our query language
+                    external_query = self.query_compiler.compile(query)['text'] or query
+                    
+                    deadline = (external_deadline_ms or Config.EXTERNAL_SEARCH_DEADLINE_MS) / 1000.0
+                    source_responses, timed_out_sources, rate_limited_sources = self._fetch_external(
+                        sources, external_query, per_source, deadline
+                    )
                     
-                    for source in sources:
-                        try:
-                            logging.info(f"Fetching from external API: {source}")
-                            source_results, source_total = self.external_api.search_external(
-                                source, query, 1, per_source
-                            )
-                            if source_results:
-                                logging.info(f"Found {len(source_results)} results from {source}")
-                                # Add source identifier to each result
-                                for r in source_results:
-                                    r['source'] = f"external_{source}"
-                                
-                                external_results.extend(source_results)
-                                external_apis_used = True
-                            else:
-                                logging.info(f"No results from {source}")
-                        except Exception as source_err:
-                            logging.error(f"Error fetching from {source}: {str(source_err)}")
+                    for source, (source_results, source_total) in source_responses.items():
+                        if source_results:
+                            logging.info(f"Found {len(source_results)} results from {source}")
+                            # Add source identifier to each result
+                            for r in source_results:
+                                r['source'] = f"external_{source}"
+                            
+                            external_results.extend(source_results)
+                            external_apis_used = True
+                        else:
+                            logging.info(f"No results from {source}")
                 
                 # Ensure we have a good mix of results from different sources
                 if external_results and results:
@@ -110,9 +200,8 @@ class SearchService:
                         combined_results.extend(results[:db_portion])
                         combined_results.extend(external_results[:ext_portion])
                     
-                    # Sort by citations
-                    combined_results.sort(key=lambda x: int(x.get('citations', 0) or 0), reverse=True)
-                    results = combined_results[:per_page]  # Ensure we don't exceed the requested per_page
+                    # k-way merge of the per-source lists instead of re-sorting everything
+                    results = self._merge_ranked(combined_results, per_page, sort)
                     total += min(len(external_results), per_page - db_count)
                 elif external_results:
                     results = external_results[:per_page]
@@ -142,9 +231,18 @@ class SearchService:
                 'page': page,
                 'per_page': per_page,
                 'metrics': metrics,
-                'external_apis_used': external_apis_used
+                'external_apis_used': external_apis_used,
+                'timed_out_sources': timed_out_sources,
+                'rate_limited_sources': rate_limited_sources,
+                'circuit_open_sources': circuit_open_sources,
+                'next_cursor': next_cursor,
+                'total_is_lower_bound': total_is_lower_bound,
+                'total_is_estimate': total_is_estimate
             }
             
+        except (InvalidCursorError, QueryError):
+            # The caller's error, not an empty result
+            raise
         except Exception as e:
             logging.error(f"Search failed: {str(e)}")
             return {
@@ -156,6 +254,60 @@ class SearchService:
                 'external_apis_used': False
             }
     
+    def _fetch_external(self, sources, query, per_source, deadline):
+        """
+        Query all sources at once and keep whatever arrives before the deadline
+        
+        Uses the thread pool or, with EXTERNAL_SEARCH_BACKEND=asyncio, the
+        shared event loop of AsyncExternalAPIService. Sources out of
+        rate-limit tokens are skipped up front instead of waited for; sources
+        answered from the response cache take no token.
+        
+        Returns:
+            Tuple of ({source: (results, total)}, sources that timed out,
+            {rate-limited source: retry_after_ms})
+        """
+        rate_limited = {}
+        for source in list(sources):
+            if self.external_api.search_is_cached(source, query, 1, per_source):
+                continue
+            allowed, retry_after_ms = self.external_api.check_rate_limit(source)
+            if not allowed:
+                rate_limited[source] = retry_after_ms
+        sources = [source for source in sources if source not in rate_limited]
+        if not sources:
+            return {}, [], rate_limited
+        
+        if Config.EXTERNAL_SEARCH_BACKEND == 'asyncio':
+            try:
+                gathered = gather_sources(query, sources, deadline, 1, per_source, check_rate_limit=False)
+                return gathered['results'], gathered['timed_out'], rate_limited
+            except Exception as e:
+                logging.error(f"Async external search failed: {str(e)}")
+                return {}, list(sources), rate_limited
+        
+        futures = {
+            source: _external_executor.submit(
+                self.external_api.search_external, source, query, 1, per_source, False
+            )
+            for source in sources
+        }
+        done, _ = wait(futures.values(), timeout=deadline)
+        
+        responses, timed_out = {}, []
+        for source, future in futures.items():
+            if future not in done:
+                # Late results are discarded; the worker finishes in the background
+                future.cancel()
+                timed_out.append(source)
+                logging.warning(f"External API {source} missed the {deadline:.3f}s deadline")
+                continue
+            try:
+                responses[source] = future.result()
+            except Exception as source_err:
+                logging.error(f"Error fetching from {source}: {str(source_err)}")
+        return responses, timed_out, rate_limited
+    
     def _balance_results(self, db_results, external_results, per_page):
         """Balance results from different sources to ensure diversity"""
         # Step 1: Group results by source
@@ -201,6 +353,40 @@ class SearchService:
         
         return balanced_results[:per_page]  # Ensure we don't exceed the requested per_page
             
+    def _merge_ranked(self, items, k, sort='relevance'):
+        """
+        Heap-based k-way merge of results from several sources.
+        
+        Items are split into per-source lists, each put in descending order
+        (SQL results already are, so that sort is linear), and heapq.merge
+        pulls only the k best across all sources. For relevance, each
+        source's ts_rank_cd scores are normalized to its best hit; sources
+        without scores (external APIs) score by their own rank, 1/(1+i).
+        """
+        groups = defaultdict(list)
+        for item in items:
+            groups[item.get('source', item.get('table_source', 'unknown'))].append(item)
+        
+        streams = []
+        for group in groups.values():
+            top = max((float(i.get('relevance') or 0) for i in group), default=0.0)
+            keyed = []
+            for position, item in enumerate(group):
+                citations = int(item.get('citations', 0) or 0)
+                if sort == 'relevance':
+                    if top > 0 and item.get('relevance') is not None:
+                        score = float(item['relevance']) / top
+                    else:
+                        score = 1.0 / (1 + position)
+                    keyed.append(((score, citations), position, item))
+                else:
+                    keyed.append(((citations,), position, item))
+            keyed.sort(key=lambda entry: entry[0], reverse=True)
+            streams.append(keyed)
+        
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+        return [item for _, _, item in islice(merged, k)]
+    
     def _calculate_metrics(self, results) -> Dict[str, Any]:
         """Generate comprehensive metrics"""
         if not results or len(results) == 0:
@@ -323,373 +509,120 @@ class SearchService:
         }
         
     def _search_database(self, query: str, page: int, per_page: int, 
-                        filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Search across all database tables with pagination and filtering
+                        filters: Optional[Dict[str, Any]] = None,
+                        cursor: Optional[str] = None,
+                        count_mode: str = 'exact',
+                        sort: str = 'citations') -> Dict[str, Any]:
         """
-        filters = filters or {}
-        offset = (page - 1) * per_page
-        
-        # Make search more flexible by breaking it into words
-        query_words = query.split()
+        Search the unified publications table with pagination and filtering.
         
-        # Two approaches for text search: exact phrase and any word
-        exact_phrase = query.replace("'", "''")  # Escape single quotes
+        Results are ordered by ts_rank_cd relevance or by citations; either
+        way Postgres keeps only the top LIMIT rows while scanning rather than
+        sorting every match.
         
-        # Build flexible tsquery for multi-word searches (OR operator)
-        tsquery_parts = []
-        for word in query_words:
-            word = word.replace("'", "''")  # Escape single quotes
-            tsquery_parts.append(f"to_tsquery('english', '{word}:*')")
+        With a cursor the page is found by seeking past the last seen
+        (sort key, id, table_source), so deep pages cost the same as the
+        first (on the keyset index for citations); without one, page/offset
+        is used. A cursor always continues the order it was issued for.
         
-        tsquery_expression = " || ".join(tsquery_parts)  # Use OR instead of AND
-        if not tsquery_expression:
-            tsquery_expression = "to_tsquery('english', '')"
+        count_mode 'estimated' reads the planner's row estimate instead of
+        counting, and 'capped' stops counting at Config.SEARCH_COUNT_CAP and
+        flags the total as a lower bound.
         
-        # Define the filter clauses
-        filter_conditions = []
-        filter_params = {'limit': per_page, 'offset': offset, 'exact_phrase': f"%{exact_phrase}%"}
-        
-        if filters.get('year_from'):
-            filter_conditions.append("(CAST(COALESCE(year, '0') AS INTEGER) >= %(year_from)s OR CAST(COALESCE(publication_year, '0') AS INTEGER) >= %(year_from)s)")
-            filter_params['year_from'] = int(filters['year_from'])
-        
-        if filters.get('year_to'):
-            filter_conditions.append("(CAST(COALESCE(year, '0') AS INTEGER) <= %(year_to)s OR CAST(COALESCE(publication_year, '0') AS INTEGER) <= %(year_to)s)")
-            filter_params['year_to'] = int(filters['year_to'])
+        In 'parallel' execution mode the source tables are queried directly
+        instead (see _search_tables_parallel).
+        """
+        filters = filters or {}
+        offset = (page - 1) * per_page
         
-        if filters.get('min_citations'):
-            filter_conditions.append("(COALESCE(cited_by, 0) >= %(min_citations)s OR COALESCE(citation_count, 0) >= %(min_citations)s OR COALESCE(citations, 0) >= %(min_citations)s)")
-            filter_params['min_citations'] = int(filters['min_citations'])
+        # Compile the query language into a bound tsquery plus any inline filters
+        compiled = self.query_compiler.compile(query)
+        filters = dict(filters)
+        for key, value in compiled['filters'].items():
+            if not filters.get(key):
+                filters[key] = value
         
-        # Additional filters that might come from sidebar
-        if filters.get('authorFilter') and filters['authorFilter'].strip():
-            filter_conditions.append("(COALESCE(author_name, '') ILIKE %(authorFilter)s OR COALESCE(authors, '') ILIKE %(authorFilter)s OR COALESCE(author, '') ILIKE %(authorFilter)s OR COALESCE(publisher, '') ILIKE %(authorFilter)s)")
-            filter_params['authorFilter'] = f"%{filters['authorFilter']}%"
+        if self.execution_mode == 'parallel':
+            return self._search_tables_parallel(compiled, filters, offset, per_page,
+                                                cursor, count_mode, sort)
         
-        if filters.get('titleFilter') and filters['titleFilter'].strip():
-            filter_conditions.append("(COALESCE(title, '') ILIKE %(titleFilter)s OR COALESCE(book_title, '') ILIKE %(titleFilter)s)")
-            filter_params['titleFilter'] = f"%{filters['titleFilter']}%"
+        # Define the filter clauses against the typed unified columns
+        filter_params = {'limit': per_page, 'offset': offset}
+        filter_conditions = build_filter_conditions(UNIFIED_SPEC, filters, filter_params)
         
-        if filters.get('journalFilter') and filters['journalFilter'].strip():
-            filter_conditions.append("(COALESCE(journal, '') ILIKE %(journalFilter)s OR COALESCE(source, '') ILIKE %(journalFilter)s OR COALESCE(subject, '') ILIKE %(journalFilter)s)")
-            filter_params['journalFilter'] = f"%{filters['journalFilter']}%"
+        # Text match: the SQL only varies with which parts are present, never with the words
+        text_conditions = build_text_conditions(UNIFIED_SPEC, compiled, filter_params,
+                                                Config.SEARCH_MIN_PREFIX_LENGTH)
         
-        if filters.get('publisherFilter') and filters['publisherFilter'].strip():
-            filter_conditions.append("(COALESCE(publisher, '') ILIKE %(publisherFilter)s)")
-            filter_params['publisherFilter'] = f"%{filters['publisherFilter']}%"
+        if not text_conditions and not filter_conditions:
+            # Nothing positive to match (e.g. only negated or too-short terms)
+            return {'results': [], 'total': 0}
         
-        # Source filtering
-        source_filter = ""
-        if filters.get('source'):
-            source = filters['source']
-            source_filter = f"AND table_source = '{source}'"
+        if text_conditions:
+            filter_conditions.insert(0, "(" + " OR ".join(text_conditions) + ")")
+        
+        # ts_rank_cd over the same weighted vector the GIN index matches on
+        relevance = relevance_expression(UNIFIED_SPEC, compiled)
+        
+        if cursor:
+            position = decode_search_cursor(cursor)
+            sort = position.pop('cursor_sort')
+            filter_params.update(position)
+            filter_params['offset'] = 0
+        sort_key = relevance if sort == 'relevance' else "citations"
+        
+        # Keyset condition only applies to the page query, not the count
+        keyset_condition = ""
+        if cursor:
+            cast = "::real" if sort == 'relevance' else ""
+            keyset_condition = f"""
+            AND ({sort_key}, source_id, table_source)
+                < (%(cursor_key)s{cast}, %(cursor_id)s, %(cursor_table_source)s)
+            """
         
-        # Combine filter conditions
-        additional_filters = " AND ".join(filter_conditions)
-        if additional_filters:
-            additional_filters = f"AND {additional_filters}"
+        where_clause = "WHERE " + " AND ".join(filter_conditions)
         
-        # Build the unified search query using UNION ALL for multiple tables
+        # Single scan of the pre-indexed unified table (see PublicationIndex)
         search_query = f"""
-            WITH 
-            bibliometric_results AS (
-                SELECT 
-                    id::text as id, 
-                    author_name AS author, 
-                    title, 
-                    doi, 
-                    year::text, 
-                    COALESCE(cited_by, 0)::integer AS citations,
-                    'bibliometric_data' AS table_source,
-                    subject
-                FROM bibliometric_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR author_name ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'bibliometric' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            crossref_results AS (
-                SELECT 
-                    id::text as id, 
-                    authors AS author, 
-                    title, 
-                    doi, 
-                    year::text, 
-                    COALESCE(citation_count, 0)::integer AS citations,
-                    'crossref_data_multiple_subjects' AS table_source,
-                    subject
-                FROM crossref_data_multiple_subjects
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(authors, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR authors ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'crossref' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            google_results AS (
-                SELECT 
-                    id::text as id, 
-                    author_name AS author, 
-                    title, 
-                    NULL AS doi, 
-                    year::text, 
-                    COALESCE(cited_by, 0)::integer AS citations,
-                    'google_scholar_data' AS table_source,
-                    subject_of_study AS subject
-                FROM google_scholar_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR author_name ILIKE %(exact_phrase)s
-                      OR subject_of_study ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'google_scholar' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            openalex_results AS (
-                SELECT 
-                    id::text as id, 
-                    author, 
-                    title, 
-                    doi, 
-                    year::text, 
-                    COALESCE(citations, 0)::integer AS citations,
-                    'openalex_data' AS table_source,
-                    subject
-                FROM openalex_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR author ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'openalex' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            cleaned_results AS (
-                SELECT 
-                    id::text as id, 
-                    author, 
-                    title, 
-                    doi, 
-                    year::text, 
-                    0::integer AS citations,
-                    'cleaned_bibliometric_data' AS table_source,
-                    NULL AS subject
-                FROM cleaned_bibliometric_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR author ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'cleaned' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            scopus_results AS (
-                SELECT 
-                    id::text as id, 
-                    publisher AS author, 
-                    book_title AS title, 
-                    NULL AS doi, 
-                    publication_year::text AS year, 
-                    0::integer AS citations,
-                    'scopus_data' AS table_source,
-                    asjc AS subject
-                FROM scopus_data
-                WHERE (to_tsvector('english', COALESCE(book_title, '') || ' ' || COALESCE(publisher, '')) 
-                      @@ ({tsquery_expression})
-                      OR book_title ILIKE %(exact_phrase)s
-                      OR publisher ILIKE %(exact_phrase)s
-                      OR asjc ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'scopus' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            scopus_sept_results AS (
-                SELECT 
-                    id::text as id, 
-                    publisher AS author, 
-                    book_title AS title, 
-                    NULL AS doi, 
-                    publication_year::text AS year, 
-                    0::integer AS citations,
-                    'scopus_data_sept' AS table_source,
-                    asjc AS subject
-                FROM scopus_data_sept
-                WHERE (to_tsvector('english', COALESCE(book_title, '') || ' ' || COALESCE(publisher, '')) 
-                      @@ ({tsquery_expression})
-                      OR book_title ILIKE %(exact_phrase)s
-                      OR publisher ILIKE %(exact_phrase)s
-                      OR asjc ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'scopus_sept' in source_filter else ''}
-                LIMIT %(limit)s
-            ),
-            external_api_results AS (
-                SELECT 
-                    external_id::text as id, 
-                    authors AS author, 
-                    title, 
-                    doi, 
-                    year::text, 
-                    COALESCE(citations, 0)::integer AS citations,
-                    'external_' || source AS table_source,
-                    '' AS subject
-                FROM external_api_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(authors, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR authors ILIKE %(exact_phrase)s
-                      OR doi ILIKE %(exact_phrase)s)
-                {additional_filters}
-                LIMIT %(limit)s
-            ),
-            combined_results AS (
-                SELECT * FROM bibliometric_results
-                UNION ALL
-                SELECT * FROM crossref_results
-                UNION ALL
-                SELECT * FROM google_results
-                UNION ALL
-                SELECT * FROM openalex_results
-                UNION ALL
-                SELECT * FROM cleaned_results
-                UNION ALL
-                SELECT * FROM scopus_results
-                UNION ALL
-                SELECT * FROM scopus_sept_results
-                UNION ALL
-                SELECT * FROM external_api_results
-            )
-            SELECT * FROM combined_results
-            ORDER BY COALESCE(citations, 0) DESC
-            LIMIT %(limit)s OFFSET %(offset)s
-        """
-        
-        # Count total results query - using similar CTEs to get accurate count
-        count_query = f"""
-            WITH 
-            bibliometric_count AS (
-                SELECT COUNT(*) AS count
-                FROM bibliometric_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR author_name ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'bibliometric' in source_filter else ''}
-            ),
-            crossref_count AS (
-                SELECT COUNT(*) AS count
-                FROM crossref_data_multiple_subjects
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(authors, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR authors ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'crossref' in source_filter else ''}
-            ),
-            google_count AS (
-                SELECT COUNT(*) AS count
-                FROM google_scholar_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s 
-                      OR author_name ILIKE %(exact_phrase)s
-                      OR subject_of_study ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'google_scholar' in source_filter else ''}
-            ),
-            openalex_count AS (
-                SELECT COUNT(*) AS count
-                FROM openalex_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR author ILIKE %(exact_phrase)s
-                      OR subject ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'openalex' in source_filter else ''}
-            ),
-            cleaned_count AS (
-                SELECT COUNT(*) AS count
-                FROM cleaned_bibliometric_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR author ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'cleaned' in source_filter else ''}
-            ),
-            scopus_count AS (
-                SELECT COUNT(*) AS count
-                FROM scopus_data
-                WHERE (to_tsvector('english', COALESCE(book_title, '') || ' ' || COALESCE(publisher, '')) 
-                      @@ ({tsquery_expression})
-                      OR book_title ILIKE %(exact_phrase)s
-                      OR publisher ILIKE %(exact_phrase)s
-                      OR asjc ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'scopus' in source_filter else ''}
-            ),
-            scopus_sept_count AS (
-                SELECT COUNT(*) AS count
-                FROM scopus_data_sept
-                WHERE (to_tsvector('english', COALESCE(book_title, '') || ' ' || COALESCE(publisher, '')) 
-                      @@ ({tsquery_expression})
-                      OR book_title ILIKE %(exact_phrase)s
-                      OR publisher ILIKE %(exact_phrase)s
-                      OR asjc ILIKE %(exact_phrase)s)
-                {additional_filters}
-                {source_filter if source_filter and 'scopus_sept' in source_filter else ''}
-            ),
-            external_api_count AS (
-                SELECT COUNT(*) AS count
-                FROM external_api_data
-                WHERE (to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(authors, '')) 
-                      @@ ({tsquery_expression})
-                      OR title ILIKE %(exact_phrase)s
-                      OR authors ILIKE %(exact_phrase)s
-                      OR doi ILIKE %(exact_phrase)s)
-                {additional_filters}
-            )
             SELECT 
-                (SELECT count FROM bibliometric_count) +
-                (SELECT count FROM crossref_count) +
-                (SELECT count FROM google_count) +
-                (SELECT count FROM openalex_count) +
-                (SELECT count FROM cleaned_count) +
-                (SELECT count FROM scopus_count) +
-                (SELECT count FROM scopus_sept_count) +
-                (SELECT count FROM external_api_count) AS total_count
+                source_id AS id, 
+                author, 
+                title, 
+                doi, 
+                year::text AS year, 
+                citations,
+                table_source,
+                subject,
+                {relevance} AS relevance
+            FROM {UNIFIED_TABLE}
+            {where_clause}
+            {keyset_condition}
+            ORDER BY {sort_key} DESC, source_id DESC, table_source DESC
+            LIMIT %(limit)s OFFSET %(offset)s
         """
         
         try:
-            # Execute search query
-            results = self.db.execute_query(search_query, filter_params)
+            # Execute search query; its text is fixed per filter combination,
+            # so it is prepared once per connection and reused
+            results = self.db.execute_prepared(search_query, filter_params)
             
             # Execute count query
-            count_result = self.db.execute_query(count_query, {k: v for k, v in filter_params.items() 
-                                                           if k in ['year_from', 'year_to', 'min_citations', 'exact_phrase', 
-                                                              'authorFilter', 'titleFilter', 'journalFilter', 'publisherFilter']})
-            
-            total = count_result[0]['total_count'] if count_result else 0
+            total, total_is_lower_bound = self._count_matches(where_clause, filter_params, count_mode)
             
             logging.info(f"Database search found {len(results) if results else 0} results")
             logging.info(f"Total count from database: {total}")
             
+            # A full page means there may be more rows past the last one
+            next_cursor = None
+            if results and len(results) == per_page:
+                next_cursor = encode_search_cursor(results[-1], sort)
+            
             return {
                 'results': results or [],
-                'total': total
+                'total': total,
+                'next_cursor': next_cursor,
+                'total_is_lower_bound': total_is_lower_bound,
+                'total_is_estimate': count_mode == 'estimated'
             }
             
         except Exception as e:
@@ -698,6 +631,177 @@ class SearchService:
             logging.error(f"Filter parameters: {filter_params}")
             return {'results': [], 'total': 0}
     
+    def _search_tables_parallel(self, compiled: Dict[str, Any], filters: Dict[str, Any],
+                                offset: int, per_page: int, cursor: Optional[str],
+                                count_mode: str, sort: str) -> Dict[str, Any]:
+        """
+        Run one query per source table concurrently and merge their top rows.
+        
+        Each table returns its own best offset + per_page rows in the final
+        order, so a heap merge of those lists yields the requested page. A
+        failing table is skipped, and so is one that has not answered within
+        SEARCH_PARALLEL_TIMEOUT (its total then counts as a lower bound).
+        """
+        position = None
+        if cursor:
+            position = decode_search_cursor(cursor)
+            sort = position.pop('cursor_sort')
+            offset = 0
+        
+        try:
+            load_source_column_types(self.db)
+        except Exception as e:
+            # Unmarked columns are filtered through column_expression, which is always valid
+            logging.warning(f"⚠️ Could not read source column types: {str(e)}")
+        
+        futures = {
+            spec['table']: _table_executor.submit(self._search_table, spec, compiled, filters,
+                                                  offset + per_page, position, count_mode, sort)
+            for spec in SOURCE_TABLES
+        }
+        done, _ = wait(futures.values(), timeout=Config.SEARCH_PARALLEL_TIMEOUT)
+        
+        table_results, timed_out = [], []
+        for table, future in futures.items():
+            if future not in done:
+                # The query finishes in the background and its rows are discarded
+                future.cancel()
+                timed_out.append(table)
+                logging.warning(f"⚠️ Search on {table} missed the {Config.SEARCH_PARALLEL_TIMEOUT}s deadline, "
+                                f"skipping it")
+                continue
+            table_results.append(future.result())
+        
+        # Same order as the SQL: sort key, then id and table_source in byte order
+        if sort == 'relevance':
+            order = lambda row: (float(row.get('relevance') or 0), row['id'], row['table_source'])
+        else:
+            order = lambda row: (int(row.get('citations') or 0), row['id'], row['table_source'])
+        merged = heapq.merge(*(table['results'] for table in table_results), key=order, reverse=True)
+        results = list(islice(merged, offset, offset + per_page))
+        
+        total = sum(table['total'] for table in table_results)
+        total_is_lower_bound = bool(timed_out) or any(table['total_is_lower_bound'] for table in table_results)
+        if count_mode == 'capped' and (total_is_lower_bound or total > Config.SEARCH_COUNT_CAP):
+            # Each table stops counting at the cap; report at most the cap, as unified mode does
+            total, total_is_lower_bound = min(total, Config.SEARCH_COUNT_CAP), True
+        logging.info(f"Parallel database search found {len(results)} results across {len(SOURCE_TABLES)} tables")
+        
+        next_cursor = None
+        if results and len(results) == per_page:
+            next_cursor = encode_search_cursor(results[-1], sort)
+        
+        return {
+            'results': results,
+            'total': total,
+            'next_cursor': next_cursor,
+            'total_is_lower_bound': total_is_lower_bound,
+            'total_is_estimate': count_mode == 'estimated'
+        }
+    
+    def _search_table(self, spec: Dict[str, Any], compiled: Dict[str, Any], filters: Dict[str, Any],
+                      limit: int, position: Optional[Dict[str, Any]], count_mode: str,
+                      sort: str) -> Dict[str, Any]:
+        """Top `limit` matches and the match count of one source table"""
+        empty = {'results': [], 'total': 0, 'total_is_lower_bound': False}
+        params = {'limit': limit}
+        conditions = build_filter_conditions(spec, filters, params)
+        if 'FALSE' in conditions:
+            # A filter this table cannot satisfy (e.g. on a column it lacks)
+            return empty
+        
+        text_conditions = build_text_conditions(spec, compiled, params, Config.SEARCH_MIN_PREFIX_LENGTH)
+        if text_conditions:
+            conditions.insert(0, "(" + " OR ".join(text_conditions) + ")")
+        if not conditions:
+            return empty
+        
+        relevance = relevance_expression(spec, compiled)
+        sort_key = relevance if sort == 'relevance' else column_expression(spec, 'citations')
+        # Byte-order collation so the Python merge sees the same tie order
+        row_id = f'{id_expression(spec)} COLLATE "C"'
+        table_source = f'({table_source_expression(spec)}) COLLATE "C"'
+        
+        where_clause = "WHERE " + " AND ".join(conditions)
+        keyset_condition = ""
+        if position:
+            params.update(position)
+            cast = "::real" if sort == 'relevance' else ""
+            keyset_condition = f"""
+            AND ({sort_key}, {row_id}, {table_source})
+                < (%(cursor_key)s{cast}, %(cursor_id)s, %(cursor_table_source)s)
+            """
+        
+        search_query = f"""
+            SELECT 
+                {id_expression(spec)} AS id, 
+                {column_expression(spec, 'author')} AS author, 
+                {column_expression(spec, 'title')} AS title, 
+                {column_expression(spec, 'doi')} AS doi, 
+                ({column_expression(spec, 'year')})::text AS year, 
+                {column_expression(spec, 'citations')} AS citations,
+                {table_source_expression(spec)} AS table_source,
+                {column_expression(spec, 'subject')} AS subject,
+                {relevance} AS relevance
+            FROM {spec['table']}
+            {where_clause}
+            {keyset_condition}
+            ORDER BY {sort_key} DESC, {row_id} DESC, {table_source} DESC
+            LIMIT %(limit)s
+        """
+        
+        try:
+            results = self.db.execute_prepared(search_query, params) or []
+            total, total_is_lower_bound = self._count_matches(where_clause, params, count_mode,
+                                                              table=spec['table'])
+            return {'results': results, 'total': total, 'total_is_lower_bound': total_is_lower_bound}
+        except Exception as e:
+            logging.warning(f"⚠️ Search on {spec['table']} failed, skipping it: {str(e)}")
+            return empty
+    
+    def _count_matches(self, where_clause: str, params: Dict[str, Any], count_mode: str,
+                       table: str = UNIFIED_TABLE):
+        """
+        Count rows matching a search
+        
+        Returns:
+            Tuple of (total, whether total is only a lower bound)
+        """
+        if count_mode == 'estimated':
+            plan = self.db.execute_query(f"""
+                EXPLAIN (FORMAT JSON)
+                SELECT 1 FROM {table}
+                {where_clause}
+            """, params)
+            if plan:
+                plan_json = plan[0]['QUERY PLAN']
+                if isinstance(plan_json, str):
+                    plan_json = json.loads(plan_json)
+                return int(plan_json[0]['Plan']['Plan Rows']), False
+            return 0, False
+        
+        if count_mode == 'capped':
+            cap = Config.SEARCH_COUNT_CAP
+            count_result = self.db.execute_prepared(f"""
+                SELECT COUNT(*) AS total_count
+                FROM (
+                    SELECT 1 FROM {table}
+                    {where_clause}
+                    LIMIT %(count_limit)s
+                ) capped
+            """, {**params, 'count_limit': cap + 1})
+            total = count_result[0]['total_count'] if count_result else 0
+            if total > cap:
+                return cap, True
+            return total, False
+        
+        count_result = self.db.execute_prepared(f"""
+            SELECT COUNT(*) AS total_count
+            FROM {table}
+            {where_clause}
+        """, params)
+        return (count_result[0]['total_count'] if count_result else 0), False
+    
     def get_publication_details(self, paper_id, source=None):
         """Get detailed information about a publication"""
         try:
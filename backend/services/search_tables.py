@@ -0,0 +1,320 @@
+# services/search_tables.py
+"""
+Declarative description of the tables searched by SearchService.
+
+Each entry maps the normalized publication fields (title, author, doi, year,
+citations, subject, journal, publisher) onto the actual column names of one
+source table. A field mapped to None does not exist in that table.
+"""
+from typing import Dict, Any, List, Optional
+
+# Normalized fields carried by every search result, in unified table order
+PUBLICATION_FIELDS = ['title', 'author', 'doi', 'year', 'citations', 'subject', 'journal', 'publisher']
+
+# Fields in the full-text vector and their tsvector weights (title:, author:, subject:)
+TSVECTOR_WEIGHTS = {'title': 'A', 'author': 'B', 'subject': 'C'}
+
+# Fields matched with ILIKE when a plain query falls back to substring search
+SEARCH_TEXT_FIELDS = ['title', 'author', 'subject']
+
+# Sidebar filters matched with ILIKE, and the fields each one searches
+ILIKE_FILTERS = [
+    ('authorFilter', ['author', 'publisher']),
+    ('titleFilter', ['title']),
+    ('journalFilter', ['journal', 'subject']),
+    ('publisherFilter', ['publisher']),
+]
+
+SOURCE_TABLES: List[Dict[str, Any]] = [
+    {
+        'table': 'bibliometric_data',
+        'alias': 'bibliometric',
+        'id': 'id',
+        'columns': {'title': 'title', 'author': 'author_name', 'doi': 'doi', 'year': 'year',
+                    'citations': 'cited_by', 'subject': 'subject', 'journal': None, 'publisher': None},
+    },
+    {
+        'table': 'crossref_data_multiple_subjects',
+        'alias': 'crossref',
+        'id': 'id',
+        'columns': {'title': 'title', 'author': 'authors', 'doi': 'doi', 'year': 'year',
+                    'citations': 'citation_count', 'subject': 'subject', 'journal': None, 'publisher': None},
+    },
+    {
+        'table': 'google_scholar_data',
+        'alias': 'google_scholar',
+        'id': 'id',
+        'columns': {'title': 'title', 'author': 'author_name', 'doi': None, 'year': 'year',
+                    'citations': 'cited_by', 'subject': 'subject_of_study', 'journal': None, 'publisher': None},
+    },
+    {
+        'table': 'openalex_data',
+        'alias': 'openalex',
+        'id': 'id',
+        'columns': {'title': 'title', 'author': 'author', 'doi': 'doi', 'year': 'year',
+                    'citations': 'citations', 'subject': 'subject', 'journal': None, 'publisher': None},
+    },
+    {
+        'table': 'cleaned_bibliometric_data',
+        'alias': 'cleaned',
+        'id': 'id',
+        'columns': {'title': 'title', 'author': 'author', 'doi': 'doi', 'year': 'year',
+                    'citations': None, 'subject': None, 'journal': None, 'publisher': None},
+    },
+    {
+        'table': 'scopus_data',
+        'alias': 'scopus',
+        'id': 'id',
+        # Large, append-only load: a BRIN index on year is far smaller than a btree
+        'year_index': 'brin',
+        'columns': {'title': 'book_title', 'author': 'publisher', 'doi': None, 'year': 'publication_year',
+                    'citations': None, 'subject': 'asjc', 'journal': None, 'publisher': 'publisher'},
+    },
+    {
+        'table': 'scopus_data_sept',
+        'alias': 'scopus_sept',
+        'id': 'id',
+        'year_index': 'brin',
+        'columns': {'title': 'book_title', 'author': 'publisher', 'doi': None, 'year': 'publication_year',
+                    'citations': None, 'subject': 'asjc', 'journal': None, 'publisher': 'publisher'},
+    },
+    {
+        'table': 'external_api_data',
+        'alias': 'external',
+        'id': 'external_id',
+        # Rows are labelled 'external_<source>' rather than with the table name
+        'table_source_column': 'source',
+        'table_source_prefix': 'external_',
+        'columns': {'title': 'title', 'author': 'authors', 'doi': 'doi', 'year': 'year',
+                    'citations': 'citations', 'subject': None, 'journal': 'journal', 'publisher': None},
+    },
+]
+
+# The pre-indexed table kept in sync from all SOURCE_TABLES. Its columns are
+# already the normalized fields, typed, so it is described the same way.
+UNIFIED_TABLE = 'unified_publications'
+
+UNIFIED_SPEC: Dict[str, Any] = {
+    'table': UNIFIED_TABLE,
+    'alias': 'unified',
+    'id': 'source_id',
+    'table_source_column': 'table_source',
+    # Stored generated column holding tsvector_expression(UNIFIED_SPEC)
+    'search_vector': 'search_vector',
+    'columns': {field: field for field in PUBLICATION_FIELDS},
+    'typed_fields': ('year', 'citations'),
+}
+
+# Fields that build_filter_conditions compares numerically
+NUMERIC_FIELDS = ('year', 'citations')
+INTEGER_TYPES = ('integer', 'bigint', 'smallint')
+
+
+def mark_typed_columns(column_types: Dict[str, Dict[str, str]]) -> None:
+    """
+    Record which source tables already have integer year/citation columns.
+
+    Until a table is marked, filters on it go through column_expression(),
+    which works on text columns too but cannot use a btree/BRIN index.
+
+    Args:
+        column_types: Table name -> column name -> information_schema data_type
+    """
+    for spec in SOURCE_TABLES:
+        types = column_types.get(spec['table'], {})
+        spec['typed_fields'] = tuple(
+            field for field in NUMERIC_FIELDS
+            if spec['columns'].get(field) and types.get(spec['columns'][field]) in INTEGER_TYPES
+        )
+
+
+def filter_column(spec: Dict[str, Any], field: str) -> str:
+    """The bare column when it is known to be an integer, else its coercing column_expression()"""
+    if field in spec.get('typed_fields', ()):
+        return spec['columns'][field]
+    return column_expression(spec, field)
+
+
+def get_source_table(name: str) -> Optional[Dict[str, Any]]:
+    """Look up a source table spec by table name or short alias"""
+    for spec in SOURCE_TABLES:
+        if name in (spec['table'], spec['alias']):
+            return spec
+    return None
+
+
+def column_expression(spec: Dict[str, Any], field: str, row: str = '') -> str:
+    """
+    SQL expression producing a normalized field from a source table row.
+
+    Args:
+        spec: Source table spec from SOURCE_TABLES
+        field: Normalized field name (see PUBLICATION_FIELDS)
+        row: Optional row qualifier, e.g. 'NEW.' inside a trigger body
+
+    Returns:
+        SQL expression; year and citations are coerced to integers
+    """
+    column = spec['columns'].get(field)
+    if not column:
+        return '0' if field == 'citations' else 'NULL'
+    if field == 'year':
+        return f"substring({row}{column}::text from '(\\d{{4}})')::integer"
+    if field == 'citations':
+        return f"COALESCE(substring({row}{column}::text from '^\\s*(\\d+)')::integer, 0)"
+    return f"{row}{column}::text"
+
+
+def table_source_expression(spec: Dict[str, Any], row: str = '') -> str:
+    """SQL expression producing the table_source label of a source table row"""
+    if spec.get('table_source_column'):
+        if not spec.get('table_source_prefix'):
+            return f"{row}{spec['table_source_column']}"
+        return f"'{spec['table_source_prefix']}' || {row}{spec['table_source_column']}"
+    return f"'{spec['table']}'"
+
+
+def tsvector_expression(spec: Dict[str, Any], row: str = '') -> str:
+    """
+    Weighted tsvector over the title/author/subject columns of a table.
+
+    The text is identical for the unified table's generated column and the
+    per-table expression indexes, so both are matched by the same queries.
+    """
+    parts = []
+    for field, weight in TSVECTOR_WEIGHTS.items():
+        column = spec['columns'].get(field)
+        if column:
+            parts.append(f"setweight(to_tsvector('english', COALESCE({row}{column}::text, '')), '{weight}')")
+    if not parts:
+        return "''::tsvector"
+    return " || ".join(parts)
+
+
+def search_vector_expression(spec: Dict[str, Any]) -> str:
+    """The tsvector a search on this table matches against: a stored column or the expression"""
+    return spec.get('search_vector') or f"({tsvector_expression(spec)})"
+
+
+def ilike_columns(spec: Dict[str, Any], fields: List[str]) -> List[str]:
+    """Distinct columns of a table backing the given fields, in field order"""
+    columns = []
+    for field in fields:
+        column = spec['columns'].get(field)
+        if column and column not in columns:
+            columns.append(column)
+    return columns
+
+
+def id_expression(spec: Dict[str, Any], row: str = '') -> str:
+    """SQL expression producing the text id of a source table row"""
+    return f"{row}{spec['id']}::text"
+
+
+def _ilike_any(spec: Dict[str, Any], fields: List[str], param: str) -> str:
+    """OR of ILIKE predicates over whichever of the fields the table has"""
+    columns = ilike_columns(spec, fields)
+    if not columns:
+        return 'FALSE'
+    return "(" + " OR ".join(f"{column} ILIKE %({param})s" for column in columns) + ")"
+
+
+def build_filter_conditions(spec: Dict[str, Any], filters: Dict[str, Any],
+                            params: Dict[str, Any]) -> List[str]:
+    """
+    Translate search filters into sargable predicates on one table.
+
+    Predicates compare the table's own typed year/citation columns directly
+    (see tools/migrate_typed_columns.py), so btree/BRIN indexes can serve
+    them; columns not marked typed (mark_typed_columns) are coerced with
+    column_expression() instead. A filter on a field the table lacks yields FALSE.
+
+    Args:
+        spec: Table spec (SOURCE_TABLES entry or UNIFIED_SPEC)
+        filters: Request filters (year_from, year_to, min_citations, ...)
+        params: Query parameter dict, updated in place
+
+    Returns:
+        List of SQL predicates to AND together
+    """
+    conditions = []
+    columns = spec['columns']
+
+    if filters.get('year_from'):
+        params['year_from'] = int(filters['year_from'])
+        conditions.append(f"{filter_column(spec, 'year')} >= %(year_from)s" if columns.get('year') else 'FALSE')
+
+    if filters.get('year_to'):
+        params['year_to'] = int(filters['year_to'])
+        conditions.append(f"{filter_column(spec, 'year')} <= %(year_to)s" if columns.get('year') else 'FALSE')
+
+    if filters.get('min_citations') and int(filters['min_citations']) > 0:
+        params['min_citations'] = int(filters['min_citations'])
+        conditions.append(f"{filter_column(spec, 'citations')} >= %(min_citations)s" if columns.get('citations') else 'FALSE')
+
+    # Additional filters that might come from sidebar
+    for param, fields in ILIKE_FILTERS:
+        value = filters.get(param)
+        if value and value.strip():
+            params[param] = f"%{value}%"
+            conditions.append(_ilike_any(spec, fields, param))
+
+    # Source filtering accepts either a table name or its short alias
+    if filters.get('source'):
+        conditions.append(_source_condition(spec, filters['source'], params))
+
+    return conditions
+
+
+def build_text_conditions(spec: Dict[str, Any], compiled: Dict[str, Any],
+                          params: Dict[str, Any], min_length: int) -> List[str]:
+    """
+    Full-text and substring predicates for a compiled query (see QueryCompiler).
+
+    The tsquery is matched against search_vector_expression(spec), and the
+    ILIKE fallback runs over SEARCH_TEXT_FIELDS, which is what IndexManager
+    builds GIN and trigram indexes for. The fallback is skipped for
+    field-restricted queries, which it would loosen, and for text shorter
+    than min_length, which no trigram index can serve.
+
+    Returns:
+        Predicates to OR together; empty when nothing positive can match
+    """
+    conditions = []
+    if compiled['tsquery']:
+        conditions.append(f"{search_vector_expression(spec)} @@ to_tsquery('english', %(tsquery)s)")
+        params['tsquery'] = compiled['tsquery']
+
+    if not compiled['fielded'] and len(compiled['text']) >= min_length:
+        conditions.append(_ilike_any(spec, SEARCH_TEXT_FIELDS, 'exact_phrase'))
+        params['exact_phrase'] = f"%{compiled['text']}%"
+
+    return conditions
+
+
+def relevance_expression(spec: Dict[str, Any], compiled: Dict[str, Any]) -> str:
+    """ts_rank_cd of a table's search vector against the bound tsquery"""
+    if not compiled['tsquery']:
+        return "0::real"
+    return f"ts_rank_cd({search_vector_expression(spec)}, to_tsquery('english', %(tsquery)s))"
+
+
+def _source_condition(spec: Dict[str, Any], source: str, params: Dict[str, Any]) -> str:
+    target = get_source_table(source)
+    label = table_source_expression(spec)
+
+    if spec['table'] != UNIFIED_TABLE:
+        # A source table either is the requested source or contributes nothing
+        if target is spec:
+            return 'TRUE'
+        prefix = spec.get('table_source_prefix')
+        if target is None and prefix and source.startswith(prefix):
+            params['source'] = source
+            return f"{label} = %(source)s"
+        return 'FALSE'
+
+    if target and target.get('table_source_column'):
+        params['source_prefix'] = f"{target['table_source_prefix']}%"
+        return f"{label} LIKE %(source_prefix)s"
+    params['source'] = target['table'] if target else source
+    return f"{label} = %(source)s"
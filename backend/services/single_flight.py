@@ -0,0 +1,152 @@
+# services/single_flight.py
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from typing import Any, Callable, Tuple
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalescing stays within the process
+    fcntl = None
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first caller for a key runs the
+    function and concurrent callers with the same key wait for its result.
+
+    Within a process callers wait on the leader's thread. With
+    SINGLE_FLIGHT_SHARED, leaders of different worker processes also take an
+    flock on a per-key lock file; a worker that finds the lock held waits for
+    it and reuses the result file the holder wrote, so only one worker on the
+    host does the work. Shared results must be JSON serializable.
+    """
+
+    # Result files older than this are swept by later leaders
+    RESULT_FILE_MAX_AGE = 60
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, name: str, shared: bool = None, directory: str = None, timeout: float = None):
+        self.name = name
+        self.shared = (Config.SINGLE_FLIGHT_SHARED if shared is None else shared) and fcntl is not None
+        self.directory = os.path.join(directory or Config.SINGLE_FLIGHT_DIR, name)
+        self.timeout = timeout or Config.SINGLE_FLIGHT_TIMEOUT
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Normalized request key
+            fn: Computes the result; exceptions reach every waiting caller
+
+        Returns:
+            Tuple of (result, shared) where shared is True if another caller
+            computed the result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                logging.warning(f"⚠️ {self.name}: gave up waiting for {key} after {self.timeout}s")
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._run_shared(key, fn) if self.shared else (fn(), False)
+            return call.result, shared
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_shared(self, key, fn):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        lock_path = os.path.join(self.directory, f"{digest}.lock")
+        result_path = os.path.join(self.directory, f"{digest}.json")
+        os.makedirs(self.directory, exist_ok=True)
+
+        started = time.time()
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is computing this key: wait for it to finish
+                locked = self._wait_for_lock(fd, started + self.timeout)
+                result = self._read_result(result_path, started)
+                if result is not None:
+                    return result, True
+                if not locked:
+                    logging.warning(f"⚠️ {self.name}: lock for {key} held over {self.timeout}s")
+                    return fn(), False
+
+            result = fn()
+            self._write_result(result_path, result)
+            self._sweep()
+            return result, False
+        finally:
+            # Closing the descriptor releases the flock
+            os.close(fd)
+
+    def _wait_for_lock(self, fd, deadline):
+        while time.time() < deadline:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                time.sleep(0.02)
+        return False
+
+    def _read_result(self, path, not_before):
+        """The result in path if it was written after not_before"""
+        try:
+            with open(path, 'r', encoding='utf-8') as result_file:
+                stored = json.load(result_file)
+            if stored['finished_at'] >= not_before:
+                return stored['result']
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _write_result(self, path, result):
+        try:
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as result_file:
+                json.dump({'finished_at': time.time(), 'result': result}, result_file)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"⚠️ {self.name}: could not share result: {e}")
+
+    def _sweep(self):
+        now = time.time()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json') and now - entry.stat().st_mtime > self.RESULT_FILE_MAX_AGE:
+                    os.remove(entry.path)
+        except OSError:
+            pass
@@ -0,0 +1,143 @@
+# services/xml_parsers.py
+import io
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Tuple, Optional, Iterator, Union, IO
+
+# Incremental parsers for the XML sources (arXiv Atom feeds, DBLP records).
+# They read the document with iterparse, build each result from the entry's
+# direct children as soon as the entry is complete, then clear it from the
+# tree, so memory stays bounded by one entry whatever the page size.
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+OPENSEARCH = '{http://a9.com/-/spec/opensearch/1.1/}'
+
+# DBLP record elements, one per publication type
+DBLP_TYPES = ('article', 'inproceedings', 'book', 'incollection', 'proceedings', 'phdthesis', 'mastersthesis')
+
+XMLSource = Union[bytes, IO[bytes]]
+
+def _stream(source: XMLSource) -> IO[bytes]:
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+def iter_arxiv_entries(source: XMLSource, feed_info: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield normalized results from an arXiv Atom feed as each entry completes
+
+    Args:
+        source: Response body, or a binary file-like object to read it from
+        feed_info: If given, receives 'total' when opensearch:totalResults is read
+
+    Yields:
+        Result dictionaries; 'id' is None for entries without an <id>
+    """
+    for _, elem in ET.iterparse(_stream(source), events=('end',)):
+        if elem.tag == ATOM + 'entry':
+            yield _arxiv_result(elem)
+            # Only an empty <entry/> stays attached to the feed
+            elem.clear()
+        elif elem.tag == OPENSEARCH + 'totalResults' and feed_info is not None:
+            feed_info['total'] = int(elem.text)
+
+def _arxiv_result(entry) -> Dict[str, Any]:
+    arxiv_id = None
+    title = "No title"
+    have_title = False
+    authors = []
+    published = ""
+    abstract = ""
+    categories = []
+
+    # One pass over the entry's children instead of an XPath lookup per field
+    for child in entry:
+        tag = child.tag
+        if tag == ATOM + 'id':
+            if arxiv_id is None and child.text:
+                arxiv_id = child.text.split('/')[-1]
+        elif tag == ATOM + 'title':
+            if not have_title:
+                title, have_title = child.text, True
+        elif tag == ATOM + 'author':
+            for name in child:
+                if name.tag == ATOM + 'name' and name.text:
+                    authors.append(name.text)
+        elif tag == ATOM + 'published':
+            published = child.text or ""
+        elif tag == ATOM + 'summary':
+            abstract = child.text
+        elif tag == ATOM + 'category':
+            term = child.get('term')
+            if term:
+                categories.append(term)
+
+    return {
+        'id': arxiv_id,
+        'title': title,
+        'author': ', '.join(authors),
+        'year': published.split('-')[0] if published and '-' in published else "",
+        'abstract': abstract,
+        'doi': None,
+        'subject': ', '.join(categories) if categories else None,
+        'citations': 0,  # arXiv doesn't provide citation counts
+        'source': 'arxiv',
+        'url': f"https://arxiv.org/abs/{arxiv_id}"
+    }
+
+def parse_arxiv_feed(source: XMLSource) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Parse an arXiv search feed
+
+    Returns:
+        Tuple of (results, total count)
+    """
+    feed_info = {}
+    results = [result for result in iter_arxiv_entries(source, feed_info) if result['id']]
+    return results, feed_info.get('total', len(results))
+
+def parse_arxiv_entry(source: XMLSource, pub_id: str) -> Optional[Dict[str, Any]]:
+    """Parse the first entry of an arXiv feed as publication pub_id; stops reading there"""
+    for result in iter_arxiv_entries(source):
+        result.update({'id': pub_id, 'url': f"https://arxiv.org/abs/{pub_id}"})
+        return result
+    return None
+
+def parse_dblp_record(source: XMLSource, pub_id: str) -> Optional[Dict[str, Any]]:
+    """Parse a DBLP record (https://dblp.org/rec/<key>.xml); stops reading at the end of the publication"""
+    for _, elem in ET.iterparse(_stream(source), events=('end',)):
+        if elem.tag in DBLP_TYPES:
+            return _dblp_result(elem, pub_id)
+    return None
+
+def _dblp_result(pub_elem, pub_id: str) -> Dict[str, Any]:
+    title = "No title"
+    have_title = False
+    authors = []
+    year = None
+    doi = None
+
+    for child in pub_elem:
+        tag = child.tag
+        if tag == 'title':
+            if not have_title:
+                title, have_title = child.text, True
+        elif tag == 'author':
+            if child.text:
+                authors.append(child.text)
+        elif tag == 'year':
+            if year is None:
+                year = child.text
+        elif tag == 'ee' and child.get('type') == 'doi':
+            if doi is None:
+                doi = child.text.replace('https://doi.org/', '')
+
+    return {
+        'id': pub_id,
+        'title': title,
+        'author': ', '.join(authors),
+        'year': year,
+        'abstract': '',  # DBLP doesn't provide abstracts
+        'doi': doi,
+        'subject': pub_elem.tag,  # Use publication type as subject
+        'citations': 0,  # DBLP doesn't provide citation counts
+        'source': 'dblp',
+        'url': f"https://dblp.org/rec/{pub_id}.html"
+    }
@@ -283,81 +283,24 @@ def fix_user_password(username, password):
 
 def fix_search_db_indices():
     """Create indices for improved search performance"""
-    conn = get_connection()
-    if not conn:
-        return False
+    # The required indexes are derived from the search table specs
+    from services.index_manager import IndexManager
     
     try:
-        with conn.cursor() as cur:
-            # Check for GIN indices
-            cur.execute("""
-                SELECT indexname FROM pg_indexes 
-                WHERE tablename = 'bibliometric_data' AND indexname = 'idx_bibliometric_data_text_search';
-            """)
-            index_exists = cur.fetchone()
-            
-            if not index_exists:
-                logger.info("Creating search indices for bibliometric_data...")
-                try:
-                    # Create GIN index for full text search
-                    cur.execute("""
-                    CREATE INDEX idx_bibliometric_data_text_search 
-                    ON bibliometric_data 
-                    USING gin(to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')));
-                    """)
-                    logger.info("✅ Created search index for bibliometric_data")
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not create index: {e}")
-            
-            # Check for crossref data indices
-            cur.execute("""
-                SELECT indexname FROM pg_indexes 
-                WHERE tablename = 'crossref_data_multiple_subjects' AND indexname = 'idx_crossref_data_text_search';
-            """)
-            index_exists = cur.fetchone()
-            
-            if not index_exists:
-                logger.info("Creating search indices for crossref_data_multiple_subjects...")
-                try:
-                    # Create GIN index for full text search
-                    cur.execute("""
-                    CREATE INDEX idx_crossref_data_text_search 
-                    ON crossref_data_multiple_subjects 
-                    USING gin(to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(authors, '')));
-                    """)
-                    logger.info("✅ Created search index for crossref_data_multiple_subjects")
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not create index: {e}")
-            
-            # Check for google scholar indices
-            cur.execute("""
-                SELECT indexname FROM pg_indexes 
-                WHERE tablename = 'google_scholar_data' AND indexname = 'idx_google_scholar_data_text_search';
-            """)
-            index_exists = cur.fetchone()
-            
-            if not index_exists:
-                logger.info("Creating search indices for google_scholar_data...")
-                try:
-                    # Create GIN index for full text search
-                    cur.execute("""
-                    CREATE INDEX idx_google_scholar_data_text_search 
-                    ON google_scholar_data 
-                    USING gin(to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(author_name, '')));
-                    """)
-                    logger.info("✅ Created search index for google_scholar_data")
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not create index: {e}")
-            
-            conn.commit()
-            logger.info("✅ Search indices created or verified")
-            return True
+        manager = IndexManager()
+        created = manager.ensure_indexes()
+        for statement in created:
+            logger.info(f"Created: {statement}")
+        
+        unbacked = manager.unbacked_predicates()
+        for entry in unbacked:
+            logger.warning(f"⚠️ {entry['table']}: {entry['predicate']} is not index-backed")
+        
+        logger.info("✅ Search indices created or verified")
+        return True
     except Exception as e:
-        conn.rollback()
         logger.error(f"❌ Error creating search indices: {e}")
         return False
-    finally:
-        conn.close()
 
 def setup_database():
     """Verify database structure and create indices for search"""
@@ -0,0 +1,51 @@
+# tests/test_bulk_loader.py
+# Usage (from backend/): python -m pytest tests
+import pytest
+from psycopg2 import sql
+from data_processing.bulk_loader import BulkLoader, normalize_column, coerce_expression
+
+TYPES = {'scopus_id': 'bigint', 'book_title': 'text', 'publication_year': 'integer'}
+
+class _Cursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+
+@pytest.fixture(autouse=True)
+def plain_identifiers(monkeypatch):
+    # Composables render without a live connection
+    monkeypatch.setattr(sql.ext, 'quote_ident', lambda name, context: f'"{name}"')
+
+def test_normalize_column():
+    assert normalize_column(' Citation Count ') == 'citation_count'
+    assert normalize_column('Publication-Year (YYYY)') == 'publication_year_yyyy'
+
+def test_coerce_expression_by_type():
+    assert coerce_expression('book_title', 'text').as_string(None) == '"book_title"'
+    integer = coerce_expression('publication_year', 'integer').as_string(None)
+    assert "replace(NULLIF(btrim(\"publication_year\"), ''), ',', '')::integer" in integer
+    assert coerce_expression('loaded', 'date').as_string(None) == "NULLIF(btrim(\"loaded\"), '')::date"
+
+def test_merge_deduplicates_coerced_keys_keeping_the_last_row():
+    loader = BulkLoader('scopus_data', key_columns=['scopus_id'], db=object())
+    _, merge = loader._prepare(_Cursor(), list(TYPES), TYPES)
+    merge = merge.as_string(None)
+    # DISTINCT ON runs over the coerced subquery, so ' 42' and '42' are one key
+    assert 'SELECT DISTINCT ON ("scopus_id") "scopus_id", "book_title", "publication_year" FROM (SELECT CASE' in merge
+    assert 'ORDER BY "scopus_id", "_bulk_load_row_no" DESC ON CONFLICT ("scopus_id") DO UPDATE SET' in merge
+    assert 'RETURNING' not in merge
+
+def test_merge_into_a_source_table_syncs_the_unified_table():
+    loader = BulkLoader('scopus_data', key_columns=['scopus_id'], db=object())
+    _, merge = loader._prepare(_Cursor(), list(TYPES), TYPES, sync=True)
+    merge = merge.as_string(None)
+    assert merge.startswith('WITH merged AS (INSERT INTO "scopus_data"')
+    assert 'RETURNING *) INSERT INTO unified_publications' in merge
+    assert 'FROM merged ON CONFLICT (table_source, source_id)' in merge
+
+def test_append_without_key():
+    loader = BulkLoader('scopus_data', db=object())
+    _, merge = loader._prepare(_Cursor(), ['book_title'], TYPES)
+    assert merge.as_string(None).startswith('INSERT INTO "scopus_data" ("book_title") SELECT "book_title" FROM (')
@@ -0,0 +1,84 @@
+# tests/test_circuit_breaker.py
+# Usage (from backend/): python -m pytest tests
+import pytest
+from config import Config
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    return clock
+
+def _trip(breaker):
+    for _ in range(Config.BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('openalex')
+    for _ in range(Config.BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.totals['rejected'] == 1
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker('openalex')
+    for _ in range(Config.BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.record_success(0.01)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker('openalex')
+    _trip(breaker)
+    clock.now += Config.BREAKER_OPEN_SECONDS
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+def test_failed_probe_doubles_the_open_period(clock):
+    breaker = CircuitBreaker('openalex')
+    _trip(breaker)
+    clock.now += Config.BREAKER_OPEN_SECONDS
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.open_seconds == min(Config.BREAKER_OPEN_SECONDS * 2, Config.BREAKER_MAX_OPEN_SECONDS)
+    clock.now += Config.BREAKER_OPEN_SECONDS
+    assert not breaker.allow_request()
+
+def test_released_probe_can_be_taken_again(clock):
+    breaker = CircuitBreaker('openalex')
+    _trip(breaker)
+    clock.now += Config.BREAKER_OPEN_SECONDS
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.allow_request()
+
+def test_slow_success_counts_as_failure(clock):
+    breaker = CircuitBreaker('openalex')
+    breaker.record_success(Config.BREAKER_SLOW_CALL_MS / 1000 + 1)
+    assert breaker.consecutive_failures == 1
+    assert breaker.totals == {'success': 0, 'failure': 1, 'rejected': 0}
+
+def test_read_timeout_follows_p95_within_bounds():
+    breaker = CircuitBreaker('openalex')
+    assert breaker.read_timeout() == Config.HTTP_READ_TIMEOUT
+    for _ in range(CircuitBreaker.MIN_SAMPLES):
+        breaker.record_success(0.0)
+    assert breaker.read_timeout() == Config.ADAPTIVE_TIMEOUT_MIN
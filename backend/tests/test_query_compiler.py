@@ -0,0 +1,77 @@
+# tests/test_query_compiler.py
+# Usage (from backend/): python -m pytest tests
+import pytest
+from services.query_compiler import QueryCompiler, QueryError
+
+@pytest.fixture
+def compiler():
+    return QueryCompiler(min_prefix_length=3)
+
+@pytest.mark.parametrize('query, tsquery', [
+    ('deep learning', 'deep:* & learning:*'),
+    ('a OR b', 'a | b'),
+    ('graph AND network', 'graph:* & network:*'),
+    ('(a OR b) c', '(a | b) & c'),
+    ('machine AND NOT vision', 'machine:* & !vision:*'),
+    ('-foo bar', '!foo:* & bar:*'),
+    ('"neural network"', '(neural <-> network)'),
+    ('title:graph author:smith', 'graph:*A & smith:*B'),
+    ('title:"deep learning"', '(deep:A <-> learning:A)'),
+])
+def test_compiles_operators_phrases_and_fields(compiler, query, tsquery):
+    assert compiler.compile(query)['tsquery'] == tsquery
+
+def test_operators_are_upper_case_only(compiler):
+    # Lower-case and/or/not are plain words, so these must not share a cache key with their upper-case forms
+    assert compiler.compile('a or b')['tsquery'] == 'a & or & b'
+    assert compiler.compile('not x')['tsquery'] == 'not:* & x'
+
+def test_short_words_are_never_prefixes(compiler):
+    assert compiler.compile('ab')['tsquery'] == 'ab'
+    assert compiler.compile('ab cde')['tsquery'] == 'ab & cde:*'
+
+@pytest.mark.parametrize('query, filters', [
+    ('year:2010..2020 graph', {'year_from': 2010, 'year_to': 2020}),
+    ('year:2015', {'year_from': 2015, 'year_to': 2015}),
+    ('year:2010..', {'year_from': 2010}),
+    ('year:..2020', {'year_to': 2020}),
+    ('year:someday', {}),
+])
+def test_year_filters(compiler, query, filters):
+    assert compiler.compile(query)['filters'] == filters
+
+def test_year_filter_alone_has_no_tsquery(compiler):
+    assert compiler.compile('year:2015')['tsquery'] is None
+
+@pytest.mark.parametrize('query', ['title:', 'year:', 'author:'])
+def test_bare_field_prefix_is_ignored(compiler, query):
+    compiled = compiler.compile(query)
+    assert compiled['tsquery'] is None
+    assert compiled['text'] == ''
+
+def test_field_prefix_followed_by_space_does_not_restrict(compiler):
+    compiled = compiler.compile('title: graph')
+    assert compiled['tsquery'] == 'graph:*'
+    assert not compiled['fielded']
+
+@pytest.mark.parametrize('query', ['NOT foo', '-foo', 'x OR NOT y', 'NOT a OR b', 'NOT (a OR b)'])
+def test_only_negated_terms_raise(compiler, query):
+    with pytest.raises(QueryError):
+        compiler.compile(query)
+
+def test_negated_words_are_left_out_of_text(compiler):
+    assert compiler.compile('graph -network')['text'] == 'graph'
+
+@pytest.mark.parametrize('query, tsquery', [
+    ('graph (', 'graph:*'),
+    (') graph', 'graph:*'),
+    ('(graph OR tree', 'graph:* | tree:*'),
+    ('"unterminated phrase', '(unterminated <-> phrase)'),
+    ('AND', None),
+    ('', None),
+])
+def test_unbalanced_input_degrades_to_terms(compiler, query, tsquery):
+    assert compiler.compile(query)['tsquery'] == tsquery
+
+def test_punctuation_splits_words(compiler):
+    assert compiler.compile('c++ programming')['tsquery'] == 'c & programming:*'
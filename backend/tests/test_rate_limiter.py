@@ -0,0 +1,64 @@
+# tests/test_rate_limiter.py
+# Usage (from backend/): python -m pytest tests
+import pytest
+from services import rate_limiter
+from services.rate_limiter import TokenBucketLimiter, _refill, _MemoryBucketStore, _SQLiteBucketStore
+
+def test_refill_takes_a_token_when_one_is_available():
+    assert _refill(3.0, 100.0, 5, 1.0, 100.0) == (2.0, True, 0)
+
+def test_refill_adds_tokens_for_elapsed_time_up_to_capacity():
+    tokens, allowed, _ = _refill(0.0, 100.0, 5, 2.0, 101.0)
+    assert allowed and tokens == pytest.approx(1.0)
+    tokens, _, _ = _refill(0.0, 0.0, 5, 2.0, 1000.0)
+    assert tokens == pytest.approx(4.0)
+
+def test_refill_reports_wait_until_next_token():
+    tokens, allowed, retry_after_ms = _refill(0.5, 100.0, 5, 1.0, 100.0)
+    assert not allowed
+    assert tokens == 0.5
+    assert retry_after_ms == 501
+
+def test_refill_ignores_clock_going_backwards():
+    tokens, allowed, _ = _refill(0.0, 100.0, 5, 1.0, 90.0)
+    assert not allowed and tokens == 0.0
+
+def test_memory_bucket_allows_capacity_then_refuses():
+    store = _MemoryBucketStore()
+    outcomes = [store.take('openalex', 3, 1.0, 50.0)[0] for _ in range(4)]
+    assert outcomes == [True, True, True, False]
+    assert store.take('openalex', 3, 1.0, 51.0)[0]
+    # Buckets are per key
+    assert store.take('crossref', 3, 1.0, 50.0)[0]
+
+def test_sqlite_bucket_is_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / 'buckets.db')
+    first, second = _SQLiteBucketStore(path), _SQLiteBucketStore(path)
+    assert first.take('arxiv', 2, 0.001, 10.0)[0]
+    assert second.take('arxiv', 2, 0.001, 10.0)[0]
+    assert not first.take('arxiv', 2, 0.001, 10.0)[0]
+
+class FailingRedisStore(rate_limiter._RedisBucketStore):
+    def __init__(self):
+        self.calls = 0
+
+    def take(self, key, capacity, rate, now):
+        self.calls += 1
+        raise ConnectionError('redis down')
+
+def test_redis_errors_fall_back_to_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter.Config, 'RATE_LIMIT_SQLITE_PATH', str(tmp_path / 'fallback.db'))
+    limiter = TokenBucketLimiter(backend='redis')
+    limiter._store = FailingRedisStore()
+    # The fallback bucket still limits: 2 allowed, then refused
+    outcomes = [limiter.acquire('gbif', 2, 3600)[0] for _ in range(3)]
+    assert outcomes == [True, True, False]
+    assert limiter._store.calls == 3
+
+def test_broken_store_fails_open():
+    class BrokenStore:
+        def take(self, *args):
+            raise OSError('disk full')
+    limiter = TokenBucketLimiter(backend='memory')
+    limiter._store = BrokenStore()
+    assert limiter.acquire('dblp', 1, 60) == (True, 0)
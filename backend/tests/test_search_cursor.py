@@ -0,0 +1,49 @@
+# tests/test_search_cursor.py
+# Usage (from backend/): python -m pytest tests
+import json
+import base64
+import pytest
+from services.search_cursor import InvalidCursorError, encode_search_cursor, decode_search_cursor
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii')
+
+def test_citations_cursor_round_trips():
+    row = {'id': 'W123', 'table_source': 'openalex_data', 'citations': '42', 'relevance': 0.5}
+    assert decode_search_cursor(encode_search_cursor(row, 'citations')) == {
+        'cursor_sort': 'citations',
+        'cursor_key': 42,
+        'cursor_id': 'W123',
+        'cursor_table_source': 'openalex_data'
+    }
+
+def test_relevance_cursor_keeps_the_float_key():
+    row = {'id': 7, 'table_source': 'crossref_data_multiple_subjects', 'relevance': 0.123}
+    position = decode_search_cursor(encode_search_cursor(row, 'relevance'))
+    assert position['cursor_sort'] == 'relevance'
+    assert position['cursor_key'] == pytest.approx(0.123)
+    assert position['cursor_id'] == '7'
+
+def test_missing_sort_keys_encode_as_zero():
+    position = decode_search_cursor(encode_search_cursor({'id': 'x'}, 'citations'))
+    assert position['cursor_key'] == 0
+    assert position['cursor_table_source'] == ''
+
+def test_cursor_is_url_safe():
+    cursor = encode_search_cursor({'id': '10.1000/ä?&=', 'table_source': 't', 'citations': 1})
+    assert all(char.isalnum() or char in '-_=' for char in cursor)
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    raw_cursor('just a string'),
+    raw_cursor(['citations', 1, 'id']),
+    raw_cursor(['newest', 1, 'id', 'table']),
+    raw_cursor(['citations', 'many', 'id', 'table']),
+    '',
+])
+def test_malformed_cursors_raise(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_search_cursor(cursor)
+
+def test_invalid_cursor_error_is_a_value_error():
+    assert issubclass(InvalidCursorError, ValueError)
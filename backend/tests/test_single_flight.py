@@ -0,0 +1,65 @@
+# tests/test_single_flight.py
+# Usage (from backend/): python -m pytest tests
+import time
+import threading
+import pytest
+from services.single_flight import SingleFlight, fcntl
+
+def _run_concurrently(flight, key, fn, callers):
+    outcomes = []
+    threads = [threading.Thread(target=lambda: outcomes.append(flight.do(key, fn))) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight('test', shared=False, timeout=5)
+    release, calls = threading.Event(), []
+
+    def search():
+        calls.append(1)
+        release.wait(5)
+        return {'total': 3}
+
+    threads, outcomes = _run_concurrently(flight, 'search:a OR b', search, 4)
+    # Let the followers reach the wait before the leader finishes
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result == {'total': 3} for result, _ in outcomes)
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight('test', shared=False)
+    assert flight.do('search:a OR b', lambda: 'upper') == ('upper', False)
+    assert flight.do('search:a or b', lambda: 'lower') == ('lower', False)
+
+def test_calls_after_the_leader_finished_run_again():
+    flight = SingleFlight('test', shared=False)
+    calls = []
+    flight.do('key', lambda: calls.append(1))
+    flight.do('key', lambda: calls.append(1))
+    assert len(calls) == 2
+
+def test_leader_error_reaches_the_caller_and_frees_the_key():
+    flight = SingleFlight('test', shared=False)
+
+    def fail():
+        raise RuntimeError('database down')
+
+    with pytest.raises(RuntimeError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 'ok') == ('ok', False)
+
+@pytest.mark.skipif(fcntl is None, reason="shared single flight needs fcntl")
+def test_shared_result_file_round_trips(tmp_path):
+    flight = SingleFlight('test', shared=True, directory=str(tmp_path), timeout=1)
+    assert flight.do('key', lambda: {'results': [1, 2]}) == ({'results': [1, 2]}, False)
+    written = list((tmp_path / 'test').glob('*.json'))
+    assert len(written) == 1
+    assert flight._read_result(str(written[0]), 0) == {'results': [1, 2]}
+    # Results written before the waiter started are not reused
+    assert flight._read_result(str(written[0]), float('inf')) is None
@@ -0,0 +1,57 @@
+# tests/test_xml_parsers.py
+# Usage (from backend/): python -m pytest tests
+import os
+from services.xml_parsers import parse_arxiv_feed, parse_arxiv_entry, parse_dblp_record, iter_arxiv_entries
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools', 'fixtures')
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as fixture:
+        return fixture.read()
+
+def test_arxiv_feed_results_and_total():
+    results, total = parse_arxiv_feed(_fixture('arxiv_query.xml'))
+    assert total == 24817
+    assert len(results) == 3
+    first = results[0]
+    assert first['id'] == '1812.08434v6'
+    assert first['title'] == 'Graph Neural Networks: A Review of Methods and Applications'
+    assert first['author'].startswith('Jie Zhou, Ganqu Cui')
+    assert first['year'] == '2018'
+    assert first['subject'] == 'cs.LG, cs.AI, stat.ML'
+    assert first['url'] == 'https://arxiv.org/abs/1812.08434v6'
+
+def test_arxiv_feed_reads_from_a_file_object():
+    with open(os.path.join(FIXTURES, 'arxiv_query.xml'), 'rb') as feed:
+        results, _ = parse_arxiv_feed(feed)
+    assert [result['id'] for result in results] == \
+        [result['id'] for result in parse_arxiv_feed(_fixture('arxiv_query.xml'))[0]]
+
+def test_arxiv_feed_without_total_counts_results():
+    feed = (b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><id>http://arxiv.org/abs/1</id>'
+            b'<title>One</title></entry><entry><title>No id</title></entry></feed>')
+    results, total = parse_arxiv_feed(feed)
+    assert [result['id'] for result in results] == ['1']
+    assert total == 1
+
+def test_arxiv_entry_takes_the_requested_id():
+    result = parse_arxiv_entry(_fixture('arxiv_query.xml'), '1812.08434')
+    assert result['id'] == '1812.08434'
+    assert result['url'] == 'https://arxiv.org/abs/1812.08434'
+    assert parse_arxiv_entry(b'<feed xmlns="http://www.w3.org/2005/Atom"/>', '1') is None
+
+def test_iter_arxiv_entries_is_lazy():
+    entries = iter_arxiv_entries(_fixture('arxiv_query.xml'))
+    assert next(entries)['id'] == '1812.08434v6'
+
+def test_dblp_record():
+    result = parse_dblp_record(_fixture('dblp_record.xml'), 'journals/tnn/WuPCLZY21')
+    assert result['title'] == 'A Comprehensive Survey on Graph Neural Networks.'
+    assert result['author'].split(', ')[-1] == 'Philip S. Yu'
+    assert result['year'] == '2021'
+    assert result['doi'] == '10.1109/TNNLS.2020.2978386'
+    assert result['subject'] == 'article'
+    assert result['url'] == 'https://dblp.org/rec/journals/tnn/WuPCLZY21.html'
+
+def test_dblp_record_without_publication():
+    assert parse_dblp_record(b'<dblp></dblp>', 'missing') is None
@@ -0,0 +1,134 @@
+# tools/bench_external_apis.py
+# Usage (from backend/):
+#   python -m tools.bench_external_apis --requests 200 --concurrency 8 --latency-ms 80 --jitter-ms 20
+#   python -m tools.bench_external_apis --backend asyncio --error-rate 0.05 --sources openalex crossref
+#   python -m tools.bench_external_apis --replay-url http://127.0.0.1:8765   # already running replay server
+#
+# Throughput and latency baseline for the external API layer, run against
+# tools/replay_server.py instead of the live APIs. Per source it reports
+# searches per second, p50/p99 search latency, the share of searches that
+# came back empty (injected failures, open circuits) and the cost of
+# parsing one recorded response. The response cache and rate limits are off
+# unless --keep-cache / --keep-rate-limits are given, so every search goes
+# over the wire.
+
+import time
+import asyncio
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from tools.replay_server import ReplayServer, FaultProfile
+
+QUERY = 'graph neural networks'
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[int(round(pct / 100 * (len(ordered) - 1)))] if ordered else 0.0
+
+def timed(call):
+    start = time.perf_counter()
+    results, _ = call()
+    return time.perf_counter() - start, bool(results)
+
+def bench_threads(api, source, requests, concurrency):
+    """[(seconds, got results)] for `requests` searches, `concurrency` at a time"""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: timed(lambda: api.search_external(source, QUERY)), range(requests)))
+
+def bench_asyncio(async_api, source, requests, concurrency):
+    from services.async_external_apis import AsyncBridge
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                results, _ = await async_api.search_external(source, QUERY)
+                return time.perf_counter() - start, bool(results)
+
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+    return AsyncBridge.run(run())
+
+def parse_cost_us(api, source, repeat):
+    """Microseconds to parse one recorded search response"""
+    url, params = api.build_search_request(source, QUERY, 1, 10)
+    for attempt in range(20):
+        try:
+            with urllib.request.urlopen(f"{url}?{urllib.parse.urlencode(params)}") as response:
+                body = response.read()
+            break
+        except urllib.error.HTTPError:
+            # Injected 429/503; any 200 will do
+            if attempt == 19:
+                raise
+    start = time.perf_counter()
+    for _ in range(repeat):
+        api.parse_search_response(source, body)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ExternalAPIService against the replay server')
+    parser.add_argument('--replay-url', help='use a running replay server instead of starting one')
+    parser.add_argument('--sources', nargs='+', help='default: all seven')
+    parser.add_argument('--requests', type=int, default=200, help='searches per source')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--backend', choices=['threads', 'asyncio'], default='threads')
+    parser.add_argument('--parse-repeat', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0)
+    parser.add_argument('--keep-cache', action='store_true', help='leave the response cache on')
+    parser.add_argument('--keep-rate-limits', action='store_true', help='leave the per-source token buckets on')
+    args = parser.parse_args()
+
+    server = None
+    if not args.replay_url:
+        profile = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+        server = ReplayServer(default=profile).start()
+    Config.EXTERNAL_API_REPLAY_URL = args.replay_url or server.url
+    if not args.keep_cache:
+        Config.RESPONSE_CACHE_ENABLED = False
+
+    # Imported after the overrides so nothing is built against the live URLs
+    from services.external_apis import ExternalAPIService
+    from services.circuit_breaker import CircuitBreakerRegistry
+    api = ExternalAPIService()
+    if not args.keep_rate_limits:
+        api.rate_limits = {}
+    async_api = None
+    if args.backend == 'asyncio':
+        from services.async_external_apis import AsyncExternalAPIService, AsyncBridge
+        async_api = AsyncExternalAPIService(api)
+
+    print(f"Replay server: {Config.EXTERNAL_API_REPLAY_URL}  backend: {args.backend}  "
+          f"requests/source: {args.requests}  concurrency: {args.concurrency}")
+    print(f"{'source':<12} {'searches/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'empty':>7} {'parse us':>9} {'breaker':>10}")
+    try:
+        for source in args.sources or api.SOURCES:
+            start = time.perf_counter()
+            if args.backend == 'asyncio':
+                samples = bench_asyncio(async_api, source, args.requests, args.concurrency)
+            else:
+                samples = bench_threads(api, source, args.requests, args.concurrency)
+            elapsed = time.perf_counter() - start
+
+            latencies = [seconds * 1000 for seconds, _ in samples]
+            empty = sum(1 for _, ok in samples if not ok) / len(samples)
+            print(f"{source:<12} {len(samples) / elapsed:>10.1f} {percentile(latencies, 50):>8.1f} "
+                  f"{percentile(latencies, 99):>8.1f} {empty:>6.1%} {parse_cost_us(api, source, args.parse_repeat):>9.1f} "
+                  f"{CircuitBreakerRegistry.get(source).state:>10}")
+    finally:
+        if async_api:
+            # Close the aiohttp session on the bridge loop it was opened on
+            AsyncBridge.run(async_api.close())
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
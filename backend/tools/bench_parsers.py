@@ -0,0 +1,131 @@
+# tools/bench_parsers.py
+# Usage (from backend/): python -m tools.bench_parsers [--repeat 200]
+#
+# Compares the incremental XML parsers in services/xml_parsers.py with the
+# previous ET.fromstring + XPath implementation on the recorded fixtures in
+# tools/fixtures, checks both produce the same results, and reports time per
+# parse and peak memory. arXiv pages are built at several sizes by repeating
+# the recorded entries.
+
+import os
+import re
+import time
+import argparse
+import tracemalloc
+import xml.etree.ElementTree as ET
+from services.xml_parsers import parse_arxiv_feed, parse_arxiv_entry, parse_dblp_record
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ARXIV_PAGE_SIZES = (10, 100, 500)
+
+def legacy_arxiv_feed(body):
+    """The former ExternalAPIService._parse_arxiv_search"""
+    root = ET.fromstring(body)
+    ns = {'atom': 'http://www.w3.org/2005/Atom'}
+    results = []
+    for entry in root.findall('.//atom:entry', ns):
+        id_elem = entry.find('./atom:id', ns)
+        if id_elem is None:
+            continue
+        arxiv_id = id_elem.text.split('/')[-1]
+        title_elem = entry.find('./atom:title', ns)
+        authors = [a.text for a in entry.findall('./atom:author/atom:name', ns) if a.text]
+        published_elem = entry.find('./atom:published', ns)
+        published = published_elem.text if published_elem is not None else ""
+        summary_elem = entry.find('./atom:summary', ns)
+        categories = [c.get('term') for c in entry.findall('./atom:category', ns) if c.get('term')]
+        results.append({
+            'id': arxiv_id,
+            'title': title_elem.text if title_elem is not None else "No title",
+            'author': ', '.join(authors),
+            'year': published.split('-')[0] if published and '-' in published else "",
+            'abstract': summary_elem.text if summary_elem is not None else "",
+            'doi': None,
+            'subject': ', '.join(categories) if categories else None,
+            'citations': 0,
+            'source': 'arxiv',
+            'url': f"https://arxiv.org/abs/{arxiv_id}"
+        })
+    total_elem = root.find('.//opensearch:totalResults', {'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'})
+    return results, int(total_elem.text) if total_elem is not None else len(results)
+
+def legacy_dblp_record(body, pub_id):
+    """The former ExternalAPIService._parse_dblp_details"""
+    root = ET.fromstring(body)
+    for pub_type in ['article', 'inproceedings', 'book', 'incollection', 'proceedings', 'phdthesis', 'mastersthesis']:
+        pub_elem = root.find(f'.//{pub_type}')
+        if pub_elem is not None:
+            break
+    if pub_elem is None:
+        return None
+    title_elem = pub_elem.find('.//title')
+    year_elem = pub_elem.find('.//year')
+    doi_elem = pub_elem.find('.//ee[@type="doi"]')
+    return {
+        'id': pub_id,
+        'title': title_elem.text if title_elem is not None else "No title",
+        'author': ', '.join(a.text for a in pub_elem.findall('.//author') if a.text),
+        'year': year_elem.text if year_elem is not None else None,
+        'abstract': '',
+        'doi': doi_elem.text.replace('https://doi.org/', '') if doi_elem is not None else None,
+        'subject': pub_type,
+        'citations': 0,
+        'source': 'dblp',
+        'url': f"https://dblp.org/rec/{pub_id}.html"
+    }
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as fixture:
+        return fixture.read()
+
+def arxiv_page(fixture, size):
+    """The recorded feed with its entries repeated up to `size`"""
+    entries = re.findall(rb'<entry>.*?</entry>', fixture, re.S)
+    head = fixture[:fixture.index(b'<entry>')]
+    body = b''.join(entries[i % len(entries)] for i in range(size))
+    return head + body + b'</feed>'
+
+def measure(parse, repeat):
+    """(milliseconds per call, peak KiB of one call)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+def report(name, legacy, streaming, repeat):
+    if legacy() != streaming():
+        raise SystemExit(f"❌ {name}: streaming parser output differs from the legacy parser")
+    legacy_ms, legacy_kib = measure(legacy, repeat)
+    streaming_ms, streaming_kib = measure(streaming, repeat)
+    print(f"{name:<22} {legacy_ms:>9.3f} {streaming_ms:>9.3f} {legacy_ms / streaming_ms:>7.2f}x "
+          f"{legacy_kib:>10.0f} {streaming_kib:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the arXiv / DBLP XML parsers')
+    parser.add_argument('--repeat', type=int, default=200, help='parses per measurement')
+    args = parser.parse_args()
+
+    arxiv_fixture = read_fixture('arxiv_query.xml')
+    dblp_fixture = read_fixture('dblp_record.xml')
+
+    print(f"{'case':<22} {'legacy ms':>9} {'stream ms':>9} {'speedup':>8} {'legacy KiB':>10} {'stream KiB':>10}")
+    for size in ARXIV_PAGE_SIZES:
+        page = arxiv_page(arxiv_fixture, size)
+        report(f"arxiv search ({size})", lambda: legacy_arxiv_feed(page), lambda: parse_arxiv_feed(page),
+               max(1, args.repeat * 10 // size))
+
+    def legacy_details():
+        result = legacy_arxiv_feed(arxiv_fixture)[0][0]
+        result.update({'id': '1812.08434', 'url': 'https://arxiv.org/abs/1812.08434'})
+        return result
+    report("arxiv details", legacy_details, lambda: parse_arxiv_entry(arxiv_fixture, '1812.08434'), args.repeat)
+    report("dblp details", lambda: legacy_dblp_record(dblp_fixture, 'journals/tnn/WuPCLZY21'),
+           lambda: parse_dblp_record(dblp_fixture, 'journals/tnn/WuPCLZY21'), args.repeat)
+
+if __name__ == "__main__":
+    main()
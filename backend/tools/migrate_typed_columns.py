@@ -0,0 +1,92 @@
+# tools/migrate_typed_columns.py
+# Usage (from backend/): python -m tools.migrate_typed_columns [--dry-run]
+
+import argparse
+import logging
+from services.database import DatabaseService
+from services.search_tables import SOURCE_TABLES, INTEGER_TYPES, column_expression
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert year/citation columns of the search tables to integers")
+    parser.add_argument('--dry-run', action='store_true', help='Print the SQL without executing it')
+    return parser.parse_args()
+
+def column_type(db, table, column):
+    """Return the data_type of a column, or None if it does not exist"""
+    result = db.execute_query("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = %s AND column_name = %s
+    """, (table, column))
+    return result[0]['data_type'] if result else None
+
+def migration_statements(db, spec):
+    """
+    SQL needed to give one source table integer year/citation columns and
+    indexes that year_from/year_to/min_citations predicates can use
+    """
+    table = spec['table']
+    statements = []
+
+    for field in ('year', 'citations'):
+        column = spec['columns'].get(field)
+        if not column:
+            continue
+
+        data_type = column_type(db, table, column)
+        if data_type is None:
+            logger.warning(f"⚠️ {table}.{column} does not exist, skipping")
+            continue
+
+        if data_type not in INTEGER_TYPES:
+            # Same coercion the unified table uses: 4-digit year / leading digits
+            statements.append(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE INTEGER "
+                f"USING {column_expression(spec, field)}"
+            )
+
+        method = spec.get('year_index', 'btree') if field == 'year' else 'btree'
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_{method} "
+            f"ON {table} USING {method}({column})"
+        )
+
+    return statements
+
+def migrate_typed_columns(dry_run=False):
+    """
+    Convert year and citation fields in every search source table to INTEGER.
+
+    ALTER COLUMN TYPE rewrites the table under an exclusive lock, so run this
+    in a maintenance window. Values that do not parse become NULL (year) or 0
+    (citations), matching what unified_publications already stores.
+    """
+    db = DatabaseService()
+
+    for spec in SOURCE_TABLES:
+        table = spec['table']
+        present = db.execute_query("SELECT to_regclass(%s) IS NOT NULL AS present", (table,))
+        if not present or not present[0]['present']:
+            logger.info(f"Table {table} does not exist, skipping")
+            continue
+
+        statements = migration_statements(db, spec)
+        for statement in statements:
+            if dry_run:
+                print(f"{statement};")
+                continue
+            try:
+                logger.info(f"Running: {statement}")
+                db.execute_query(statement, fetch=False)
+            except Exception as e:
+                logger.error(f"❌ Migration step failed on {table}: {e}")
+                break
+        else:
+            if not dry_run:
+                logger.info(f"✅ {table} migrated")
+
+if __name__ == "__main__":
+    args = parse_args()
+    migrate_typed_columns(dry_run=args.dry_run)
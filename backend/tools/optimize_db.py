@@ -1,69 +1,52 @@
 # tools/optimize_db.py
+# Usage (from backend/): python -m tools.optimize_db [--dry-run | --verify]
 
+import argparse
 import logging
-import psycopg2
-import os
+from services.index_manager import IndexManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def optimize_database():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create and verify the indexes used by search")
+    parser.add_argument('--dry-run', action='store_true', help='Print the CREATE INDEX SQL without executing it')
+    parser.add_argument('--verify', action='store_true', help='Only report which search predicates are index-backed')
+    return parser.parse_args()
+
+def report_indexes(manager):
+    """Log every search predicate and the index serving it"""
+    unbacked = 0
+    for entry in manager.verify():
+        if entry['missing_column']:
+            logger.warning(f"⚠️ {entry['table']}: column {entry['column']} does not exist")
+        elif entry['backed']:
+            logger.info(f"✅ {entry['table']}: {entry['predicate']} -> {entry['existing']}")
+        else:
+            unbacked += 1
+            logger.warning(f"❌ {entry['table']}: {entry['predicate']} is not index-backed")
+    return unbacked
+
+def optimize_database(dry_run=False):
     """
     Create indexes to optimize database search performance
     """
-    connection_string = os.getenv("DATABASE_URL")
-    
-    try:
-        conn = psycopg2.connect(connection_string)
-        cursor = conn.cursor()
-        
-        logger.info("Creating indexes for better search performance...")
-        
-        # OpenAlex table indexes
-        logger.info("Creating indexes for OpenAlex table...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_openalex_title ON openalex USING gin(title gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_openalex_author ON openalex USING gin(author gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_openalex_journal ON openalex USING gin(journal gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_openalex_citation_count ON openalex(citation_count);
-        """)
-        
-        # Crossref table indexes
-        logger.info("Creating indexes for Crossref table...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crossref_title ON crossref_data_multiple_subjects USING gin(title gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_crossref_author ON crossref_data_multiple_subjects USING gin(author gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_crossref_publisher ON crossref_data_multiple_subjects USING gin(publisher gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_crossref_subjects ON crossref_data_multiple_subjects USING gin(subjects gin_trgm_ops);
-            CREATE INDEX IF NOT EXISTS idx_crossref_citation_count ON crossref_data_multiple_subjects(citation_count);
-        """)
-        
-        # Arxiv table indexes (if it exists)
-        try:
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_arxiv_title ON arxiv_papers USING gin(title gin_trgm_ops);
-                CREATE INDEX IF NOT EXISTS idx_arxiv_authors ON arxiv_papers USING gin(authors gin_trgm_ops);
-                CREATE INDEX IF NOT EXISTS idx_arxiv_abstract ON arxiv_papers USING gin(abstract gin_trgm_ops);
-            """)
-            logger.info("Created indexes for ArXiv table")
-        except Exception as e:
-            logger.warning(f"Could not create ArXiv indexes: {str(e)}")
-        
-        conn.commit()
+    manager = IndexManager()
+    statements = manager.ensure_indexes(dry_run=dry_run)
+    if dry_run:
+        for statement in statements:
+            print(f"{statement};")
+        return
+
+    unbacked = report_indexes(manager)
+    if unbacked:
+        logger.warning(f"⚠️ {unbacked} search predicates are still not index-backed")
+    else:
         logger.info("✅ Database optimization complete!")
-        
-    except Exception as e:
-        logger.error(f"Database optimization failed: {str(e)}")
-        if conn:
-            conn.rollback()
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 if __name__ == "__main__":
-    # Before running this script, make sure the extension is installed
-    # Execute this SQL on your database:
-    # CREATE EXTENSION IF NOT EXISTS pg_trgm;
-    optimize_database()
\ No newline at end of file
+    args = parse_args()
+    if args.verify:
+        report_indexes(IndexManager())
+    else:
+        optimize_database(dry_run=args.dry_run)
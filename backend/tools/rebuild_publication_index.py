@@ -0,0 +1,22 @@
+# tools/rebuild_publication_index.py
+# Usage (from backend/): python -m tools.rebuild_publication_index
+
+import logging
+from services.publication_index import PublicationIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild_publication_index():
+    """
+    Re-sync unified_publications from every source table (the setup step also
+    reinstalls the sync triggers). Needed after bulk loads done with triggers disabled.
+    """
+    index = PublicationIndex()
+    if not index.setup_index_table(backfill=False):
+        return
+    synced = index.rebuild()
+    logger.info(f"✅ Rebuilt unified_publications from {synced} source tables")
+
+if __name__ == "__main__":
+    rebuild_publication_index()
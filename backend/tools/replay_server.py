@@ -0,0 +1,206 @@
+# tools/replay_server.py
+# Usage (from backend/):
+#   python -m tools.replay_server --port 8765 --latency-ms 120 --jitter-ms 40 --error-rate 0.02 --rate-limit-rate 0.05
+#   EXTERNAL_API_REPLAY_URL=http://127.0.0.1:8765 python app.py
+#
+# Local stand-in for the seven external APIs. Every source is served under
+# /<source> (search endpoints) and /<source>-records (dblp and Open Library
+# record pages), which is where ExternalAPIService points its base URLs when
+# EXTERNAL_API_REPLAY_URL is set. Responses are the recorded fixtures in
+# tools/fixtures, whatever the query; latency, jitter, 5xx errors and 429s
+# can be injected globally or per source.
+
+import os
+import time
+import random
+import hashlib
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Route -> (fixture for the endpoint itself, fixture for paths below it)
+ROUTES = {
+    'arxiv': ('arxiv_query.xml', 'arxiv_query.xml'),
+    'openalex': (None, 'openalex_work.json'),  # /openalex/works is the listing
+    'crossref': ('crossref_works.json', 'crossref_work.json'),
+    'dblp': ('dblp_search.json', 'dblp_search.json'),
+    'dblp-records': (None, 'dblp_record.xml'),
+    'openlibrary': ('openlibrary_search.json', 'openlibrary_search.json'),
+    'openlibrary-records': (None, 'openlibrary_work.json'),
+    'gutendex': ('gutendex_books.json', 'gutendex_book.json'),
+    'gbif': ('gbif_search.json', 'gbif_literature.json')
+}
+
+def fixture_for(route: str, rest: str) -> Optional[str]:
+    """Fixture file answering /<route>/<rest>, or None for an unknown path"""
+    if route not in ROUTES:
+        return None
+    if route == 'openalex' and rest == 'works':
+        return 'openalex_works.json'
+    if route == 'openlibrary-records' and rest.startswith('authors/'):
+        return 'openlibrary_author.json'
+    listing, record = ROUTES[route]
+    return listing if not rest else record
+
+class FaultProfile:
+    """Latency and failures injected into replayed responses"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 rate_limit_rate: float = 0, retry_after: int = 1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+    def delay(self) -> float:
+        """Seconds to wait before answering"""
+        return max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def failure(self) -> Optional[int]:
+        """Status code to answer with instead of the fixture, if any"""
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+class ReplayServer:
+    """
+    Threaded HTTP server replaying the fixtures
+
+    Args:
+        port: Port to listen on; 0 picks a free one (see url)
+        default: Faults for every source
+        per_source: Faults overriding the default for some sources, keyed by source
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, default: FaultProfile = None,
+                 per_source: Dict[str, FaultProfile] = None):
+        self.default = default or FaultProfile()
+        self.per_source = per_source or {}
+        self.bodies = {}
+        for name in os.listdir(FIXTURES):
+            with open(os.path.join(FIXTURES, name), 'rb') as fixture:
+                body = fixture.read()
+            self.bodies[name] = (body, f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+        self.counts = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ReplayServer':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def profile(self, source: str) -> FaultProfile:
+        return self.per_source.get(source, self.default)
+
+    def record(self, source: str, status: int):
+        with self._lock:
+            per_status = self.counts.setdefault(source, {})
+            per_status[status] = per_status.get(status, 0) + 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, the
+            # body of every reused keep-alive connection waits ~40 ms for the
+            # client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                route, _, rest = urlsplit(self.path).path.strip('/').partition('/')
+                source = route.replace('-records', '')
+                fixture = fixture_for(route, rest)
+                if fixture is None:
+                    return self._send(source, 404, b'{"error": "unknown path"}', 'application/json')
+
+                profile = server.profile(source)
+                time.sleep(profile.delay())
+                status = profile.failure()
+                if status == 429:
+                    return self._send(source, 429, b'{"error": "rate limited"}', 'application/json',
+                                      {'Retry-After': str(profile.retry_after)})
+                if status:
+                    return self._send(source, status, b'{"error": "injected failure"}', 'application/json')
+
+                body, etag = server.bodies[fixture]
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(source, 304, b'', None, {'ETag': etag})
+                content_type = 'application/xml' if fixture.endswith('.xml') else 'application/json'
+                self._send(source, 200, body, content_type, {'ETag': etag})
+
+            def _send(self, source, status, body, content_type, headers=None):
+                server.record(source, status)
+                self.send_response(status)
+                if content_type:
+                    self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+def parse_source_profiles(specs, default: FaultProfile) -> Dict[str, FaultProfile]:
+    """--source-fault openalex:latency_ms=300,error_rate=0.1 -> {'openalex': FaultProfile(...)}"""
+    profiles = {}
+    for spec in specs or []:
+        source, _, settings = spec.partition(':')
+        values: Dict[str, Any] = dict(vars(default))
+        for setting in filter(None, settings.split(',')):
+            name, _, value = setting.partition('=')
+            values[name.strip()] = type(values[name.strip()])(float(value))
+        profiles[source] = FaultProfile(**values)
+    return profiles
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded external API responses locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0, help='share of 503 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='share of 429 responses')
+    parser.add_argument('--source-fault', action='append',
+                        help='per-source override, e.g. openalex:latency_ms=300,error_rate=0.1 (repeatable)')
+    args = parser.parse_args()
+
+    default = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    server = ReplayServer(args.host, args.port, default, parse_source_profiles(args.source_fault, default))
+    logger.info(f"✅ Replaying external APIs at {server.url} (EXTERNAL_API_REPLAY_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
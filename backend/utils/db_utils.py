@@ -1,6 +1,20 @@
 from psycopg2 import sql
 from services.database import DatabaseService
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
+
+def _where_clause(filters):
+    """WHERE clause and parameters for equality filters; None values are ignored"""
+    where_clauses = []
+    params = []
+    
+    for field, value in (filters or {}).items():
+        if value is not None:
+            where_clauses.append(sql.SQL("{} = %s").format(sql.Identifier(field)))
+            params.append(value)
+    
+    if not where_clauses:
+        return sql.SQL(""), params
+    return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(where_clauses), params
 
 def fetch_all(table_name):
     """Fetches all rows from a given table."""
@@ -10,27 +24,75 @@ def fetch_all(table_name):
 
 def fetch_filtered(table_name, filters=None):
     """Fetches filtered data from a table based on provided filters."""
-    if filters is None:
+    where, params = _where_clause(filters)
+    if not params:
         return fetch_all(table_name)
     
     db = DatabaseService()
-    where_clauses = []
-    params = []
-    
-    for field, value in filters.items():
-        if value is not None:
-            where_clauses.append(sql.SQL("{} = %s").format(sql.Identifier(field)))
-            params.append(value)
-    
-    if not where_clauses:
-        return fetch_all(table_name)
-    
-    query = sql.SQL("SELECT * FROM {} WHERE {}").format(
+    query = sql.SQL("SELECT * FROM {}{}").format(sql.Identifier(table_name), where)
+    return db.execute_query(query, params)
+
+def _select_query(table_name, filters=None, columns=None, order_by=None, after=None, limit=None):
+    """SELECT over a table with equality filters, projection and an optional keyset (order_by > after)"""
+    where, params = _where_clause(filters)
+    query = sql.SQL("SELECT {} FROM {}{}").format(
+        sql.SQL(', ').join(map(sql.Identifier, columns)) if columns else sql.SQL('*'),
         sql.Identifier(table_name),
-        sql.SQL(" AND ").join(where_clauses)
+        where
     )
+    if order_by:
+        if after is not None:
+            query = query + sql.SQL(" AND " if params else " WHERE ") + sql.SQL("{} > %s").format(sql.Identifier(order_by))
+            params.append(after)
+        query = query + sql.SQL(" ORDER BY {}").format(sql.Identifier(order_by))
+    if limit is not None:
+        query = query + sql.SQL(" LIMIT %s")
+        params.append(limit)
+    return query, params
+
+def fetch_page(table_name, key_column="id", after=None, limit=100, columns=None, filters=None):
+    """
+    Fetches one keyset page of a table, ordered by key_column.
     
-    return db.execute_query(query, params)
+    Args:
+        after: key_column value of the last row of the previous page (None for the first page)
+        limit: Rows per page
+        
+    Returns:
+        Tuple of (rows, key of the last row if there may be more pages, else None)
+    """
+    if columns and key_column not in columns:
+        columns = [key_column] + list(columns)
+    query, params = _select_query(table_name, filters, columns, key_column, after, limit)
+    rows = DatabaseService().execute_query(query, params) or []
+    next_after = rows[-1][key_column] if len(rows) == limit else None
+    return rows, next_after
+
+def iter_batches(table_name, filters=None, batch_size=1000, columns=None, order_by=None, after=None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Streams a table in fixed-size batches through a server-side cursor.
+    
+    Memory stays at one batch however large the table is, so use this
+    instead of fetch_all/fetch_filtered for exports and reindexing.
+    
+    Args:
+        table_name: Table to read
+        filters: Column -> value equality filters, as for fetch_filtered
+        batch_size: Rows per batch
+        columns: Columns to select (default: all)
+        order_by: Column to order by, for a stable order across runs
+        after: Only rows whose order_by value is greater, to resume a read
+        
+    Yields:
+        Lists of up to batch_size row dicts
+    """
+    query, params = _select_query(table_name, filters, columns, order_by, after)
+    yield from DatabaseService().iter_query(query, params, batch_size=batch_size)
+
+def iter_rows(table_name, filters=None, batch_size=1000, columns=None, order_by=None, after=None) -> Iterator[Dict[str, Any]]:
+    """Streams a table row by row, fetching batch_size rows at a time (see iter_batches)."""
+    for batch in iter_batches(table_name, filters, batch_size, columns, order_by, after):
+        yield from batch
 
 def insert_data(table_name, data):
     """Inserts data into a given table."""
@@ -470,63 +470,64 @@ export const getSummaryById = async (id) => {
   }
 };
 
-export const getCleanedBibliometricData = async () => {
+// Data tables come a keyset page at a time: pass { after: next_after } for the next page
+export const getCleanedBibliometricData = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/cleaned_bibliometric_data');
-    return response.data;
+    const response = await axiosInstance.get('/cleaned_bibliometric_data', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching cleaned bibliometric data:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 
-export const getCrossrefDataMultipleSubjects = async () => {
+export const getCrossrefDataMultipleSubjects = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/crossref_data_multiple_subjects');
-    return response.data;
+    const response = await axiosInstance.get('/crossref_data_multiple_subjects', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching crossref data:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 
-export const getGoogleScholarData = async () => {
+export const getGoogleScholarData = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/google_scholar_data');
-    return response.data;
+    const response = await axiosInstance.get('/google_scholar_data', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching google scholar data:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 
-export const getOpenalexData = async () => {
+export const getOpenalexData = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/openalex_data');
-    return response.data;
+    const response = await axiosInstance.get('/openalex_data', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching openalex data:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 
-export const getScopusData = async () => {
+export const getScopusData = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/scopus_data');
-    return response.data;
+    const response = await axiosInstance.get('/scopus_data', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching scopus data:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 
-export const getScopusDataSept = async () => {
+export const getScopusDataSept = async (params = {}) => {
   try {
-    const response = await axiosInstance.get('/scopus_data_sept');
-    return response.data;
+    const response = await axiosInstance.get('/scopus_data_sept', { params });
+    return { rows: response.data.rows, next_after: response.data.next_after };
   } catch (error) {
     console.error('Error fetching scopus data sept:', error);
-    return [];
+    return { rows: [], next_after: null };
   }
 };
 